@@ -0,0 +1,85 @@
+"""
+Tiempo y memoria pico de exportar N productos a JSON: json.dump del documento
+completo (la exportación anterior) vs la escritura incremental por bloques.
+tracemalloc solo ve memoria de Python: lo que Polars escribe desde Rust no suma.
+
+    python -m benchmarks.json_export --count 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, Callable
+
+from models.product import Product
+from models.product_batch import ProductBatch
+from utils.json_writer import JsonEncoder, write_json_document, write_json_lines
+
+
+def _batch(count: int) -> ProductBatch:
+    return ProductBatch.from_products(
+        Product(title=f"Producto de prueba número {index}", price=float(index), currency="COP",
+                url=f"https://articulo.mercadolibre.com.co/MCO-{index}", marketplace="MercadoLibre",
+                description="Descripción del producto " * 10, scraped_at=datetime(2024, 5, 1, 10, 30))
+        for index in range(count)
+    )
+
+
+def _measure(write: Callable) -> Dict[str, Any]:
+    """Tiempo sin trazar (tracemalloc lo infla) y memoria pico en una segunda pasada"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'products.json')
+        
+        started = time.perf_counter()
+        with open(path, 'w', encoding='utf-8') as file:
+            write(file)
+        seconds = time.perf_counter() - started
+        
+        tracemalloc.start()
+        try:
+            with open(path, 'w', encoding='utf-8') as file:
+                write(file)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        return {
+            'seconds': round(seconds, 3),
+            'peak_mb': round(peak / 1024 / 1024, 1),
+            'size_mb': round(os.path.getsize(path) / 1024 / 1024, 1)
+        }
+
+
+def measure_json_export(count: int = 100_000) -> Dict[str, Any]:
+    """Resultados por variante (json.dump indentado, incremental indentado/compacto y JSON Lines)"""
+    batch = _batch(count)
+    frame = batch.export_frame()
+    fields = {'total_count': len(batch), 'exported_at': datetime.now().isoformat(), 'marketplaces': batch.marketplaces()}
+    
+    def legacy(file):
+        json.dump({'products': frame.to_dicts(), **fields}, file, indent=2, ensure_ascii=False)
+    
+    variants = {'legacy_json_dump': legacy}
+    for backend in ('json', 'orjson'):
+        try:
+            indented, compact = JsonEncoder(backend, indent=2), JsonEncoder(backend)
+        except ImportError:
+            continue
+        variants[f'{backend}_indented'] = lambda file, encoder=indented: write_json_document(file, frame, fields, encoder=encoder)
+        variants[f'{backend}_compact'] = lambda file, encoder=compact: write_json_document(file, frame, fields, encoder=encoder)
+    variants['json_lines'] = lambda file: write_json_lines(file, frame)
+    
+    return {'count': count, **{name: _measure(write) for name, write in variants.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportación JSON: json.dump completo vs escritura incremental')
+    parser.add_argument('--count', type=int, default=100_000, help='Productos a exportar')
+    print(json.dumps(measure_json_export(parser.parse_args().count), indent=2))
+
+
+if __name__ == "__main__":
+    main()
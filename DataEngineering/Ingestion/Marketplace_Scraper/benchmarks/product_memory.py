@@ -0,0 +1,85 @@
+"""
+Memoria de N productos en memoria: Product actual vs la representación anterior
+(dataclass con __dict__ y un datetime.now() por objeto, sin internar strings).
+
+    python -m benchmarks.product_memory --count 100000
+"""
+import argparse
+import dataclasses
+import json
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any
+
+from models.product import Product, batch_timestamp
+
+CATEGORIES = ["Celulares y Teléfonos", "Computación", "Electrodomésticos", "Hogar y Muebles"]
+BRANDS = ["Samsung", "Apple", "Xiaomi", "Motorola", "Lenovo"]
+
+
+def _legacy_product_class():
+    """Réplica de Product antes de __slots__"""
+    spec = [(field.name, field.type, dataclasses.field(default=field.default)) for field in dataclasses.fields(Product)]
+    
+    def post_init(self):
+        self.scraped_at = datetime.now()
+    
+    return dataclasses.make_dataclass('LegacyProduct', spec, namespace={'__post_init__': post_init})
+
+
+def _fresh(value: str) -> str:
+    """Copia nueva del str, como la que produce el parseo de cada tarjeta"""
+    return value[:1] + value[1:]
+
+
+def _build(product_class, count: int):
+    return [
+        product_class(
+            title=f"Producto de prueba número {index}",
+            price=float(index),
+            currency=_fresh("COP"),
+            url=f"https://articulo.mercadolibre.com.co/MCO-{index}",
+            brand=_fresh(BRANDS[index % len(BRANDS)]),
+            seller=_fresh(BRANDS[index % len(BRANDS)]),
+            marketplace=_fresh("MercadoLibre"),
+            parent_category=_fresh(CATEGORIES[index % len(CATEGORIES)]),
+            category=_fresh(CATEGORIES[(index + 1) % len(CATEGORIES)])
+        )
+        for index in range(count)
+    ]
+
+
+def _traced_bytes(product_class, count: int) -> int:
+    tracemalloc.start()
+    try:
+        products = _build(product_class, count)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    del products
+    return size
+
+
+def measure_product_memory(count: int = 100_000) -> Dict[str, Any]:
+    """Bytes por producto de ambas representaciones y el ahorro relativo"""
+    with batch_timestamp():
+        legacy = _traced_bytes(_legacy_product_class(), count)
+        current = _traced_bytes(Product, count)
+    
+    return {
+        'count': count,
+        'legacy_bytes_per_product': round(legacy / count, 1),
+        'bytes_per_product': round(current / count, 1),
+        'saving': round(1 - current / legacy, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memoria de Product con __slots__ vs la representación anterior')
+    parser.add_argument('--count', type=int, default=100_000, help='Productos a crear')
+    print(json.dumps(measure_product_memory(parser.parse_args().count), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from typing import Dict, Any, List
+
+# Etapas más rápidas que esto (p95 en ms) no se comparan: el ruido domina
+MIN_STAGE_MS = 5
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.15) -> List[str]:
+    """
+    Compara un reporte con uno de referencia y retorna las regresiones encontradas.
+    
+    Regresión = throughput (páginas/s, productos/s) menor, o p95 por etapa y pico de
+    memoria de Chromium mayor, en más de `tolerance` respecto a la referencia.
+    """
+    regressions = []
+    
+    for name, scenario in current.get('scenarios', {}).items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if not reference:
+            continue
+        
+        for metric in ('pages_per_s', 'products_per_s'):
+            before, after = reference.get(metric), scenario.get(metric)
+            if before and after is not None and after < before * (1 - tolerance):
+                regressions.append(f"{name}: {metric} {before} → {after}")
+        
+        for stage, stats in scenario.get('stages', {}).items():
+            before = reference.get('stages', {}).get(stage, {}).get('p95_ms')
+            after = stats['p95_ms']
+            if before and before >= MIN_STAGE_MS and after > before * (1 + tolerance):
+                regressions.append(f"{name}: {stage} p95 {before} ms → {after} ms")
+        
+        before = reference.get('rss_mb', {}).get('chromium_peak')
+        after = scenario.get('rss_mb', {}).get('chromium_peak')
+        if before and after and after > before * (1 + tolerance):
+            regressions.append(f"{name}: chromium_peak {before} MB → {after} MB")
+    
+    before = baseline.get('product_memory', {}).get('bytes_per_product')
+    after = current.get('product_memory', {}).get('bytes_per_product')
+    if before and after and after > before * (1 + tolerance):
+        regressions.append(f"product_memory: bytes_per_product {before} → {after}")
+    
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    """Resumen legible de un reporte"""
+    for name, scenario in report['scenarios'].items():
+        rss = scenario['rss_mb']
+        print(f"\n=== {name} ===")
+        print(f"{scenario['pages']} páginas, {scenario['products']} productos en {scenario['wall_s']}s | "
+              f"{scenario['pages_per_s']} páginas/s, {scenario['products_per_s']} productos/s | "
+              f"RSS pico: Python {rss['python_peak']} MB (acumulado del proceso {rss.get('python_peak_cumulative')} MB), "
+              f"Chromium {rss['chromium_peak']} MB")
+        
+        for stage, stats in scenario['stages'].items():
+            print(f"  - {stage:<26} n={stats['count']:<5} p50={stats['p50_ms']:>9} ms  p95={stats['p95_ms']:>9} ms")
+    
+    memory = report.get('product_memory')
+    if memory:
+        print(f"\n=== Memoria de Product ({memory['count']} productos) ===")
+        print(f"{memory['bytes_per_product']} bytes/producto (antes {memory['legacy_bytes_per_product']}), "
+              f"ahorro {memory['saving']:.0%}")
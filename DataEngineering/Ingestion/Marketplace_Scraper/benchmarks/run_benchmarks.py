@@ -0,0 +1,192 @@
+"""
+Suite de benchmarks end-to-end sobre corridas grabadas (HAR).
+
+Grabar los fixtures una vez contra los sitios reales:
+    python -m benchmarks.run_benchmarks --record
+
+Medir (sin red) y comparar contra un reporte anterior:
+    python -m benchmarks.run_benchmarks --repeat 3 --baseline benchmarks/results/base.json
+
+El reporte JSON tiene, por escenario: páginas/s, productos/s, p50/p95 por etapa
+(navigate, post_navigate_validation, get_product_elements, extract_product_info,
+export, ...), el pico de RSS de Python y de Chromium muestreado durante el escenario
+(más el pico acumulado del proceso Python), y los bytes por Product
+(benchmarks/product_memory). Con --baseline el proceso
+termina con código 1 si hay regresiones.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from main import MarketplaceScraper
+from utils.har import HarArchive
+from utils.metrics import stage_metrics, python_peak_rss_mb, python_rss_mb, chromium_rss_mb
+from benchmarks.scenarios import SCENARIOS, DEFAULT_QUERY, DEFAULT_FIXTURES
+from benchmarks.report import compare_reports, print_report
+from benchmarks.product_memory import measure_product_memory
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+class RssSampler:
+    """
+    Muestrea en segundo plano la memoria de Python y de Chromium (driver de Playwright
+    y navegador, sin los workers de parseo) y guarda el pico de cada uno en el escenario.
+    """
+    
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak: Optional[float] = None
+        self.python_peak: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def sample(self):
+        current = chromium_rss_mb()
+        if current is not None:
+            self.peak = max(self.peak or 0, current)
+        
+        python_current = python_rss_mb()
+        if python_current is not None:
+            self.python_peak = max(self.python_peak or 0, python_current)
+    
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+    
+    async def stop(self):
+        self.sample()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def run_scenario(name: str, scenario: Dict[str, Any], query: str, fixtures: str,
+                       repeat: int, mode: str, output_dir: str) -> Dict[str, Any]:
+    """Ejecuta un escenario `repeat` veces y resume tiempos, throughput y memoria"""
+    stage_metrics.reset()
+    sampler = RssSampler()
+    wall = 0.0
+    
+    sampler.start()
+    try:
+        for _ in range(repeat):
+            scraper = MarketplaceScraper(har_archive=HarArchive(mode, f"{fixtures}/{name}"))
+            scraper.exporter.output_dir = output_dir
+            
+            started = time.perf_counter()
+            try:
+                products = await scraper.scrape_multiple_marketplaces(
+                    scenario['marketplaces'], query, scenario['pages'], country='co'
+                )
+                scraper.export_results(products, 'csv')
+                wall += time.perf_counter() - started
+            finally:
+                # Antes de cerrar: el pico de Chromium se mide con el navegador vivo
+                sampler.sample()
+                await scraper.close()
+    finally:
+        await sampler.stop()
+    
+    pages = stage_metrics.counters['pages']
+    products = stage_metrics.counters['products']
+    
+    return {
+        'marketplaces': scenario['marketplaces'],
+        'max_pages': scenario['pages'],
+        'repeat': repeat,
+        'wall_s': round(wall, 3),
+        'pages': pages,
+        'products': products,
+        'pages_per_s': round(pages / wall, 3) if wall else None,
+        'products_per_s': round(products / wall, 2) if wall else None,
+        'stages': stage_metrics.summary(),
+        'rss_mb': {
+            'python_peak': sampler.python_peak,
+            'python_peak_cumulative': python_peak_rss_mb(),
+            'chromium_peak': sampler.peak
+        }
+    }
+
+
+async def run(args) -> int:
+    names = args.scenarios or list(SCENARIOS)
+    mode = 'record' if args.record else 'replay'
+    
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'mode': mode,
+        'query': args.query,
+        'fixtures': args.fixtures,
+        'python': sys.version.split()[0],
+        'scenarios': {}
+    }
+    
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name in names:
+            print(f"\n🏁 Escenario '{name}' ({mode})")
+            report['scenarios'][name] = await run_scenario(
+                name, SCENARIOS[name], args.query, args.fixtures,
+                1 if args.record else args.repeat, mode, output_dir
+            )
+    
+    if not args.record:
+        report['product_memory'] = measure_product_memory(args.products)
+    
+    print_report(report)
+    
+    if args.record:
+        print(f"\n🎙️ Fixtures grabados en har/{args.fixtures}")
+        return 0
+    
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"\n📊 Reporte guardado en {output}")
+    
+    if not args.baseline:
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as file:
+        regressions = compare_reports(report, json.load(file), args.tolerance)
+    
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresiones respecto a {args.baseline}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    
+    print(f"\n✅ Sin regresiones respecto a {args.baseline}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks end-to-end de los scrapers sobre corridas grabadas')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), help='Escenarios a ejecutar (por defecto todos)')
+    parser.add_argument('--query', default=DEFAULT_QUERY, help='Búsqueda (debe coincidir con la grabada)')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='Carpeta de HAR dentro de har/')
+    parser.add_argument('--repeat', type=int, default=1, help='Repeticiones por escenario')
+    parser.add_argument('--products', type=int, default=100_000, help='Productos para la medición de memoria de Product')
+    parser.add_argument('--record', action='store_true', help='Grabar los fixtures contra los sitios reales')
+    parser.add_argument('--output', help='Ruta del reporte JSON')
+    parser.add_argument('--baseline', help='Reporte JSON de referencia para detectar regresiones')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Variación relativa permitida (0.15 = 15%%)')
+    
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
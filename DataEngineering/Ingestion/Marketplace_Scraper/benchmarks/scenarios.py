@@ -0,0 +1,18 @@
+# Escenarios de la suite: cada uno se graba y se reproduce con su propio HAR (har/<fixtures>/<escenario>)
+SCENARIOS = {
+    'single-page': {
+        'marketplaces': ['mercadolibre'],
+        'pages': 1
+    },
+    'multi-page': {
+        'marketplaces': ['mercadolibre'],
+        'pages': 3
+    },
+    'multi-marketplace': {
+        'marketplaces': ['mercadolibre', 'falabella', 'megatienda'],
+        'pages': 1
+    }
+}
+
+DEFAULT_QUERY = "celular"
+DEFAULT_FIXTURES = "benchmarks"
@@ -44,17 +44,193 @@ class Settings:
         "Mozilla/5.0 (Linux; Android 13; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
     ]
     
+    # Pool de navegadores compartido entre scrapers (ver utils/browser.BrowserPool)
+    BROWSER_POOL_CONFIG = {
+        "max_browsers": 1,               # Procesos Chromium por worker
+        "max_contexts_per_browser": 4,   # Contextos abiertos simultáneamente por navegador
+        "max_pages_per_context": 25,     # Navegaciones antes de reciclar un contexto
+        "max_pages_per_browser": 250,    # Navegaciones antes de reciclar el proceso Chromium
+        "prewarm_contexts": 1,           # Contextos desktop creados al iniciar el pool
+        "health_check_timeout": 5        # Segundos para el chequeo de salud de un contexto
+    }
+
+    # Paginación concurrente dentro de una búsqueda (páginas 2..N en paralelo)
+    PAGINATION_CONFIG = {
+        "concurrent": True,   # Solo aplica a scrapers que la soportan (concurrent_pagination)
+        "workers": 3          # Páginas del navegador trabajando a la vez por búsqueda
+    }
+    
+    # Ejecución en paralelo de varios marketplaces (main.MarketplaceScraper)
+    ORCHESTRATION_CONFIG = {
+        "max_concurrency": 3,          # Marketplaces scrapeados al mismo tiempo
+        "marketplace_timeout": 900     # Segundos máximos por marketplace (0 = sin límite)
+    }
+    
+    # Modo por lotes (--queries-file): búsquedas procesadas a la vez por la cola de trabajo
+    BATCH_CONFIG = {
+        "workers": 2
+    }
+    
+    # Pausas de cortesía por dominio (ver utils/rate_limiter.DomainRateLimiter)
     REQUEST_DELAYS={
         "min_delay": 1,
         "max_delay":3,
-        "page_delay":5
+        "page_delay":5,
+        "burst": 1,         # Peticiones seguidas permitidas antes de esperar
+        "overrides": {      # Por sufijo de dominio: min_delay, max_delay, burst
+            "megatiendas.co": {"min_delay": 2, "max_delay": 4}
+        }
+    }
+    
+    # Bloqueo de recursos con page.route (ver utils/browser.ResourcePolicy).
+    # Solo leemos texto y atributos: bloquear imágenes no cambia el src de img.poly-component__picture.
+    # Nota: con page.route activo Chromium no usa la caché HTTP para las peticiones interceptadas.
+    RESOURCE_POLICY_CONFIG = {
+        "enabled": True,
+        "default": {
+            "block_types": ["image", "media", "font"],
+            "block_domains": [
+                "google-analytics.com",
+                "googletagmanager.com",
+                "doubleclick.net",
+                "googlesyndication.com",
+                "facebook.net",
+                "hotjar.com",
+                "clarity.ms",
+                "criteo.com",
+                "criteo.net",
+                "taboola.com",
+                "bat.bing.com",
+                "nr-data.net"
+            ],
+            "allow_domains": []
+        },
+        # Por marketplace: reemplaza claves del perfil por defecto; extra_block_domains se suma
+        "marketplaces": {
+            "MercadoLibre": {},
+            "Falabella": {"extra_block_domains": ["cdn.cookielaw.org"]},
+            "Megatiendas": {}
+        },
+        # Tamaño promedio estimado (bytes) de lo que no se descarga, para el reporte de ahorro
+        "estimated_bytes": {
+            "image": 40000,
+            "media": 500000,
+            "font": 30000,
+            "script": 60000,
+            "other": 5000
+        }
+    }
+    
+    # Estado de sesión persistido por perfil (ver utils/session_state.SessionStateStore)
+    SESSION_STATE_CONFIG = {
+        "enabled": True,
+        "directory": ".sessions",       # Contiene cookies: no versionar
+        "max_age_hours": 72,            # Después se vuelve a resolver el popup de ubicación
+        "popup_check_timeout": 2        # Segundos para confirmar que el popup no aparece con sesión cargada
+    }
+    
+    # Condiciones de página lista por marketplace (ver utils/readiness.ReadinessEngine).
+    # Reemplazan la espera fija de page_delay: se resuelven apenas la página está lista.
+    # required=False: si la condición vence se registra y se continúa (network_idle casi nunca
+    # se cumple en sitios con analítica, por eso su timeout es corto).
+    READINESS_CONFIG = {
+        "poll_interval": 0.25,   # Segundos entre lecturas del conteo de productos
+        "stable_polls": 3,       # Lecturas iguales seguidas para considerar estable el conteo
+        "marketplaces": {
+            "MercadoLibre": [
+                {"condition": "dom_ready", "timeout": 10},
+                {"condition": "selector", "selector": "li.ui-search-layout__item", "timeout": 15, "required": True},
+                {"condition": "count_stable", "selector": "li.ui-search-layout__item", "timeout": 5}
+            ],
+            "Falabella": [
+                {"condition": "dom_ready", "timeout": 10},
+                {"condition": "selector", "selector": ".grid-pod", "timeout": 15, "required": True},
+                {"condition": "network_idle", "timeout": 3},
+                {"condition": "count_stable", "selector": ".grid-pod", "timeout": 5}
+            ],
+            "Megatiendas": [
+                {"condition": "dom_ready", "timeout": 10},
+                {"condition": "selector", "selector": ".vtex-product-summary-2-x-container", "timeout": 15, "required": True},
+                {"condition": "network_idle", "timeout": 3},
+                {"condition": "count_stable", "selector": ".vtex-product-summary-2-x-container", "timeout": 8}
+            ]
+        }
+    }
+    
+    # Carga de scroll infinito (ver utils/browser.BrowserManager.scroll_to_bottom)
+    SCROLL_CONFIG = {
+        "step_ratio": 1.0,          # Alto de cada salto, en pantallas
+        "settle_ms": 300,           # Espera máxima por paso a que aparezcan tarjetas nuevas
+        "stable_window_ms": 1500,   # Tiempo en el fondo sin tarjetas nuevas para terminar
+        "max_steps": 80,
+        "max_ms": 30000
+    }
+    
+    # Caché en disco de páginas de listado (ver utils/response_cache.ResponseCache).
+    # Útil en desarrollo y para repetir una búsqueda en pocos minutos (desktop vs mobile, reintentos).
+    RESPONSE_CACHE_CONFIG = {
+        "enabled": False,
+        "directory": ".cache/responses",
+        "max_mb": 200,              # Tope en disco; se expulsan primero las entradas menos usadas
+        "default_ttl": 600,         # Segundos de vigencia de una página
+        "overrides": {              # TTL por sufijo de dominio
+            "mercadolibre.com.co": 900,
+            "megatiendas.co": 300
+        }
+    }
+    
+    # Grabación / reproducción de corridas con HAR (ver utils/har.HarArchive, --record / --replay)
+    HAR_CONFIG = {
+        "directory": "har",
+        "update_content": "embed",   # Cuerpos dentro del .har ("attach" los guarda como archivos aparte)
+        "update_mode": "minimal"     # Solo lo necesario para reproducir ("full" incluye tiempos y cookies)
+    }
+    
+    # Estrategia de extracción de productos
+    EXTRACTION_CONFIG = {
+        "structured": True,     # Leer el estado JSON embebido (__NEXT_DATA__, __STATE__, ...) antes que el DOM
+        "bulk": True,           # Extraer todas las tarjetas de la página en una sola evaluación JS
+        "offline": False,       # Capturar el HTML de las tarjetas y parsearlo en un pool de procesos
+        "parse_workers": None   # Procesos del pool de parseo (None = número de CPUs)
+    }
+    
+    # Camino rápido HTTP (sin navegador) para listados renderizados en el servidor
+    HTTP_FETCH_CONFIG = {
+        "enabled": False,
+        "http2": True,
+        "timeout": 15,
+        "max_connections": 20,
+        "max_keepalive_connections": 10
+    }
+    
+    # Exportación en streaming página a página (ver utils/sinks, --stream)
+    STREAM_CONFIG = {
+        "dedup": True,                  # Descartar (marketplace, url) ya escritos en la corrida
+        "parquet_rows_per_part": 5000   # Filas por archivo part-NNNNN.parquet (un row group cada uno)
+    }
+    
+    # Exportación Parquet (ver utils/parquet_dataset.ParquetDataset)
+    PARQUET_CONFIG = {
+        "compression": "zstd",
+        "compression_level": 3,
+        "dataset": "products_dataset",                 # Carpeta del dataset particionado dentro de output_dir
+        "partition_by": ["marketplace", "scrape_date"],  # Carpetas Hive: marketplace=X/scrape_date=AAAA-MM-DD
+        "compact_min_files": 4                         # Archivos por partición a partir de los cuales se compacta
+    }
+    
+    # Historial de precios en SQLite (ver utils/price_store.PriceHistoryStore, --history)
+    PRICE_STORE_CONFIG = {
+        "database": "price_history.db",   # Dentro de output_dir
+        "only_changes": True              # Guardar una observación solo si cambia el precio o la disponibilidad
     }
     
     EXPORT_CONFIG={
         #"output_dir": os.path.join(os.getcwd(), "output"),
         "output_dir": "output",
         "csv_delimiter": ",",        
-        "json_indent": 2,        
+        "json_indent": 2,           # None = JSON compacto
+        "json_backend": "auto",     # auto (orjson si está instalado), orjson o json
+        "json_chunk_rows": 5000     # Productos codificados por bloque al escribir JSON
     }
     
     # Dispositivos móviles predefinidos
@@ -83,6 +259,11 @@ class Settings:
         """Retorna la configuración del navegador según el modo"""
         return cls.MOBILE_CONFIG if mobile else cls.BROWSER_CONFIG
     
+    @classmethod
+    def get_readiness_conditions(cls, marketplace: str) -> list:
+        """Retorna las condiciones de página lista del marketplace (vacío = espera fija)"""
+        return cls.READINESS_CONFIG["marketplaces"].get(marketplace, [])
+    
     @classmethod
     def get_user_agents(cls, mobile: bool = False) -> list:
         """Retorna los user agents según el modo"""
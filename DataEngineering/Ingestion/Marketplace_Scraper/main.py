@@ -1,17 +1,30 @@
 import asyncio
 import argparse
-from typing import List,Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 from scrapers.mercadolibre.scraper import MercadoLibreScraper
 from scrapers.falabella.scraper import FalabellaScraper
 from scrapers.megatienda import MegaTiendaScraper
 from utils.exporters import DataExporter
+from utils.browser import BrowserPool
+from utils.http_fetcher import HttpFetcher
+from utils.response_cache import ResponseCache
+from utils.har import HarArchive
+from utils.metrics import stage_metrics
+from utils.sinks import ProductSink, create_sink
+from utils.price_store import PriceHistoryStore
+from utils.rate_limiter import DomainRateLimiter
+from utils.batch import BatchQuery, load_queries
+from utils.html_parsing import shutdown_parse_executor
 from models.product import Product
+from models.product_batch import ProductBatch, ProductsLike, as_batch
 from config.settings import Settings
 
 class MarketplaceScraper:
     """Orquestador principal del sistema de scraping"""
     
-    def __init__(self):
+    def __init__(self, use_http: bool = False, use_cache: bool = False, har_archive: Optional[HarArchive] = None,
+                 sink: Optional[ProductSink] = None, price_store: Optional[PriceHistoryStore] = None):
         self.scrapers = {
             'mercadolibre': MercadoLibreScraper,
             'falabella':FalabellaScraper,
@@ -21,6 +34,35 @@ class MarketplaceScraper:
             #'aliexpress': AliExpressScraper
         }
         self.exporter = DataExporter()
+        
+        # Grabación / reproducción HAR: todo el tráfico pasa por el navegador, sin caché ni camino HTTP
+        self.har_archive = har_archive
+        if har_archive:
+            print(har_archive.describe())
+            use_http = use_cache = False
+        
+        # Pool compartido: Chromium se lanza una vez y todos los scrapers toman contextos prestados
+        self.browser_pool = BrowserPool(har_archive=har_archive)
+        
+        # Pausas de cortesía por dominio, compartidas por todos los scrapers (sin pausas al reproducir)
+        if har_archive and har_archive.replaying:
+            self.rate_limiter = DomainRateLimiter({'min_delay': 0, 'max_delay': 0})
+        else:
+            self.rate_limiter = DomainRateLimiter()
+        
+        # Caché de páginas de listado en disco, compartida por navegador y cliente HTTP (opcional)
+        self.response_cache = ResponseCache() if use_cache else None
+        
+        # Clientes HTTP para el camino rápido sin navegador (opcional), uno por modo de dispositivo:
+        # cada uno usa el User-Agent y el perfil de caché (desktop/mobile) de su modo
+        self.use_http = use_http
+        self.http_fetchers: Dict[bool, HttpFetcher] = {}
+        
+        # Destino en streaming (opcional): los scrapers escriben cada página y no acumulan resultados
+        self.sink = sink
+        
+        # Historial de precios en SQLite (opcional): cada exportación también se agrega ahí
+        self.price_store = price_store
    
     async def scrape_marketplace(self, marketplace: str, query: str, max_pages: int = 1, mobile: bool = False, device: Optional[str] = None, **kwargs) -> List[Product]:
         """Scrapea un marketplace específico"""
@@ -40,22 +82,57 @@ class MarketplaceScraper:
         # Realizar scraping
         products = await scraper.search_products(query, max_pages)
         
-        print(f"Productos encontrados en {marketplace}: {len(products)}")
+        found = scraper.products_count if self.sink else len(products)
+        print(f"Productos encontrados en {marketplace}: {found}")
         
         return products
     
+    def _get_http_fetcher(self, mobile: bool) -> Optional[HttpFetcher]:
+        """Cliente HTTP compartido por los scrapers del mismo modo (desktop o mobile)"""
+        if not self.use_http:
+            return None
+        
+        if mobile not in self.http_fetchers:
+            self.http_fetchers[mobile] = HttpFetcher(mobile=mobile, response_cache=self.response_cache)
+        return self.http_fetchers[mobile]
+    
     def _create_scraper(self, marketplace: str, mobile: bool, device: Optional[str], **kwargs):
         """Crea el scraper específico con configuración mobile"""
         scraper_class = self.scrapers[marketplace]
         
         if marketplace == 'mercadolibre':
             country = kwargs.get('country', 'co')
-            return scraper_class(country=country, mobile=mobile, device=device)
+            scraper = scraper_class(country=country, mobile=mobile, device=device, browser_pool=self.browser_pool,
+                                    http_fetcher=self._get_http_fetcher(mobile), rate_limiter=self.rate_limiter,
+                                    response_cache=self.response_cache)
         elif marketplace == 'amazon':
             domain = kwargs.get('domain', 'com')
-            return scraper_class(domain=domain, mobile=mobile, device=device)
+            scraper = scraper_class(domain=domain, mobile=mobile, device=device)
         else:
-            return scraper_class(mobile=mobile, device=device)
+            scraper = scraper_class(mobile=mobile, device=device, browser_pool=self.browser_pool,
+                                    rate_limiter=self.rate_limiter, response_cache=self.response_cache)
+        
+        if self.sink is not None:
+            scraper.sink = self.sink
+            scraper.keep_results = False
+        
+        return scraper
+    
+    async def close(self):
+        """Libera los recursos compartidos (navegadores, cliente HTTP y pool de parseo)"""
+        await self.browser_pool.close()
+        
+        for http_fetcher in self.http_fetchers.values():
+            await http_fetcher.close()
+        self.http_fetchers = {}
+        
+        if self.response_cache:
+            self.response_cache.report()
+        
+        if self.price_store:
+            self.price_store.close()
+        
+        shutdown_parse_executor()
         
     def _get_mode_info(self, mobile: bool, device: Optional[str]) -> str:
         """Retorna información del modo de scraping"""
@@ -67,22 +144,112 @@ class MarketplaceScraper:
             return "[📱 Mobile]"
         
     async def scrape_multiple_marketplaces(self, marketplaces: List[str], query: str, max_pages: int = 1, 
-                                         mobile: bool = False, device: Optional[str] = None, **kwargs) -> List[Product]:
-        """Scrapea múltiples marketplaces"""
+                                         mobile: bool = False, device: Optional[str] = None,
+                                         concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                                         failed: Optional[List[str]] = None, **kwargs) -> List[Product]:
+        """
+        Scrapea múltiples marketplaces en paralelo.
+        
+        Cada marketplace corre en su propia tarea (hasta `concurrency` a la vez) con su
+        propio tiempo límite; un error o timeout en uno no afecta a los demás. Los
+        resultados se agregan a medida que cada marketplace termina. Si se pasa la lista
+        `failed`, se le agregan los marketplaces que fallaron o superaron el tiempo límite.
+        """
+        concurrency = concurrency or Settings.ORCHESTRATION_CONFIG['max_concurrency']
+        timeout = Settings.ORCHESTRATION_CONFIG['marketplace_timeout'] if timeout is None else timeout
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(marketplace: str):
+            async with semaphore:
+                try:
+                    products = await asyncio.wait_for(
+                        self.scrape_marketplace(marketplace, query, max_pages, mobile, device, **kwargs),
+                        timeout=timeout or None
+                    )
+                    return marketplace, products
+                except asyncio.TimeoutError:
+                    print(f"⏱️ {marketplace} superó el tiempo límite de {timeout}s")
+                except Exception as e:
+                    print(f"Error scrapeando {marketplace}: {e}")
+                
+                if failed is not None:
+                    failed.append(marketplace)
+                return marketplace, []
+        
         all_products = []
+        tasks = [asyncio.ensure_future(run(marketplace)) for marketplace in dict.fromkeys(marketplaces)]
         
-        for marketplace in marketplaces:
-            try:
-                products = await self.scrape_marketplace(
-                    marketplace, query, max_pages, mobile, device, **kwargs
-                )
-                all_products.extend(products)
-            except Exception as e:
-                print(f"Error scrapeando {marketplace}: {e}")
+        for finished in asyncio.as_completed(tasks):
+            marketplace, products = await finished
+            all_products.extend(products)
+            if self.sink:
+                print(f"🏁 {marketplace} terminó ({self.sink.rows_written} productos escritos en total)")
+            else:
+                print(f"🏁 {marketplace} terminó con {len(products)} productos ({len(all_products)} en total)")
         
         return all_products
     
-    def export_results(self, products: List[Product], format: str = 'csv', by_marketplace: bool = False):
+    async def run_batch(self, jobs: List[BatchQuery], workers: Optional[int] = None, format: str = 'csv',
+                        mobile: bool = False, device: Optional[str] = None, **kwargs) -> Dict[str, int]:
+        """
+        Procesa un lote de búsquedas con una cola de trabajo acotada.
+        
+        Los workers comparten el pool de navegadores, así que Chromium se lanza una sola
+        vez para todo el lote. Los resultados de cada búsqueda se agregan al archivo de
+        salida apenas terminan (CSV o JSON Lines), con la query como primera columna.
+        """
+        workers = max(1, min(workers or Settings.BATCH_CONFIG['workers'], len(jobs)))
+        
+        queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"batch_{timestamp}.{'csv' if format == 'csv' else 'jsonl'}"
+        summary = {'queries': 0, 'products': 0, 'failed': 0}
+        
+        async def worker():
+            while not queue.empty():
+                job = queue.get_nowait()
+                failed_marketplaces = []
+                
+                try:
+                    products = await self.scrape_multiple_marketplaces(
+                        job.marketplaces, job.query, job.pages, mobile, device, country=job.country,
+                        failed=failed_marketplaces, **kwargs
+                    )
+                except Exception as e:
+                    print(f"❌ Error en la búsqueda '{job.query}': {e}")
+                    summary['failed'] += 1
+                    continue
+                
+                # La búsqueda falla si ninguno de sus marketplaces terminó sin error
+                if len(failed_marketplaces) == len(set(job.marketplaces)):
+                    print(f"❌ La búsqueda '{job.query}' falló en todos sus marketplaces: {', '.join(failed_marketplaces)}")
+                    summary['failed'] += 1
+                    continue
+                
+                with stage_metrics.stage('export'):
+                    if format == 'csv':
+                        filepath = self.exporter.append_to_csv(products, filename, extra={'query': job.query})
+                    else:
+                        filepath = self.exporter.append_to_jsonl(products, filename, extra={'query': job.query})
+                    
+                    if self.price_store:
+                        self.exporter.export_to_price_history(products, self.price_store)
+                
+                summary['queries'] += 1
+                summary['products'] += len(products)
+                print(f"📦 [{summary['queries'] + summary['failed']}/{len(jobs)}] '{job.query}': "
+                      f"{len(products)} productos agregados a {filepath}")
+        
+        print(f"🚀 Lote de {len(jobs)} búsquedas con {workers} workers")
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        
+        return summary
+    
+    def export_results(self, products: ProductsLike, format: str = 'csv', by_marketplace: bool = False,
+                       compact: bool = False, compact_json: bool = False):
         """Exporta los resultados"""
         if not products:
             print("No hay productos para exportar")
@@ -90,45 +257,44 @@ class MarketplaceScraper:
         
         print(f"\n=== Exportando {len(products)} productos ===")
         
-        if by_marketplace:
-            self.exporter.export_by_marketplace(products, format)
-        else:
-            if format == 'csv':
-                self.exporter.export_to_csv(products)
-            elif format == 'json':
-                self.exporter.export_to_json(products)
+        with stage_metrics.stage('export'):
+            if by_marketplace:
+                self.exporter.export_by_marketplace(products, format, compact=compact, compact_json=compact_json)
             else:
-                print(f"Formato '{format}' no soportado")
+                if format == 'csv':
+                    self.exporter.export_to_csv(products)
+                elif format == 'json':
+                    self.exporter.export_to_json(products, compact=compact_json)
+                elif format == 'jsonl':
+                    self.exporter.export_to_jsonl(products)
+                elif format == 'parquet':
+                    self.exporter.export_to_parquet(products)
+                else:
+                    print(f"Formato '{format}' no soportado")
+            
+            if self.price_store:
+                self.exporter.export_to_price_history(products, self.price_store)
     
-    def print_summary(self, products: List[Product]):
-        """Imprime resumen de resultados"""
-        if not products:
+    def print_summary(self, products: ProductsLike):
+        """Imprime resumen de resultados (agregaciones vectorizadas sobre el lote)"""
+        batch = as_batch(products)
+        if not batch:
             return
         
         print(f"\n=== RESUMEN ===")
-        print(f"Total productos: {len(products)}")
+        print(f"Total productos: {len(batch)}")
         
         # Resumen por marketplace
-        marketplaces = {}
-        for product in products:
-            mp = product.marketplace
-            if mp not in marketplaces:
-                marketplaces[mp] = {'count': 0, 'with_price': 0, 'avg_price': 0}
-            
-            marketplaces[mp]['count'] += 1
-            if product.price:
-                marketplaces[mp]['with_price'] += 1
-        
-        for mp, stats in marketplaces.items():
-            print(f"- {mp}: {stats['count']} productos ({stats['with_price']} con precio)")
+        for stats in batch.summary().iter_rows(named=True):
+            print(f"- {stats['marketplace']}: {stats['count']} productos ({stats['with_price']} con precio)")
         
         # Productos con mejores precios
-        products_with_price = [p for p in products if p.price]
-        if products_with_price:
-            products_with_price.sort(key=lambda x: x.price)
+        cheapest = batch.cheapest(5)
+        if cheapest.height:
             print(f"\nMejores precios:")
-            for i, product in enumerate(products_with_price[:5]):
-                print(f"{i+1}. {product.title[:50]}... - ${product.price} ({product.marketplace})")
+            for i, product in enumerate(cheapest.iter_rows(named=True)):
+                print(f"{i+1}. {product['title'][:50]}... - ${product['price']} ({product['marketplace']})")
+
 def show_available_devices():
     """Muestra dispositivos disponibles"""
     print("\n📱 Dispositivos disponibles para emulación:")
@@ -136,16 +302,36 @@ def show_available_devices():
         print(f"  {i:2d}. {device}")
     print()
     
+def show_price_history(url: str):
+    """Muestra la serie de precios guardada de un producto (por URL o id del ítem)"""
+    with PriceHistoryStore() as store:
+        history = store.history(url)
+    
+    if not history.height:
+        print(f"Sin historial de precios para: {url}")
+        return
+    
+    print(f"\n📈 Historial de precios de {history['item_key'][0]} ({history.height} observaciones)")
+    for row in history.iter_rows(named=True):
+        print(f"- {row['scraped_at']:%Y-%m-%d %H:%M} {row['marketplace']}: ${row['price']}")
+    
 async def main():
     """Función principal"""
     parser = argparse.ArgumentParser(description='Marketplace Scraper')
-    parser.add_argument('query', help='Término de búsqueda')
+    parser.add_argument('query', nargs='?', help='Término de búsqueda')
     parser.add_argument('-m', '--marketplaces', nargs='+', 
                        choices=['mercadolibre', 'amazon', 'falabella', 'aliexpress','megatienda'],
                        default=['mercadolibre'], help='Marketplaces a scrapear')
     parser.add_argument('-p', '--pages', type=int, default=1, help='Número de páginas por marketplace')
-    parser.add_argument('-f', '--format', choices=['csv', 'json'], default='csv', help='Formato de exportación')
+    parser.add_argument('-f', '--format', choices=['csv', 'json', 'jsonl', 'parquet'], default='csv', help='Formato de exportación')
     parser.add_argument('--by-marketplace', action='store_true', help='Exportar separado por marketplace')
+    parser.add_argument('--compact', action='store_true',
+                        help='Con -f parquet --by-marketplace: unir los archivos acumulados de cada partición')
+    parser.add_argument('--compact-json', action='store_true', help='JSON sin indentación (más rápido y liviano)')
+    parser.add_argument('--history', action='store_true', help='Agregar los resultados al historial de precios (SQLite)')
+    parser.add_argument('--price-history', metavar='URL', help='Mostrar la serie de precios guardada de un producto y salir')
+    parser.add_argument('--stream', action='store_true',
+                        help='Escribir cada página apenas se scrapea (csv, jsonl o parquet; json se escribe como JSON Lines)')
     parser.add_argument('--country', default='co', help='País para MercadoLibre (co, mx, ar, etc.)')
     parser.add_argument('--domain', default='com', help='Dominio para Amazon (com, es, mx, etc.)')
     
@@ -154,6 +340,15 @@ async def main():
     parser.add_argument('--device', help='Dispositivo específico a emular (ej: "iPhone 13")')
     #parser.add_argument('--compare', action='store_true', help='Comparar desktop vs mobile')
     parser.add_argument('--show-devices', action='store_true', help='Mostrar dispositivos disponibles')
+    parser.add_argument('--http', action='store_true', help='Intentar descargar listados por HTTP antes de abrir el navegador')
+    parser.add_argument('--cache', action='store_true', help='Reutilizar páginas descargadas recientemente (caché en disco con TTL)')
+    parser.add_argument('--record', nargs='?', const='', metavar='NOMBRE',
+                        help='Grabar la corrida completa en archivos HAR (har/NOMBRE, por defecto la fecha)')
+    parser.add_argument('--replay', metavar='NOMBRE', help='Reproducir una corrida grabada con --record, sin red')
+    parser.add_argument('--queries-file', help='Archivo de lote con búsquedas (.txt, .csv o .jsonl)')
+    parser.add_argument('--workers', type=int, help='Búsquedas del lote procesadas en paralelo')
+    parser.add_argument('--concurrency', type=int, help='Marketplaces a scrapear en paralelo')
+    parser.add_argument('--timeout', type=float, help='Tiempo límite en segundos por marketplace (0 = sin límite)')
     
     args = parser.parse_args()
     
@@ -168,9 +363,63 @@ async def main():
         show_available_devices()
         return
     
+    if args.price_history:
+        show_price_history(args.price_history)
+        return
+    
+    if not args.query and not args.queries_file:
+        parser.error("Indique una query o --queries-file")
+    
+    if args.record is not None and args.replay:
+        parser.error("--record y --replay no se pueden usar juntos")
+    
+    har_archive = None
+    if args.record is not None:
+        har_archive = HarArchive('record', args.record or None)
+    elif args.replay:
+        try:
+            har_archive = HarArchive('replay', args.replay)
+        except FileNotFoundError as e:
+            parser.error(str(e))
+    
+    if args.history and args.stream:
+        parser.error("--history no aplica con --stream (los productos no quedan en memoria)")
+    
+    if args.format == 'parquet' and args.queries_file:
+        parser.error("El modo por lotes escribe CSV o JSON Lines")
+    
+    # Destino en streaming: la búsqueda se escribe página a página (el modo por lotes ya agrega por búsqueda)
+    sink = create_sink(args.format) if args.stream and not args.queries_file else None
+    
     # Crear scraper principal
-    scraper = MarketplaceScraper()
+    scraper = MarketplaceScraper(
+        use_http=args.http or Settings.HTTP_FETCH_CONFIG['enabled'],
+        use_cache=args.cache or Settings.RESPONSE_CACHE_CONFIG['enabled'],
+        har_archive=har_archive,
+        sink=sink,
+        price_store=PriceHistoryStore() if args.history else None
+    )
     try:
+        if args.queries_file:
+            # Modo por lotes: marketplaces, páginas y país del CLI son los valores por defecto
+            defaults = BatchQuery(query='', marketplaces=args.marketplaces, pages=args.pages, country=args.country)
+            jobs = load_queries(args.queries_file, defaults)
+            
+            summary = await scraper.run_batch(
+                jobs,
+                workers=args.workers,
+                format=args.format,
+                mobile=args.mobile,
+                device=args.device,
+                concurrency=args.concurrency,
+                timeout=args.timeout,
+                domain=args.domain
+            )
+            
+            print(f"\n✅ ¡Lote completado! {summary['queries']} búsquedas, "
+                  f"{summary['products']} productos, {summary['failed']} con error")
+            return
+        
         print(f"🚀 Iniciando scraping para: '{args.query}'")
         # Scrapear marketplaces
         products = await scraper.scrape_multiple_marketplaces(
@@ -179,26 +428,48 @@ async def main():
             max_pages=args.pages,
             mobile=args.mobile,
             device=args.device,
+            concurrency=args.concurrency,
+            timeout=args.timeout,
             country=args.country,
             domain=args.domain
         )
         
+        if sink:
+            # Los productos ya están en disco, deduplicados a medida que llegaron
+            sink.close()
+            print(f"\n{sink.describe()}")
+            print("\n✅ ¡Scraping completado!")
+            return
+        
+        # Lote columnar: resumen, deduplicación y exportación sin recorrer objetos
+        batch = ProductBatch.from_products(products)
+        unique = batch.dedup()
+        if len(unique) < len(batch):
+            print(f"🧹 {len(batch) - len(unique)} productos repetidos descartados")
+        
         # Mostrar resumen
-        scraper.print_summary(products)
+        scraper.print_summary(unique)
         
         # Exportar resultados
-        if products:
-            scraper.export_results(products, args.format, args.by_marketplace)
+        if unique:
+            scraper.export_results(unique, args.format, args.by_marketplace, args.compact, args.compact_json)
         
         print("\n✅ ¡Scraping completado!")
         
     except Exception as e:
         print(f"\n❌ Error inesperado: {e}")
+    
+    finally:
+        # Una corrida interrumpida conserva lo ya escrito (el Parquet vacía su última parte)
+        if sink:
+            sink.close()
+        await scraper.close()
      
 if __name__ == "__main__":
     asyncio.run(main())    
 
 # python main.py "galleta" -m megatienda --country co
+# python main.py --queries-file queries.csv -m mercadolibre falabella --workers 4
 # python main.py "televisor" -m falabella --country co
 # python main.py "airpods" -m falabella --country co
 # python main.py "smarthphone" -m mercadolibre --country co --page 4    
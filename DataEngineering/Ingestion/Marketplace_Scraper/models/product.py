@@ -1,10 +1,43 @@
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import List , Optional
+from typing import Iterator, List , Optional
 from datetime import datetime
 
-@dataclass
+# Campos categóricos que se repiten entre miles de productos: se internan para compartir el str
+_INTERNED_FIELDS = ('currency', 'seller', 'brand', 'availability', 'marketplace',
+                    'parent_category', 'category', 'category2')
+
+# scraped_at compartido por los productos de la página/lote actual (ver batch_timestamp).
+# Es un ContextVar: cada tarea asyncio (marketplace, worker de paginación) ve el suyo.
+_batch_scraped_at: ContextVar[Optional[datetime]] = ContextVar('batch_scraped_at', default=None)
+
+
+@contextmanager
+def batch_timestamp(timestamp: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    Fija el scraped_at que reciben los productos creados dentro del bloque.
+    
+    Se abre uno por página (o por lote): todos sus productos comparten el mismo
+    objeto datetime en lugar de crear uno por producto. Al salir se restaura el
+    valor anterior, así un Product creado después no hereda una hora vieja.
+    """
+    stamp = timestamp or datetime.now()
+    token = _batch_scraped_at.set(stamp)
+    try:
+        yield stamp
+    finally:
+        _batch_scraped_at.reset(token)
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True)
 class Product:
-    """Clase simple para representar un producto"""
+    """Clase simple para representar un producto (con __slots__: sin __dict__ por instancia)"""
     title: str
     price: Optional[float] = None
     original_price: Optional[float] = None
@@ -18,15 +51,18 @@ class Product:
     availability: str = ""
     description: str = ""
     marketplace: str = ""
-    scraped_at: datetime = None
-    brand:str=""
+    scraped_at: Optional[datetime] = None
     free_shipping:bool=False
     parent_category:str=""
     category:str=""
     category2:str=""
     
     def __post_init__(self):
-        self.scraped_at = datetime.now()
+        if self.scraped_at is None:
+            self.scraped_at = _batch_scraped_at.get() or datetime.now()
+        
+        for field in _INTERNED_FIELDS:
+            setattr(self, field, _intern(getattr(self, field)))
         
     def to_dict(self):
         """Convierte el producto a diccionario para exportar""" 
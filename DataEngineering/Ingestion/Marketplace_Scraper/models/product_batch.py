@@ -0,0 +1,202 @@
+from typing import List, Optional, Dict, Any, Iterable, Union
+import polars as pl
+from models.product import Product
+
+# Esquema fijo, en el mismo orden de columnas que Product.to_dict()
+PRODUCT_SCHEMA = {
+    'title': pl.Utf8,
+    'price': pl.Float64,
+    'original_price': pl.Float64,
+    'brand': pl.Utf8,
+    'seller': pl.Utf8,
+    'currency': pl.Utf8,
+    'free_shipping': pl.Boolean,
+    'parent_category': pl.Utf8,
+    'category': pl.Utf8,
+    'category2': pl.Utf8,
+    'rating': pl.Float64,
+    'reviews_count': pl.Int64,
+    'availability': pl.Utf8,
+    'description': pl.Utf8,
+    'marketplace': pl.Utf8,
+    'scraped_at': pl.Datetime('us'),
+    'url': pl.Utf8,
+    'image_url': pl.Utf8
+}
+
+PRODUCT_COLUMNS = list(PRODUCT_SCHEMA)
+
+# Largo máximo de la descripción exportada (igual que Product.to_dict)
+DESCRIPTION_LIMIT = 200
+
+
+class ProductBatch:
+    """
+    Resultados en formato columnar (Polars/Arrow) con el esquema de Product.
+    
+    Cada página se agrega como un bloque (chunk) sin copiar los anteriores; to_polars()
+    los une sin reordenar memoria. Resumen, deduplicación y exportación corren como
+    operaciones vectorizadas sobre el DataFrame en lugar de recorrer objetos Product.
+    """
+    
+    def __init__(self, frames: Optional[Iterable[pl.DataFrame]] = None):
+        self._frames: List[pl.DataFrame] = [frame for frame in (frames or []) if frame.height]
+        self._frame: Optional[pl.DataFrame] = None
+    
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> 'ProductBatch':
+        batch = cls()
+        batch.append_products(products)
+        return batch
+    
+    @classmethod
+    def from_frame(cls, frame: pl.DataFrame) -> 'ProductBatch':
+        batch = cls()
+        batch.append_frame(frame)
+        return batch
+    
+    def append_products(self, products: Iterable[Product]):
+        """Agrega una página de productos como un bloque columnar"""
+        products = list(products)
+        if not products:
+            return
+        
+        # strict=False: los extractores pueden entregar 1234.0 en columnas enteras (reviews_count);
+        # se convierten al tipo del esquema en lugar de fallar toda la página
+        columns = {column: [getattr(product, column) for product in products] for column in PRODUCT_COLUMNS}
+        self._append(pl.DataFrame(columns, schema=PRODUCT_SCHEMA, strict=False))
+    
+    def append_frame(self, frame: pl.DataFrame):
+        """Agrega un DataFrame ya columnar (faltantes en nulo, tipos ajustados al esquema)"""
+        if not frame.height:
+            return
+        
+        self._append(frame.select([
+            pl.col(column).cast(dtype) if column in frame.columns else pl.lit(None, dtype=dtype).alias(column)
+            for column, dtype in PRODUCT_SCHEMA.items()
+        ]))
+    
+    def _append(self, frame: pl.DataFrame):
+        self._frames.append(frame)
+        self._frame = None
+    
+    def __len__(self) -> int:
+        return sum(frame.height for frame in self._frames)
+    
+    def __bool__(self) -> bool:
+        return len(self) > 0
+    
+    def to_polars(self) -> pl.DataFrame:
+        """DataFrame con todos los bloques (sin copiar: los bloques quedan como chunks)"""
+        if self._frame is None:
+            self._frame = (
+                pl.concat(self._frames, how='vertical', rechunk=False) if self._frames
+                else pl.DataFrame(schema=PRODUCT_SCHEMA)
+            )
+            self._frames = [self._frame]
+        return self._frame
+    
+    def to_arrow(self):
+        """Tabla de Arrow sin copiar los buffers (requiere pyarrow)"""
+        return self.to_polars().to_arrow()
+    
+    def to_products(self) -> List[Product]:
+        """Vuelve a objetos Product (compatibilidad con código que espera List[Product])"""
+        return [Product(**row) for row in self.to_polars().iter_rows(named=True)]
+    
+    def dedup(self, subset: Iterable[str] = ('marketplace', 'url')) -> 'ProductBatch':
+        """
+        Quita los repetidos por (marketplace, url) conservando el primero.
+        
+        Los productos sin URL no se pueden comparar y se conservan todos.
+        """
+        frame = self.to_polars()
+        if not frame.height:
+            return self
+        
+        keep = pl.struct(list(subset)).is_first_distinct() | (pl.col('url') == '') | pl.col('url').is_null()
+        return ProductBatch([frame.filter(keep)])
+    
+    def summary(self) -> pl.DataFrame:
+        """Por marketplace: productos, con precio, precio promedio, mínimo y máximo"""
+        has_price = pl.col('price').is_not_null() & (pl.col('price') != 0)
+        
+        return (
+            self.to_polars()
+            .group_by('marketplace', maintain_order=True)
+            .agg(
+                pl.len().alias('count'),
+                has_price.sum().alias('with_price'),
+                pl.col('price').filter(has_price).mean().alias('avg_price'),
+                pl.col('price').filter(has_price).min().alias('min_price'),
+                pl.col('price').filter(has_price).max().alias('max_price')
+            )
+        )
+    
+    def cheapest(self, limit: int = 5) -> pl.DataFrame:
+        """Productos con precio, del más barato al más caro"""
+        frame = self.to_polars()
+        return (
+            frame.filter(pl.col('price').is_not_null() & (pl.col('price') != 0))
+            .sort('price', maintain_order=True)
+            .head(limit)
+        )
+    
+    def partition_by_marketplace(self) -> Dict[str, 'ProductBatch']:
+        """Un lote por marketplace ('unknown' para los que no tienen)"""
+        frame = self.to_polars().with_columns(
+            pl.when(pl.col('marketplace').is_null() | (pl.col('marketplace') == ''))
+            .then(pl.lit('unknown'))
+            .otherwise(pl.col('marketplace'))
+            .alias('_partition')
+        )
+        
+        return {
+            key[0]: ProductBatch([part.drop('_partition')])
+            for key, part in frame.partition_by('_partition', as_dict=True, maintain_order=True).items()
+        }
+    
+    def export_frame(self, csv: bool = False, extra: Optional[Dict[str, Any]] = None) -> pl.DataFrame:
+        """
+        Columnas con el mismo formato que Product.to_dict(): descripción recortada
+        y scraped_at en ISO 8601. Para CSV los booleanos se escriben como True/False.
+        `extra` agrega columnas fijas al inicio (ej: la query del lote).
+        """
+        scraped_at = pl.col('scraped_at')
+        description = pl.col('description')
+        
+        exprs = [
+            pl.when(description.str.len_chars() > DESCRIPTION_LIMIT)
+            .then(description.str.slice(0, DESCRIPTION_LIMIT) + '...')
+            .otherwise(description)
+            .alias('description'),
+            pl.when(scraped_at.dt.microsecond() == 0)
+            .then(scraped_at.dt.to_string('%Y-%m-%dT%H:%M:%S'))
+            .otherwise(scraped_at.dt.to_string('%Y-%m-%dT%H:%M:%S%.6f'))
+            .alias('scraped_at')
+        ]
+        frame = self.to_polars().with_columns(exprs)
+        
+        if csv:
+            # Polars escribe "" entre comillas; csv.DictWriter dejaba la celda vacía
+            text_columns = [column for column, dtype in frame.schema.items() if dtype == pl.Utf8]
+            frame = frame.with_columns(
+                [pl.when(pl.col(column) != '').then(pl.col(column)).alias(column) for column in text_columns]
+                + [pl.when(pl.col('free_shipping')).then(pl.lit('True')).otherwise(pl.lit('False')).alias('free_shipping')]
+            )
+        
+        if extra:
+            frame = frame.select([pl.lit(value).alias(key) for key, value in extra.items()] + PRODUCT_COLUMNS)
+        
+        return frame
+    
+    def marketplaces(self) -> List[str]:
+        return self.to_polars()['marketplace'].unique(maintain_order=True).to_list()
+
+
+ProductsLike = Union[List[Product], ProductBatch]
+
+
+def as_batch(products: ProductsLike) -> ProductBatch:
+    """Acepta List[Product] o ProductBatch y retorna un ProductBatch"""
+    return products if isinstance(products, ProductBatch) else ProductBatch.from_products(products)
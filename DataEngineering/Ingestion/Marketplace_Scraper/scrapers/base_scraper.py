@@ -1,21 +1,71 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Callable, Tuple
 import asyncio
-from models.product import Product
-from utils.browser import BrowserManager
-from utils.helpers import random_delay
+from collections import deque
+from models.product import Product, batch_timestamp
+from utils.browser import BrowserManager, BrowserPool, ResourcePolicy
+from utils.rate_limiter import DomainRateLimiter
+from utils.response_cache import ResponseCache
+from utils.html_parsing import parse_in_process
+from utils.structured_data import EMBEDDED_STATE_SCRIPT, load_state
+from utils.readiness import ReadinessEngine
+from utils.metrics import stage_metrics
+from utils.sinks import ProductSink
 from config.settings import Settings
 
+# Captura el outerHTML de las tarjetas del primer selector que tenga coincidencias
+CAPTURE_CARDS_SCRIPT = """
+(selectors) => {
+    for (const selector of selectors) {
+        let cards = [];
+        try {
+            cards = Array.from(document.querySelectorAll(selector));
+        } catch (e) {
+            continue;
+        }
+        if (cards.length) return cards.map((card) => card.outerHTML);
+    }
+    return [];
+}
+"""
+
 class BaseScraper(ABC):
     """Clase base para todos los scrapers"""
     
-    def __init__(self, mobile: bool = False, device: Optional[str] = None):
+    def __init__(self, mobile: bool = False, device: Optional[str] = None, browser_pool: Optional[BrowserPool] = None,
+                 rate_limiter: Optional[DomainRateLimiter] = None, session_profile: Optional[str] = None,
+                 response_cache: Optional[ResponseCache] = None):
         self.mobile = mobile
         self.device = device
-        self.browser_manager = BrowserManager(mobile=mobile)
+        self.browser_manager = BrowserManager(mobile=mobile, pool=browser_pool, session_profile=session_profile,
+                                              response_cache=response_cache)
+        
+        # Limitador por dominio (compartido entre scrapers cuando lo pasa el orquestador)
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
         self.marketplace_name = ""
         self.base_url = ""
         self.products: List[Product] = []
+        
+        # Destino en streaming: cada página se escribe apenas se scrapea (lo asigna el orquestador).
+        # Con keep_results=False los productos solo van al destino y la memoria no crece con la corrida.
+        self.sink: Optional[ProductSink] = None
+        self.keep_results = True
+        self.products_count = 0
+        
+        # Modo captura + parseo offline: selectores de tarjetas y parser (función picklable)
+        self.card_selectors: List[str] = []
+        self.html_parser: Optional[Callable[..., List[Optional[dict]]]] = None
+        self.html_parser_args: tuple = ()
+        
+        # Estado JSON embebido en la página (selectores <script> o variables globales)
+        self.state_sources: List[Dict[str, str]] = []
+        
+        # Condiciones de página lista (se crea con el marketplace_name de la subclase)
+        self.readiness: Optional[ReadinessEngine] = None
+        
+        # Paginación concurrente: las páginas 2..N se pueden construir tras la página 1
+        self.concurrent_pagination = False
     
     @abstractmethod
     async def build_search_url(self, query: str, **kwargs) -> str:
@@ -32,6 +82,49 @@ class BaseScraper(ABC):
         """Obtiene los elementos de productos de la página"""
         pass
     
+    async def extract_page_products(self) -> Optional[List[Product]]:
+        """
+        Extrae todos los productos de la página actual en una sola evaluación en el navegador.
+        
+        Los scrapers que lo soporten deben sobrescribirlo. Retornar None indica que
+        se debe usar la extracción elemento por elemento.
+        """
+        return None
+    
+    def build_product_from_raw(self, raw: Optional[dict]) -> Optional[Product]:
+        """Construye un Product a partir de los campos crudos que retorna html_parser"""
+        return None
+    
+    def build_products_from_state(self, state: Any) -> Optional[List[Product]]:
+        """
+        Construye los productos a partir del estado JSON embebido en la página.
+        
+        Los scrapers con state_sources deben sobrescribirlo. Retornar None o una lista
+        vacía indica que se debe extraer desde el DOM.
+        """
+        return None
+    
+    async def prepare_worker_page(self, browser_manager: BrowserManager) -> bool:
+        """
+        Equivalente de post_navigate_validation para las páginas de la paginación concurrente.
+        
+        Recibe el BrowserManager del worker en lugar de usar self.browser_manager.
+        """
+        return True
+    
+    async def extract_products_from(self, page) -> Optional[List[Product]]:
+        """Extrae los productos de una página de la paginación concurrente (None = no soportado)"""
+        return None
+    
+    async def fetch_page_products(self, url: str) -> Optional[List[Product]]:
+        """
+        Camino rápido HTTP: descarga y parsea la página sin abrir el navegador.
+        
+        Los scrapers de sitios renderizados en el servidor pueden sobrescribirlo.
+        Retornar None indica que se debe cargar la página con Playwright.
+        """
+        return None
+    
     @abstractmethod
     async def post_navigate_validation(self) -> bool:
         """
@@ -52,70 +145,377 @@ class BaseScraper(ABC):
     async def search_products(self, query: str, max_pages: int = 1, **kwargs) -> List[Product]:
         """Busca productos por query"""
         self.products = []
+        self.products_count = 0
+        
+        # Páginas capturadas cuyo parseo sigue en el pool de procesos (modo offline)
+        pending_pages = []
+        
+        # El navegador se inicia solo cuando el camino HTTP no alcanza
+        browser_started = False
+        
+        # Con paginación concurrente solo la página 1 se recorre en orden
+        sequential_pages = 1 if self.concurrent_pagination_enabled(max_pages) else max_pages
         
         try:
-            # Iniciar navegador
-            await self.browser_manager.start()
-            
-            for page_num in range(1, max_pages + 1):
+            for page_num in range(1, sequential_pages + 1):
                 print(f"📄 Scrapeando página {page_num} de 🌐 {self.marketplace_name}")
                 
-                # Construir URL
-                search_url = await self.build_search_url(query, page=page_num, **kwargs)
-                print(f"URL: {search_url}")
+                # Un solo scraped_at compartido por todos los productos de la página
+                with batch_timestamp() as scraped_at:
+                    # Construir URL
+                    search_url = await self.build_search_url(query, page=page_num, **kwargs)
+                    print(f"URL: {search_url}")
+                    
+                    # Turno del dominio: espera sin bloquear a los demás scrapers (no aplica a páginas en caché)
+                    if not self.browser_manager.is_cached(search_url):
+                        await self.rate_limiter.acquire(search_url)
+                    
+                    # Intentar primero sin navegador
+                    with stage_metrics.stage('http_fetch'):
+                        page_products = await self.fetch_page_products(search_url)
+                    
+                    if page_products is not None:
+                        if not page_products:
+                            print(f"⚠️ No se encontraron productos en página {page_num}")
+                            break
+                    
+                        for product in page_products:
+                            product.marketplace = self.marketplace_name
+                    
+                        self.add_page_products(page_products)
+                        stage_metrics.count('pages')
+                        print(f"⚡ Productos encontrados en página {page_num} (HTTP): {len(page_products)}")
+                        continue
+                    
+                    # Iniciar navegador
+                    if not browser_started:
+                        browser_started = True
+                        await self.browser_manager.start(resource_policy=ResourcePolicy.for_marketplace(self.marketplace_name))
+                    
+                    # Navegar a la página
+                    with stage_metrics.stage('navigate'):
+                        success = await self.browser_manager.goto(search_url)
+                    if not success:
+                        print(f"Error cargando página {page_num}")
+                        continue
+                    
+                    # Ejecutar validaciones post-navegación
+                    print(f"🧭 Ejecutando validaciones post-navegación para {self.marketplace_name}")
+                    with stage_metrics.stage('post_navigate_validation'):
+                        validation_success = await self.post_navigate_validation()
+                    
+                    if not validation_success:
+                        print(f"❌ Falló la validación post-navegación en página {page_num}")
+                        # Puedes decidir si continuar o saltar esta página
+                        continue                
+                    
+                    
+                    # Esperar a que cargue el contenido
+                    with stage_metrics.stage('wait_until_ready'):
+                        ready = await self.wait_until_ready()
+                    if not ready:
+                        print(f"⚠️ La página {page_num} no cumplió las condiciones de carga, intentando extraer igual")
+                    
+                    # Estado JSON embebido: toda la página en una sola lectura, sin selectores
+                    with stage_metrics.stage('extract_structured'):
+                        structured_products = await self.extract_structured_products()
+                    
+                    if structured_products is not None:
+                        self.add_page_products(structured_products)
+                        stage_metrics.count('pages')
+                        print(f"Productos encontrados en página {page_num} (estado embebido): {len(structured_products)}")
+                    elif self.offline_parsing_enabled():
+                        # Capturar el HTML y seguir navegando mientras otro proceso lo parsea
+                        cards_html = await self.capture_cards_html()
+                    
+                        if not cards_html:
+                            print(f"⚠️ No se encontraron productos en página {page_num}")
+                            break
+                    
+                        parsing = asyncio.ensure_future(
+                            parse_in_process(self.html_parser, cards_html, *self.html_parser_args)
+                        )
+                        pending_pages.append((page_num, parsing, scraped_at))
+                        stage_metrics.count('pages')
+                        print(f"📦 Página {page_num} capturada ({len(cards_html)} tarjetas), parseo en segundo plano")
+                    else:
+                        # Obtener productos de la página
+                        page_products = await self.scrape_current_page()
+                    
+                        if not page_products:
+                            print(f"⚠️ No se encontraron productos en página {page_num}")
+                            break
+                        
+                        self.add_page_products(page_products)
+                        stage_metrics.count('pages')
+                        print(f"Productos encontrados en página {page_num}: {len(page_products)}")
+            
+            # Páginas restantes en paralelo: sus URLs dependen de lo que dejó la página 1.
+            # Si la página 1 sigue en el parseo offline se agrega antes, para no desordenar el destino.
+            if sequential_pages < max_pages:
+                await self._add_parsed_pages(pending_pages)
+            
+            if sequential_pages < max_pages and self.products_count:
+                page_urls = [
+                    (page_num, await self.build_search_url(query, page=page_num, **kwargs))
+                    for page_num in range(sequential_pages + 1, max_pages + 1)
+                ]
+                await self.scrape_pages_concurrently(page_urls)
+            
+        except Exception as e:
+            print(f"❌ Error en búsqueda: {e}")
+        
+        finally:
+            if browser_started:
+                await self.browser_manager.close()
+        
+        # Reunir en orden de página los resultados del parseo offline
+        await self._add_parsed_pages(pending_pages)
+        
+        stage_metrics.count('products', self.products_count)
+        print(f"Total productos encontrados: {self.products_count}")
+        return self.products
+    
+    def add_page_products(self, products: List[Product]):
+        """Agrega los productos de una página a la lista y los escribe en el destino"""
+        self.products_count += len(products)
+        
+        if self.sink is not None:
+            with stage_metrics.stage('sink_write'):
+                self.sink.write(products)
+        
+        if self.keep_results:
+            self.products.extend(products)
+    
+    def concurrent_pagination_enabled(self, max_pages: int) -> bool:
+        """Indica si las páginas 2..N se scrapean en paralelo"""
+        return bool(Settings.PAGINATION_CONFIG['concurrent'] and self.concurrent_pagination and max_pages > 1)
+    
+    async def scrape_pages_concurrently(self, page_urls: List[Tuple[int, str]]) -> int:
+        """
+        Scrapea varias páginas en paralelo, cada worker con su propia página del navegador.
+        
+        Cada petición sigue pasando por el limitador del dominio. Una página se agrega
+        (y se escribe en el destino) apenas ella y todas las anteriores terminaron: solo
+        quedan en memoria las que esperan a una página anterior. Se corta en la primera
+        página sin productos. Retorna la cantidad de productos agregados.
+        """
+        workers = min(Settings.PAGINATION_CONFIG['workers'], len(page_urls))
+        print(f"🔀 Paginación concurrente: {len(page_urls)} páginas con {workers} workers")
+        
+        queue = asyncio.Queue()
+        for page_url in page_urls:
+            queue.put_nowait(page_url)
+        
+        # Páginas terminadas que esperan a una anterior: lista de productos, o None si no se pudo cargar
+        results: Dict[int, Optional[List[Product]]] = {}
+        waiting = deque(page_num for page_num, _ in page_urls)
+        added = 0
+        
+        def add_ready_pages():
+            """Agrega en orden las páginas terminadas al frente de la fila"""
+            nonlocal added
+            
+            while waiting and waiting[0] in results:
+                page_num = waiting.popleft()
+                page_products = results.pop(page_num)
                 
-                # Navegar a la página
-                success = await self.browser_manager.goto(search_url)
-                if not success:
-                    print(f"Error cargando página {page_num}")
+                if page_products is None:
                     continue
                 
-                # Ejecutar validaciones post-navegación
-                print(f"🧭 Ejecutando validaciones post-navegación para {self.marketplace_name}")
-                validation_success = await self.post_navigate_validation()
-                
-                if not validation_success:
-                    print(f"❌ Falló la validación post-navegación en página {page_num}")
-                    # Puedes decidir si continuar o saltar esta página
-                    continue                
-                
-                
-                # Esperar a que cargue el contenido
-                await asyncio.sleep(Settings.REQUEST_DELAYS['page_delay'])
-                
-                # Obtener productos de la página
-                page_products = await self.scrape_current_page()
-                
                 if not page_products:
                     print(f"⚠️ No se encontraron productos en página {page_num}")
-                    break
+                    # Las páginas siguientes ni se agregan ni se piden
+                    waiting.clear()
+                    results.clear()
+                    while not queue.empty():
+                        queue.get_nowait()
+                    return
                 
-                self.products.extend(page_products)
-                print(f"Productos encontrados en página {page_num}: {len(page_products)}")
+                self.add_page_products(page_products)
+                added += len(page_products)
+        
+        await asyncio.gather(*(self._pagination_worker(queue, results, add_ready_pages) for _ in range(workers)))
+        return added
+    
+    async def _pagination_worker(self, queue: asyncio.Queue, results: Dict[int, Optional[List[Product]]],
+                                 on_page_done: Callable[[], None]):
+        """
+        Toma páginas de la cola hasta vaciarla; abre su navegador solo si hace falta.
+        
+        Tras cada página llama on_page_done para que se agreguen las que ya están en orden.
+        """
+        browser_manager: Optional[BrowserManager] = None
+        
+        try:
+            while not queue.empty():
+                page_num, url = queue.get_nowait()
                 
-                # Delay entre páginas
-                if page_num < max_pages:
-                    random_delay(
-                        Settings.REQUEST_DELAYS['min_delay'],
-                        Settings.REQUEST_DELAYS['max_delay']
-                    )
-            
-        except Exception as e:
-            print(f"❌ Error en búsqueda: {e}")
+                try:
+                    with batch_timestamp():
+                        if not self.browser_manager.is_cached(url):
+                            await self.rate_limiter.acquire(url)
+                        
+                        with stage_metrics.stage('http_fetch'):
+                            page_products = await self.fetch_page_products(url)
+                        
+                        if page_products is None:
+                            if browser_manager is None:
+                                browser_manager = BrowserManager(
+                                    mobile=self.mobile,
+                                    pool=self.browser_manager.pool,
+                                    session_profile=self.browser_manager.session_profile,
+                                    response_cache=self.browser_manager.response_cache,
+                                    cache_validator=self.browser_manager.cache_validator
+                                )
+                                await browser_manager.start(resource_policy=ResourcePolicy.for_marketplace(self.marketplace_name))
+                            
+                            page_products = await self._scrape_worker_page(browser_manager, page_num, url)
+                    
+                    for product in page_products or []:
+                        product.marketplace = self.marketplace_name
+                    
+                    results[page_num] = page_products
+                    if page_products:
+                        stage_metrics.count('pages')
+                        print(f"Productos encontrados en página {page_num}: {len(page_products)}")
+                    
+                except Exception as e:
+                    print(f"❌ Error scrapeando página {page_num}: {e}")
+                    results[page_num] = None
+                
+                on_page_done()
         
         finally:
-            await self.browser_manager.close()
+            if browser_manager:
+                await browser_manager.close()
+    
+    async def _scrape_worker_page(self, browser_manager: BrowserManager, page_num: int, url: str) -> Optional[List[Product]]:
+        """Navega, valida y extrae una página en el navegador de un worker"""
+        with stage_metrics.stage('navigate'):
+            success = await browser_manager.goto(url)
+        if not success:
+            print(f"Error cargando página {page_num}")
+            return None
         
-        print(f"Total productos encontrados: {len(self.products)}")
-        return self.products
+        page = browser_manager.page
+        
+        with stage_metrics.stage('post_navigate_validation'):
+            validation_success = await self.prepare_worker_page(browser_manager)
+        if not validation_success:
+            print(f"❌ Falló la validación post-navegación en página {page_num}")
+            return None
+        
+        with stage_metrics.stage('wait_until_ready'):
+            ready = await self.wait_until_ready(page)
+        if not ready:
+            print(f"⚠️ La página {page_num} no cumplió las condiciones de carga, intentando extraer igual")
+        
+        with stage_metrics.stage('extract_structured'):
+            products = await self.extract_structured_products(page)
+        if products is None:
+            with stage_metrics.stage('extract_page_products'):
+                products = await self.extract_products_from(page)
+        
+        return products or []
+    
+    async def wait_until_ready(self, page=None) -> bool:
+        """Espera a que la página esté lista (condiciones del marketplace o espera fija)"""
+        conditions = Settings.get_readiness_conditions(self.marketplace_name)
+        
+        if not conditions:
+            await asyncio.sleep(Settings.REQUEST_DELAYS['page_delay'])
+            return True
+        
+        # Las páginas de los workers usan su propio motor para no mezclar tiempos
+        if page is not None:
+            return await ReadinessEngine(conditions).wait_until_ready(page)
+        
+        if self.readiness is None:
+            self.readiness = ReadinessEngine(conditions)
+        
+        return await self.readiness.wait_until_ready(self.browser_manager.page)
+    
+    async def extract_structured_products(self, page=None) -> Optional[List[Product]]:
+        """Lee el estado JSON embebido con una sola evaluación (None si no está disponible)"""
+        if not Settings.EXTRACTION_CONFIG['structured'] or not self.state_sources:
+            return None
+        
+        page = page or self.browser_manager.page
+        
+        try:
+            state_text = await page.evaluate(EMBEDDED_STATE_SCRIPT, self.state_sources)
+        except Exception as e:
+            print(f"⚠️ Estado embebido no disponible: {e}")
+            return None
+        
+        products = self.build_products_from_state(load_state(state_text))
+        if not products:
+            print("↪️ Sin estado embebido utilizable, extrayendo desde el DOM")
+            return None
+        
+        for product in products:
+            product.marketplace = self.marketplace_name
+        
+        return products
+    
+    def offline_parsing_enabled(self) -> bool:
+        """Indica si se usa el modo captura + parseo offline"""
+        return bool(Settings.EXTRACTION_CONFIG['offline'] and self.html_parser and self.card_selectors)
+    
+    async def capture_cards_html(self) -> List[str]:
+        """Captura el outerHTML de todas las tarjetas de la página en una sola evaluación"""
+        try:
+            return await self.browser_manager.page.evaluate(CAPTURE_CARDS_SCRIPT, self.card_selectors)
+        except Exception as e:
+            print(f"Error capturando HTML de la página: {e}")
+            return []
+    
+    async def _add_parsed_pages(self, pending_pages: List[Tuple[int, Any, datetime]]):
+        """Agrega en orden de página las páginas capturadas cuyo parseo offline seguía pendiente"""
+        while pending_pages:
+            page_num, parsing, scraped_at = pending_pages.pop(0)
+            page_products = await self._collect_parsed_page(parsing, scraped_at)
+            self.add_page_products(page_products)
+            print(f"Productos encontrados en página {page_num}: {len(page_products)}")
+    
+    async def _collect_parsed_page(self, parsing, scraped_at: datetime) -> List[Product]:
+        """Espera el parseo de una página y construye sus productos con la hora de su captura"""
+        products = []
+        
+        try:
+            raw_products = await parsing
+            with batch_timestamp(scraped_at):
+                for raw in raw_products:
+                    product = self.build_product_from_raw(raw)
+                    if product:
+                        product.marketplace = self.marketplace_name
+                        products.append(product)
+        except Exception as e:
+            print(f"Error parseando página capturada: {e}")
+        
+        return products
     
     async def scrape_current_page(self) -> List[Product]:
         """Scrapea la página actual"""
         products = []
         
         try:
+            # Extracción masiva: una sola ida y vuelta al navegador para toda la página
+            if Settings.EXTRACTION_CONFIG['bulk']:
+                with stage_metrics.stage('extract_page_products'):
+                    bulk_products = await self.extract_page_products()
+                
+                if bulk_products is not None:
+                    for product in bulk_products:
+                        product.marketplace = self.marketplace_name
+                    
+                    print(f"== 🎉 Extracción masiva completada: {len(bulk_products)} productos == ")
+                    return bulk_products
+            
             # Obtener elementos de productos
-            product_elements = await self.get_product_elements()
+            with stage_metrics.stage('get_product_elements'):
+                product_elements = await self.get_product_elements()
             
             if not product_elements:
                 return products
@@ -126,7 +526,8 @@ class BaseScraper(ABC):
             # Extraer información de cada producto
             for element in product_elements:
                 try:
-                    product = await self.extract_product_info(element)
+                    with stage_metrics.stage('extract_product_info'):
+                        product = await self.extract_product_info(element)
                     if product:
                         product.marketplace = self.marketplace_name
                         products.append(product)
@@ -140,6 +541,7 @@ class BaseScraper(ABC):
         
         return products
     
-    async def scroll_and_load(self):
+    async def scroll_and_load(self) -> Optional[Dict[str, Any]]:
         """Hacer scroll para cargar más productos (útil para sitios con scroll infinito)"""
-        await self.browser_manager.scroll_to_bottom()
\ No newline at end of file
+        card_selector = ", ".join(self.card_selectors) if self.card_selectors else None
+        return await self.browser_manager.scroll_to_bottom(card_selector)
\ No newline at end of file
@@ -0,0 +1,41 @@
+from typing import List, Optional
+from selectolax.lexbor import LexborHTMLParser as HTMLParser, LexborNode as Node
+from utils.html_parsing import inner_text, get_attribute, fragment_root
+from scrapers.falabella.product_extractor import CARD_SELECTOR
+
+
+def parse_card(pod: Node) -> Optional[dict]:
+    """Lee los campos crudos de un pod (misma forma que BULK_EXTRACTION_SCRIPT)"""
+    try:
+        return {
+            'title': inner_text(pod.css_first('b.pod-subTitle')),
+            'internet_price': get_attribute(pod.css_first('li[data-internet-price]'), 'data-internet-price'),
+            'event_price': get_attribute(pod.css_first('li[data-event-price]'), 'data-event-price'),
+            'normal_price': get_attribute(pod.css_first('li[data-normal-price]'), 'data-normal-price'),
+            'discount_text': inner_text(pod.css_first('.discount-badge'), ''),
+            'link': get_attribute(pod.css_first('a.pod-link'), 'href'),
+            'image_url': get_attribute(pod.css_first('div.pod-head img'), 'src', ''),
+            'brand': inner_text(pod.css_first('b.title-rebrand'), ''),
+            'seller': inner_text(pod.css_first('b.pod-sellerText'), ''),
+            'free_shipping': any(
+                'gratis' in (span.text(deep=True) or '').lower() for span in pod.css('span')
+            ),
+        }
+    except Exception:
+        return None
+
+
+def parse_cards(cards_html: List[str]) -> List[Optional[dict]]:
+    """Parsea el outerHTML de cada pod capturado en el navegador"""
+    cards = []
+    
+    for card_html in cards_html:
+        root = fragment_root(card_html)
+        cards.append(parse_card(root) if root is not None else None)
+    
+    return cards
+
+
+def parse_document(html: str) -> List[Optional[dict]]:
+    """Parsea todos los pods de un documento completo (page.content())"""
+    return [parse_card(pod) for pod in HTMLParser(html).css(CARD_SELECTOR)]
@@ -79,7 +79,7 @@ class NavigationPreparator:
                 try:
                     await page.wait_for_selector(selector, timeout=10000)
                     print(f"✅ Contenido cargado: {selector}")
-                    await asyncio.sleep(2)  # Pausa adicional para JS dinámico
+                    # El JS dinámico lo cubre ReadinessEngine (conteo de pods estable)
                     return
                 except:
                     continue
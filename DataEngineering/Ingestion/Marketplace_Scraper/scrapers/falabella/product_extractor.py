@@ -3,6 +3,39 @@ from models.product import Product
 from models.price_info import PriceInfo
 from utils.helpers import extract_number,clean_price
 
+CARD_SELECTOR = '.grid-pod'
+
+# Lee todos los pods de la página (incluyendo los atributos data-*-price) en una sola evaluación.
+# Los valores por defecto replican lo que retornan los métodos _extract_* por elemento.
+BULK_EXTRACTION_SCRIPT = """
+(pods) => pods.map((pod) => {
+    try {
+        const q = (selector) => pod.querySelector(selector);
+        const text = (element, fallback) => element ? element.innerText : fallback;
+        const attr = (element, name, fallback) => element ? element.getAttribute(name) : fallback;
+        
+        const discountElement = q('.discount-badge');
+        
+        return {
+            title: text(q('b.pod-subTitle'), null),
+            internet_price: attr(q('li[data-internet-price]'), 'data-internet-price', null),
+            event_price: attr(q('li[data-event-price]'), 'data-event-price', null),
+            normal_price: attr(q('li[data-normal-price]'), 'data-normal-price', null),
+            discount_text: discountElement ? discountElement.innerText.trim() : '',
+            link: attr(q('a.pod-link'), 'href', null),
+            image_url: attr(q('div.pod-head img'), 'src', ''),
+            brand: text(q('b.title-rebrand'), ''),
+            seller: text(q('b.pod-sellerText'), ''),
+            free_shipping: Array.from(pod.querySelectorAll('span')).some(
+                (span) => (span.textContent || '').toLowerCase().includes('gratis')
+            )
+        };
+    } catch (e) {
+        return null;
+    }
+})
+"""
+
 
 class ProductExtractor:
     """Extrae información de productos"""
@@ -43,6 +76,77 @@ class ProductExtractor:
             print(f"❌ Error obteniendo elementos de productos: {e}")
             return []
     
+    async def extract_products_bulk(self, category_info: dict) -> Optional[List[Product]]:
+        """
+        Extrae todos los pods de la página en una sola evaluación en el navegador.
+        
+        Retorna None si la evaluación falla, para que se use la extracción por elemento.
+        """
+        try:
+            raw_pods = await self.page.eval_on_selector_all(CARD_SELECTOR, BULK_EXTRACTION_SCRIPT)
+        except Exception as e:
+            print(f"⚠️ Extracción masiva no disponible, usando extracción por elemento: {e}")
+            return None
+        
+        print(f"🔍 Se encontraron {len(raw_pods)} pods de productos")
+        
+        products = []
+        for raw in raw_pods:
+            product = self.build_product(raw, category_info)
+            if product:
+                products.append(product)
+        
+        return products
+    
+    def build_product(self, raw: Optional[dict], category_info: dict) -> Optional[Product]:
+        """Construye un Product a partir de los campos crudos de un pod"""
+        try:
+            if not raw or not raw['title']:
+                return None
+            
+            # Precio actual: internet primero y evento como respaldo
+            price_text = raw['internet_price'] if raw['internet_price'] is not None else raw['event_price']
+            
+            price_info = PriceInfo(
+                original_price = clean_price(raw['normal_price']),
+                current_price  = clean_price(price_text),
+                discount       = raw['discount_text']
+            )
+            
+            if price_info.current_price is None:
+                print(f"⚠️ Precio no encontrado: {raw['title']}")
+            
+            return Product(
+                title           = raw['title'],
+                price           = price_info.current_price,
+                original_price  = price_info.original_price,
+                marketplace     = self.marketplace_name,
+                currency        = "COP",  # Falabella Colombia usa pesos colombianos
+                brand           = raw['brand'],
+                seller          = raw['seller'],
+                parent_category = category_info.get('parent_category', ''),
+                category        = category_info.get('category', ''),
+                category2       = category_info.get('category2', ''),
+                free_shipping   = raw['free_shipping'],
+                url             = raw['link'],
+                image_url       = raw['image_url'],
+            )
+            
+        except Exception as e:
+            print(f"⚠️ Error extrayendo información de producto: {e}")
+            return None
+    
+    def build_structured_product(self, item: dict, category_info: dict) -> Product:
+        """Construye un Product a partir de un resultado del estado JSON embebido"""
+        return Product(
+            **item,
+            marketplace     = self.marketplace_name,
+            currency        = "COP",  # Falabella Colombia usa pesos colombianos
+            parent_category = category_info.get('parent_category', ''),
+            category        = category_info.get('category', ''),
+            category2       = category_info.get('category2', ''),
+        )
+    
     async def extract_product_info(self, element, category_info: dict) -> Optional[Product]:
         """Extrae información del producto desde el elemento HTML"""
         try:
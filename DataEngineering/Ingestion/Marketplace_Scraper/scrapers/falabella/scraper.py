@@ -1,17 +1,25 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from urllib.parse import quote_plus
 from models.product import Product
 from scrapers.base_scraper import BaseScraper
+from utils.browser import BrowserPool
+from utils.rate_limiter import DomainRateLimiter
+from utils.response_cache import ResponseCache
 
 from scrapers.falabella.navigation_preparator import NavigationPreparator
-from scrapers.falabella.product_extractor import ProductExtractor
+from scrapers.falabella.product_extractor import ProductExtractor, CARD_SELECTOR
+from scrapers.falabella.html_parser import parse_cards
+from scrapers.falabella.structured_data import STATE_SOURCES, parse_state
 
 
 class FalabellaScraper(BaseScraper):
     """Scraper para Falabella Colombia"""
     
-    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None):
-        super().__init__(mobile=mobile, device=device)
+    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None,
+                 browser_pool: Optional[BrowserPool] = None, rate_limiter: Optional[DomainRateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        super().__init__(mobile=mobile, device=device, browser_pool=browser_pool, rate_limiter=rate_limiter,
+                         response_cache=response_cache)
         self.marketplace_name = "Falabella"
         self.country = country
         self.base_url = f"https://www.falabella.com.{country}/falabella-{country}"
@@ -22,6 +30,13 @@ class FalabellaScraper(BaseScraper):
         self.page_validator = None
         self.product_extractor = None
         
+        # Modo captura + parseo offline
+        self.card_selectors = [CARD_SELECTOR]
+        self.html_parser = parse_cards
+        
+        # Estado embebido (__NEXT_DATA__)
+        self.state_sources = STATE_SOURCES
+        
         # Estado
         self.category_info = {}
     
@@ -68,6 +83,30 @@ class FalabellaScraper(BaseScraper):
         
         return await self.product_extractor.get_product_elements()
     
+    async def extract_page_products(self) -> Optional[List[Product]]:
+        """Extrae todos los pods de la página en una sola evaluación"""
+        if not self.product_extractor:
+            return None
+        
+        return await self.product_extractor.extract_products_bulk(self.category_info)
+    
+    def build_products_from_state(self, state: Any) -> Optional[List[Product]]:
+        """Construye los productos desde los resultados de __NEXT_DATA__"""
+        if not self.product_extractor:
+            return None
+        
+        return [
+            self.product_extractor.build_structured_product(item, self.category_info)
+            for item in parse_state(state)
+        ]
+    
+    def build_product_from_raw(self, raw: Optional[dict]) -> Optional[Product]:
+        """Construye el producto a partir de un pod parseado offline"""
+        if not self.product_extractor:
+            return None
+        
+        return self.product_extractor.build_product(raw, self.category_info)
+    
     async def extract_product_info(self, element) -> Optional[Product]:
         """Extrae información del producto desde el elemento HTML"""
         if not self.product_extractor:
@@ -0,0 +1,66 @@
+from typing import Any, Dict, List, Optional
+from utils.structured_data import dig, find_list, to_price, to_number, mentions_free_shipping
+
+# Falabella es un sitio Next.js: el listado viene completo en __NEXT_DATA__
+STATE_SOURCES = [
+    {'selector': 'script#__NEXT_DATA__'},
+    {'global': '__NEXT_DATA__'}
+]
+
+# Insignias donde Falabella anuncia el envío gratis
+SHIPPING_BADGE_KEYS = ('badges', 'multipurposeBadges', 'meatStickers')
+
+
+def find_results(state: Any) -> List[dict]:
+    """Ubica la lista de resultados de búsqueda dentro de __NEXT_DATA__"""
+    results = dig(state, 'props', 'pageProps', 'results')
+    if isinstance(results, list):
+        return results
+    
+    return find_list(state, lambda item: isinstance(item, dict) and 'displayName' in item and 'prices' in item) or []
+
+
+def parse_result(result: Any) -> Optional[Dict[str, Any]]:
+    """Mapea un resultado de __NEXT_DATA__ a los campos de Product"""
+    if not isinstance(result, dict) or not result.get('displayName'):
+        return None
+    
+    prices = [price for price in result.get('prices') or [] if isinstance(price, dict)]
+    by_type = {price.get('type'): price for price in prices}
+    
+    def price_value(price: Optional[dict]) -> Optional[float]:
+        return to_price(dig(price, 'price', 0))
+    
+    # Mismo orden que los data-*-price del DOM: internet, evento y normal como precio anterior
+    current_price = price_value(by_type.get('internetPrice')) or price_value(by_type.get('eventPrice'))
+    if current_price is None:
+        current_price = next((price_value(price) for price in prices if not price.get('crossed')), None)
+    
+    original_price = price_value(by_type.get('normalPrice'))
+    if original_price is None:
+        original_price = next((price_value(price) for price in prices if price.get('crossed')), None)
+    
+    return {
+        'title':          result['displayName'].strip(),
+        'price':          current_price,
+        'original_price': original_price,
+        'url':            result.get('url') or '',
+        'image_url':      dig(result, 'mediaUrls', 0, default=''),
+        'brand':          result.get('brand') or '',
+        'seller':         result.get('sellerName') or '',
+        'rating':         to_number(result.get('rating')),
+        'reviews_count':  to_number(result.get('totalReviews'), int),
+        'free_shipping':  any(mentions_free_shipping(result.get(key)) for key in SHIPPING_BADGE_KEYS if result.get(key)),
+    }
+
+
+def parse_state(state: Any) -> List[Dict[str, Any]]:
+    """Mapea todos los resultados del estado embebido"""
+    items = []
+    
+    for result in find_results(state):
+        item = parse_result(result)
+        if item:
+            items.append(item)
+    
+    return items
@@ -1,17 +1,265 @@
 from playwright.sync_api import sync_playwright, Page
 import asyncio
-from typing import List, Optional
+from typing import Any, List, Optional, Dict
 from urllib.parse import quote_plus
 from models.product import Product
 from scrapers.base_scraper import BaseScraper
+from utils.browser import BrowserPool
+from utils.rate_limiter import DomainRateLimiter
+from utils.response_cache import ResponseCache
 from utils.helpers import clean_price, clean_text, extract_number, make_absolute_url
+from utils.html_parsing import parse_probe_cards
+from utils.structured_data import dig, to_price
 from models.price_info import PriceInfo
+from config.settings import Settings
+
+# Sondea todos los selectores candidatos de todos los campos y tarjetas en una sola evaluación.
+# Soporta la pseudo-clase :has-text("...") de Playwright (sin distinguir mayúsculas).
+SELECTOR_PROBE_SCRIPT = """
+({ containers, fields }) => {
+    const queryAll = (root, selector) => {
+        const hasText = selector.match(/^(.*):has-text\\("(.*)"\\)$/);
+        if (!hasText) {
+            return Array.from(root.querySelectorAll(selector));
+        }
+        const needle = hasText[2].toLowerCase();
+        return Array.from(root.querySelectorAll(hasText[1] || '*'))
+            .filter((element) => (element.textContent || '').toLowerCase().includes(needle));
+    };
+    const first = (root, selector) => {
+        try {
+            return queryAll(root, selector)[0] || null;
+        } catch (e) {
+            return null;
+        }
+    };
+    
+    let containerSelector = null;
+    let cards = [];
+    for (const selector of containers) {
+        let found = [];
+        try {
+            found = queryAll(document, selector);
+        } catch (e) {
+            continue;
+        }
+        if (found.length) {
+            containerSelector = selector;
+            cards = found;
+            break;
+        }
+    }
+    
+    const probeField = (card, spec) => {
+        const candidates = [];
+        for (const selector of spec.selectors) {
+            const element = first(card, selector);
+            if (!element) continue;
+            
+            if (spec.mode === 'exists') return { selector, value: true };
+            
+            if (spec.mode === 'attr') {
+                const value = element.getAttribute(spec.attribute);
+                if (value) return { selector, value };
+                continue;
+            }
+            
+            const match = { selector, value: element.innerText };
+            if (spec.mode === 'text') return match;
+            candidates.push(match);
+        }
+        return spec.mode === 'candidates' ? candidates : null;
+    };
+    
+    return {
+        container_selector: containerSelector,
+        cards: cards.map((card) => {
+            const result = {};
+            for (const [field, spec] of Object.entries(fields)) {
+                try {
+                    result[field] = probeField(card, spec);
+                } catch (e) {
+                    result[field] = spec.mode === 'candidates' ? [] : null;
+                }
+            }
+            return result;
+        })
+    };
+}
+"""
+
+# Megatiendas es una tienda VTEX IO: el estado normalizado (Apollo) queda en __STATE__
+VTEX_STATE_SOURCES = [
+    {'global': '__STATE__'},
+    {'selector': 'template[data-varname="__STATE__"]'}
+]
+
+
+def parse_vtex_state(state: Any, base_url: str) -> List[Dict[str, Any]]:
+    """Mapea los productos del estado VTEX (__STATE__) a los campos de Product"""
+    if not isinstance(state, dict):
+        return []
+    
+    def resolve(ref: Any) -> Any:
+        # Las relaciones vienen como referencias {"type": "id", "id": "<clave>"}
+        if isinstance(ref, dict) and ref.get('type') == 'id' and 'id' in ref:
+            return state.get(ref['id'])
+        return ref
+    
+    items = []
+    for key, product in state.items():
+        # Solo las entradas de producto, no sus subobjetos (items, priceRange, ...)
+        if not key.startswith('Product:') or '.' in key or not isinstance(product, dict):
+            continue
+        
+        title = (product.get('productName') or '').strip()
+        if not title:
+            continue
+        
+        price_range = resolve(product.get('priceRange'))
+        selling_price = resolve(dig(price_range, 'sellingPrice'))
+        list_price = resolve(dig(price_range, 'listPrice'))
+        
+        first_item = resolve(dig(product, 'items', 0))
+        image = resolve(dig(first_item, 'images', 0))
+        image_url = dig(image, 'imageUrl', default='')
+        
+        link = product.get('link') or (f"/{product['linkText']}/p" if product.get('linkText') else '')
+        
+        items.append({
+            'title':          title,
+            'price':          to_price(dig(selling_price, 'lowPrice')),
+            'original_price': to_price(dig(list_price, 'highPrice')),
+            'url':            make_absolute_url(base_url, link) if link else None,
+            'image_url':      make_absolute_url(base_url, image_url) if image_url else '',
+            'brand':          product.get('brand') or '',
+        })
+    
+    return items
+
 
 class MegaTiendaScraper(BaseScraper):
     """Scraper para Megatiendas Colombia"""
     
-    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None):
-        super().__init__(mobile=mobile, device=device)
+    # Selectores de tarjetas de producto, en orden de prioridad
+    PRODUCT_SELECTORS = [
+        '.product-item',
+        '.product-card',
+        '.product-container',
+        '.shelf-item',
+        '.product-tile',
+        '[data-testid="product-item"]',
+        '.vtex-product-summary',
+        '.product-summary',
+        '.vtex-product-summary-2-x-container'
+    ]
+    
+    # Selectores candidatos por campo, en orden de prioridad
+    FIELD_SELECTORS = {
+        'title': [
+            '.product-name',
+            '.product-title',
+            'h3.product-name',
+            '.vtex-product-summary__product-name',
+            '.product-summary-name',
+            '[data-testid="product-name"]',
+            'a.product-name',
+            '.shelf-item__name',
+            '.vtex-product-summary-2-x-productBrand'
+        ],
+        'link': [
+            'a.product-link',
+            'a[href*="/p"]',
+            '.product-name a',
+            '.product-title a',
+            'a.shelf-item__link',
+            '.vtex-product-summary a'
+        ],
+        'brand': [
+            '.product-brand',
+            '.brand-name',
+            '.vtex-product-summary__brand',
+            '[data-testid="product-brand"]',
+            '.shelf-item__brand'
+        ],
+        'image': [
+            '.product-image img',
+            '.product-img img',
+            '.vtex-product-summary__image img',
+            '.shelf-item__image img',
+            'img.product-image',
+            '[data-testid="product-image"] img',
+            'img.vtex-product-summary-2-x-image'
+        ],
+        'current_price': [
+            '.price-current',
+            '.current-price',
+            '.price-selling',
+            '.vtex-product-price__selling-price',
+            '.product-price',
+            '[data-testid="current-price"]',
+            '.shelf-item__price',
+            '.price-value',
+            '.selling-price-value',
+            '.vtex-product-price-1-x-sellingPriceValue'
+        ],
+        'original_price': [
+            '.price-original',
+            '.original-price',
+            '.price-list',
+            '.vtex-product-price__list-price',
+            '.list-price',
+            '[data-testid="list-price"]',
+            '.old-price',
+            '.price-was',
+            '.list-price-value',
+            '.vtex-product-price-1-x-listPriceValue'
+        ],
+        'discount': [
+            '.discount-badge',
+            '.discount-percent',
+            '.vtex-product-price__savings',
+            '.price-discount',
+            '[data-testid="discount"]',
+            '.discount-label',
+            '.percentage-discount',
+            '.vtex-product-price-1-x-savingsPercentage'
+        ],
+        'free_shipping': [
+            '.free-shipping',
+            '.envio-gratis',
+            '.shipping-free',
+            'span:has-text("Envío gratis")',
+            'span:has-text("gratis")',
+            'span:has-text("Gratis")',
+            '.delivery-free',
+            '[data-testid="free-shipping"]'
+        ]
+    }
+    
+    # Cómo sondear cada campo en el probe en lote:
+    # text = primer selector que coincide, attr = primer selector con atributo no vacío,
+    # candidates = todas las coincidencias en orden (se elige la primera con precio válido),
+    # exists = basta con que algún selector coincida
+    FIELD_PROBE_SPECS = {
+        'title':          {'mode': 'text'},
+        'link':           {'mode': 'attr', 'attribute': 'href'},
+        'brand':          {'mode': 'text'},
+        'image':          {'mode': 'attr', 'attribute': 'src'},
+        'current_price':  {'mode': 'candidates'},
+        'original_price': {'mode': 'candidates'},
+        'discount':       {'mode': 'text'},
+        'free_shipping':  {'mode': 'exists'}
+    }
+    
+    # Perfil de sesión con la tienda de recogida ya elegida (Bolívar / Cartagena)
+    SESSION_PROFILE = "megatiendas-bolivar-cartagena"
+    
+    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None,
+                 browser_pool: Optional[BrowserPool] = None, rate_limiter: Optional[DomainRateLimiter] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        super().__init__(mobile=mobile, device=device, browser_pool=browser_pool, rate_limiter=rate_limiter,
+                         session_profile=self.SESSION_PROFILE, response_cache=response_cache)
         
         # Configuración de Megatiendas
         self.marketplace_name = "Megatiendas"
@@ -20,6 +268,17 @@ class MegaTiendaScraper(BaseScraper):
         self.search_url = f"{self.base_url}/buscar"
         self.products_per_page = 24  # Megatiendas típicamente muestra 24 productos por página
         
+        # Modo captura + parseo offline (mismo probe de selectores, en Python)
+        self.card_selectors = self.PRODUCT_SELECTORS
+        self.html_parser = parse_probe_cards
+        self.html_parser_args = (self._probe_field_specs(),)
+        
+        # Estado embebido de VTEX (__STATE__)
+        self.state_sources = VTEX_STATE_SOURCES
+        
+        # Selector que coincidió por campo en el último probe en lote
+        self.selector_report: Dict[str, Dict[str, int]] = {}
+        
         # Información de categorías
         self.category_info = {
             'parent_category': '',
@@ -88,7 +347,21 @@ class MegaTiendaScraper(BaseScraper):
             # 4. Seleccionar (Html Radio) "Tienda" => Megatiendas Prado
             # 5. Click en Boton "Guardar"
                         
-            button_element = await page.wait_for_selector('text="Recoge en tienda"', timeout=5000)
+            # Con la sesión guardada la tienda ya está elegida y el popup no debería aparecer
+            session_loaded = self.browser_manager.session_loaded
+            timeout = Settings.SESSION_STATE_CONFIG['popup_check_timeout'] * 1000 if session_loaded else 5000
+            
+            try:
+                button_element = await page.wait_for_selector('text="Recoge en tienda"', timeout=timeout)
+            except Exception:
+                if session_loaded:
+                    print("🗝️ Sesión guardada vigente, popup de Megatiendas omitido")
+                    return
+                raise
+            
+            if session_loaded:
+                print("🗝️ La sesión guardada ya no suprime el popup, renovándola")
+            
             await button_element.click()
             await asyncio.sleep(1)
 
@@ -114,6 +387,13 @@ class MegaTiendaScraper(BaseScraper):
             await asyncio.sleep(1)
             await page.get_by_role("button", name="Guardar").click()
             
+            # Guardar la sesión cuando el modal se cierre (la tienda elegida queda en cookies/localStorage)
+            try:
+                await page.wait_for_selector('text="Recoge en tienda"', state='detached', timeout=5000)
+            except Exception:
+                pass
+            await self.browser_manager.save_session()
+            
             # npx playwright codegen https://www.megatiendas.co/galleta?_q=galleta
             
             print("✅ Popups de Megatiendas manejados")
@@ -138,7 +418,7 @@ class MegaTiendaScraper(BaseScraper):
                 try:
                     await page.wait_for_selector(selector, timeout=15000)
                     print(f"✅ Contenido de Megatiendas cargado: {selector}")
-                    await asyncio.sleep(3)  # Pausa adicional para JS dinámico
+                    # El JS dinámico lo cubre ReadinessEngine (conteo de productos estable)
                     return
                 except:
                     continue
@@ -182,17 +462,7 @@ class MegaTiendaScraper(BaseScraper):
         try:
             page = self.browser_manager.page
             
-            # Selectores múltiples para mayor robustez
-            product_selectors = [
-                '.product-item',
-                '.product-card',
-                '.product-container',
-                '.shelf-item',
-                '.product-tile',
-                '[data-testid="product-item"]',
-                '.vtex-product-summary',
-                '.product-summary'
-            ]
+            product_selectors = self.PRODUCT_SELECTORS
             
             elements = []
             
@@ -215,6 +485,140 @@ class MegaTiendaScraper(BaseScraper):
             print(f"❌ Error obteniendo elementos de productos de Megatiendas: {e}")
             return []
     
+    async def extract_page_products(self) -> Optional[List[Product]]:
+        """
+        Extrae todos los productos con un único probe en el navegador.
+        
+        Evalúa todos los selectores candidatos de todos los campos sobre todas las
+        tarjetas en una sola llamada y reporta qué selector coincidió en cada campo.
+        """
+        try:
+            page = self.browser_manager.page
+            probe = await page.evaluate(
+                SELECTOR_PROBE_SCRIPT, 
+                {'containers': self.PRODUCT_SELECTORS, 'fields': self._probe_field_specs()}
+            )
+        except Exception as e:
+            print(f"⚠️ Probe en lote no disponible, usando extracción por elemento: {e}")
+            return None
+        
+        if not probe['container_selector']:
+            print("❌ No se encontraron elementos de productos de Megatiendas")
+            return []
+        
+        print(f"🔍 Se encontraron {len(probe['cards'])} productos de Megatiendas con selector: {probe['container_selector']}")
+        
+        self.selector_report = {'container': {probe['container_selector']: len(probe['cards'])}}
+        
+        products = []
+        for card in probe['cards']:
+            product = self._build_product_from_probe(card)
+            if product:
+                products.append(product)
+        
+        self._print_selector_report()
+        return products
+    
+    def _probe_field_specs(self) -> Dict[str, dict]:
+        """Selectores candidatos y modo de sondeo de cada campo"""
+        return {
+            field: {**spec, 'selectors': self.FIELD_SELECTORS[field]}
+            for field, spec in self.FIELD_PROBE_SPECS.items()
+        }
+    
+    def build_products_from_state(self, state: Any) -> Optional[List[Product]]:
+        """Construye los productos desde el estado VTEX (__STATE__)"""
+        return [
+            Product(
+                **item,
+                marketplace     = self.marketplace_name,
+                currency        = "COP",  # Megatiendas Colombia usa pesos colombianos
+                seller          = "Megatiendas",
+                parent_category = self.category_info.get('parent_category', ''),
+                category        = self.category_info.get('category', ''),
+                category2       = self.category_info.get('category2', ''),
+            )
+            for item in parse_vtex_state(state, self.base_url)
+        ]
+    
+    def build_product_from_raw(self, raw: Optional[dict]) -> Optional[Product]:
+        """Construye el producto a partir de una tarjeta sondeada offline"""
+        if not raw:
+            return None
+        
+        return self._build_product_from_probe(raw)
+    
+    def _build_product_from_probe(self, card: dict) -> Optional[Product]:
+        """Construye un Product a partir de las coincidencias del probe para una tarjeta"""
+        try:
+            title = clean_text(self._probe_value(card, 'title')) or None
+            
+            price_info = PriceInfo(
+                original_price = self._probe_price(card, 'original_price'),
+                current_price  = self._probe_price(card, 'current_price'),
+                discount       = clean_text(self._probe_value(card, 'discount'))
+            )
+            
+            link = self._probe_value(card, 'link')
+            image = self._probe_value(card, 'image')
+            
+            if not title:
+                print("⚠️ Título no encontrado en producto de Megatiendas")
+                return None
+            
+            if price_info.current_price is None:
+                print(f"⚠️ Precio no encontrado en Megatiendas: {title}")
+            
+            return Product(
+                title           = title,
+                price           = price_info.current_price,
+                original_price  = price_info.original_price,
+                marketplace     = self.marketplace_name,
+                currency        = "COP",  # Megatiendas Colombia usa pesos colombianos
+                brand           = clean_text(self._probe_value(card, 'brand')),
+                seller          = "Megatiendas",
+                parent_category = self.category_info.get('parent_category', ''),
+                category        = self.category_info.get('category', ''),
+                category2       = self.category_info.get('category2', ''),
+                free_shipping   = bool(self._probe_value(card, 'free_shipping')),
+                url             = make_absolute_url(self.base_url, link) if link else None,
+                image_url       = make_absolute_url(self.base_url, image) if image else "",
+            )
+            
+        except Exception as e:
+            print(f"⚠️ Error extrayendo información de producto de Megatiendas: {e}")
+            return None
+    
+    def _probe_value(self, card: dict, field: str):
+        """Retorna el valor que coincidió para un campo y lo registra en el reporte"""
+        match = card.get(field)
+        if not match:
+            return None
+        
+        self._record_selector(field, match['selector'])
+        return match['value']
+    
+    def _probe_price(self, card: dict, field: str) -> Optional[float]:
+        """Retorna el primer precio válido entre los candidatos del probe"""
+        for match in card.get(field) or []:
+            price = clean_price(match['value'])
+            if price:
+                self._record_selector(field, match['selector'])
+                return price
+        return None
+    
+    def _record_selector(self, field: str, selector: str):
+        """Cuenta cuántas veces coincidió cada selector por campo"""
+        field_report = self.selector_report.setdefault(field, {})
+        field_report[selector] = field_report.get(selector, 0) + 1
+    
+    def _print_selector_report(self):
+        """Imprime qué selector coincidió para cada campo"""
+        print("🧭 Selectores que coincidieron en Megatiendas:")
+        for field, matches in self.selector_report.items():
+            summary = ", ".join(f"{selector} ({count})" for selector, count in matches.items())
+            print(f"   {field}: {summary}")
+    
     async def extract_product_info(self, element) -> Optional[Product]:
         """Extrae información del producto desde el elemento HTML"""
         try:
@@ -274,17 +678,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _extract_title(self, element) -> Optional[str]:
         """Extrae el titulo del producto"""
         try:
-            # Selectores posibles para el título en Megatiendas
-            title_selectors = [
-                '.product-name',
-                '.product-title',
-                'h3.product-name',
-                '.vtex-product-summary__product-name',
-                '.product-summary-name',
-                '[data-testid="product-name"]',
-                'a.product-name',
-                '.shelf-item__name'
-            ]
+            title_selectors = self.FIELD_SELECTORS['title']
             
             for selector in title_selectors:
                 try:
@@ -302,17 +696,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _check_free_shipping(self, element) -> bool:
         """Extrae si el producto tiene envío gratis"""
         try:
-            # Selectores para envío gratis en Megatiendas
-            shipping_selectors = [
-                '.free-shipping',
-                '.envio-gratis',
-                '.shipping-free',
-                'span:has-text("Envío gratis")',
-                'span:has-text("gratis")',
-                'span:has-text("Gratis")',
-                '.delivery-free',
-                '[data-testid="free-shipping"]'
-            ]
+            shipping_selectors = self.FIELD_SELECTORS['free_shipping']
             
             for selector in shipping_selectors:
                 try:
@@ -329,15 +713,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _extract_link(self, element) -> Optional[str]:
         """Extrae el link del producto"""
         try:
-            # Selectores para enlaces en Megatiendas
-            link_selectors = [
-                'a.product-link',
-                'a[href*="/p"]',
-                '.product-name a',
-                '.product-title a',
-                'a.shelf-item__link',
-                '.vtex-product-summary a'
-            ]
+            link_selectors = self.FIELD_SELECTORS['link']
             
             for selector in link_selectors:
                 try:
@@ -345,7 +721,7 @@ class MegaTiendaScraper(BaseScraper):
                     if link_element:
                         href = await link_element.get_attribute('href')
                         if href:
-                            return make_absolute_url(href, self.base_url)
+                            return make_absolute_url(self.base_url, href)
                 except:
                     continue
                     
@@ -356,14 +732,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _extract_brand(self, element) -> str:
         """Extrae la marca del producto"""
         try:
-            # Selectores para marca en Megatiendas
-            brand_selectors = [
-                '.product-brand',
-                '.brand-name',
-                '.vtex-product-summary__brand',
-                '[data-testid="product-brand"]',
-                '.shelf-item__brand'
-            ]
+            brand_selectors = self.FIELD_SELECTORS['brand']
             
             for selector in brand_selectors:
                 try:
@@ -381,15 +750,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _extract_image(self, element) -> str:
         """Extrae la URL de la imagen del producto"""
         try:
-            # Selectores para imagen en Megatiendas
-            image_selectors = [
-                '.product-image img',
-                '.product-img img',
-                '.vtex-product-summary__image img',
-                '.shelf-item__image img',
-                'img.product-image',
-                '[data-testid="product-image"] img'
-            ]
+            image_selectors = self.FIELD_SELECTORS['image']
             
             for selector in image_selectors:
                 try:
@@ -397,7 +758,7 @@ class MegaTiendaScraper(BaseScraper):
                     if image_element:
                         src = await image_element.get_attribute('src')
                         if src:
-                            return make_absolute_url(src, self.base_url)
+                            return make_absolute_url(self.base_url, src)
                 except:
                     continue
                     
@@ -457,10 +818,11 @@ class MegaTiendaScraper(BaseScraper):
                         continue
                     
                     url = ""
-                    if element.tag_name.lower() == 'a':
+                    tag_name = await element.evaluate('(node) => node.tagName')
+                    if tag_name.lower() == 'a':
                         url = await element.get_attribute('href')
                         if url:
-                            url = make_absolute_url(url, self.base_url)
+                            url = make_absolute_url(self.base_url, url)
                     
                     breadcrumb_item = {
                         'name': name,
@@ -501,18 +863,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _get_current_price(self, element) -> Optional[float]:
         """Extrae el precio actual del producto"""
         try:
-            # Selectores para precio actual en Megatiendas
-            price_selectors = [
-                '.price-current',
-                '.current-price',
-                '.price-selling',
-                '.vtex-product-price__selling-price',
-                '.product-price',
-                '[data-testid="current-price"]',
-                '.shelf-item__price',
-                '.price-value',
-                '.selling-price-value'
-            ]
+            price_selectors = self.FIELD_SELECTORS['current_price']
             
             for selector in price_selectors:
                 try:
@@ -534,18 +885,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _get_original_price(self, element) -> Optional[float]:
         """Extrae el precio original (tachado) del producto"""
         try:
-            # Selectores para precio original en Megatiendas
-            original_price_selectors = [
-                '.price-original',
-                '.original-price',
-                '.price-list',
-                '.vtex-product-price__list-price',
-                '.list-price',
-                '[data-testid="list-price"]',
-                '.old-price',
-                '.price-was',
-                '.list-price-value'
-            ]
+            original_price_selectors = self.FIELD_SELECTORS['original_price']
             
             for selector in original_price_selectors:
                 try:
@@ -567,16 +907,7 @@ class MegaTiendaScraper(BaseScraper):
     async def _get_discount_text(self, element) -> str:
         """Extrae el texto de descuento del producto"""
         try:
-            # Selectores para descuento en Megatiendas
-            discount_selectors = [
-                '.discount-badge',
-                '.discount-percent',
-                '.vtex-product-price__savings',
-                '.price-discount',
-                '[data-testid="discount"]',
-                '.discount-label',
-                '.percentage-discount'
-            ]
+            discount_selectors = self.FIELD_SELECTORS['discount']
             
             for selector in discount_selectors:
                 try:
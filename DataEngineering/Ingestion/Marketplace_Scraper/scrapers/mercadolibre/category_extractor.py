@@ -77,21 +77,25 @@ class CategoryExtractor:
             print("📂 Extrayendo información de categorías...")
             
             breadcrumb = await self.extract_breadcrumb()
-            self.category_info['breadcrumb'] = breadcrumb
-            
-            if not breadcrumb:
-                print("⚠️ No se pudo extraer breadcrumb")
-                return self.category_info
-            
-            # Procesar categorías por posición
-            self._process_categories_by_position(breadcrumb)
-            
-            return self.category_info
+            return self.build_category_info(breadcrumb)
                          
         except Exception as e:
             print(f"❌ Error extrayendo información de categorías: {e}")
             return self.category_info
     
+    def build_category_info(self, breadcrumb: List[Dict]) -> Dict:
+        """Arma la información de categorías a partir de un breadcrumb ya extraído"""
+        self.category_info['breadcrumb'] = breadcrumb
+        
+        if not breadcrumb:
+            print("⚠️ No se pudo extraer breadcrumb")
+            return self.category_info
+        
+        # Procesar categorías por posición
+        self._process_categories_by_position(breadcrumb)
+        
+        return self.category_info
+    
     def _process_categories_by_position(self, breadcrumb: List[Dict]):
         """Procesa las categorías según su posición en el breadcrumb"""
         # Categoría padre (posición 1)
@@ -0,0 +1,132 @@
+from typing import List, Optional, Dict, Any
+from selectolax.lexbor import LexborHTMLParser as HTMLParser, LexborNode as Node
+from utils.html_parsing import inner_text, get_attribute, fragment_root
+from utils.helpers import clean_text
+from scrapers.mercadolibre.product_extractor import CARD_SELECTOR
+
+# Marcadores de páginas que no son un listado (login, captcha, verificación de cuenta)
+INTERSTITIAL_MARKERS = [
+    'account-verification',
+    'captcha',
+    'login.mercadolibre',
+    'suspicious-traffic'
+]
+
+# Mismos selectores que FilterExtractor.get_active_filters
+APPLIED_FILTER_SELECTORS = [
+    'section.ui-search-applied-filters .andes-tag__label',
+    '.ui-search-applied-filters .ui-search-applied-filter-name',
+    '[data-testid="applied-filters"] .andes-tag__label'
+]
+
+
+def parse_card(card: Node) -> Optional[dict]:
+    """Lee los campos crudos de una tarjeta (misma forma que BULK_EXTRACTION_SCRIPT)"""
+    try:
+        link_element = card.css_first('a.poly-component__title')
+        price_container = card.css_first('div.poly-component__price')
+        
+        def price_text(selector: str) -> Optional[str]:
+            if price_container is None:
+                return None
+            return inner_text(price_container.css_first(selector))
+        
+        return {
+            'title': inner_text(card.css_first('h3')),
+            'has_price': card.css_first('span.andes-money-amount.andes-money-amount--cents-superscript') is not None,
+            'has_link': link_element is not None,
+            'link': get_attribute(link_element, 'href'),
+            'seller': inner_text(card.css_first('span.poly-component__brand'), ''),
+            'image_url': get_attribute(card.css_first('img.poly-component__picture'), 'src', ''),
+            'rating_text': inner_text(card.css_first('span.poly-reviews__rating')),
+            'reviews_text': inner_text(card.css_first('span.poly-reviews__total')),
+            'has_price_container': price_container is not None,
+            'previous_price_text': price_text('s.andes-money-amount.andes-money-amount--previous.andes-money-amount--cents-comma'),
+            'superscript_price_text': price_text('div.poly-price__current span.andes-money-amount.andes-money-amount--cents-superscript'),
+            'current_price_text': price_text('.poly-price__current .andes-money-amount__fraction'),
+            'discount_text': price_text('.poly-price__current .andes-money-amount__discount'),
+        }
+    except Exception:
+        return None
+
+
+def parse_cards(cards_html: List[str]) -> List[Optional[dict]]:
+    """Parsea el outerHTML de cada tarjeta capturada en el navegador"""
+    cards = []
+    
+    for card_html in cards_html:
+        root = fragment_root(card_html)
+        cards.append(parse_card(root) if root is not None else None)
+    
+    return cards
+
+
+def parse_document(html: str) -> List[Optional[dict]]:
+    """Parsea todas las tarjetas de un documento completo (page.content())"""
+    return [parse_card(card) for card in HTMLParser(html).css(CARD_SELECTOR)]
+
+
+def looks_like_listing(html: Optional[str]) -> bool:
+    """Indica si el HTML descargado es un listado renderizado en el servidor"""
+    if not html or 'ui-search-layout__item' not in html:
+        return False
+    
+    lowered = html.lower()
+    return not any(marker in lowered for marker in INTERSTITIAL_MARKERS)
+
+
+def parse_breadcrumb(tree: HTMLParser) -> List[Dict[str, Any]]:
+    """Equivalente offline de CategoryExtractor.extract_breadcrumb"""
+    breadcrumb_items = []
+    
+    for element in tree.css('ol.andes-breadcrumb li.andes-breadcrumb__item'):
+        link_element = element.css_first('a.andes-breadcrumb__link')
+        if link_element is None:
+            continue
+        
+        name_element = link_element.css_first('span[itemprop="name"]')
+        if name_element is None:
+            continue
+        
+        position_content = get_attribute(element.css_first('meta[itemprop="position"]'), 'content')
+        try:
+            position = int(position_content) if position_content else 0
+        except ValueError:
+            position = 0
+        
+        breadcrumb_items.append({
+            'name': clean_text(name_element.text(deep=True)),
+            'url': get_attribute(link_element, 'href'),
+            'position': position
+        })
+    
+    return breadcrumb_items
+
+
+def parse_applied_filters(tree: HTMLParser) -> List[str]:
+    """Equivalente offline de FilterExtractor.get_active_filters"""
+    filters = []
+    
+    for selector in APPLIED_FILTER_SELECTORS:
+        elements = tree.css(selector)
+        if not elements:
+            continue
+        
+        for element in elements:
+            filter_text = inner_text(element)
+            if filter_text and filter_text not in filters:
+                filters.append(filter_text)
+        break
+    
+    return filters
+
+
+def parse_listing(html: str) -> Dict[str, Any]:
+    """Parsea un listado completo: tarjetas, breadcrumb y filtros aplicados"""
+    tree = HTMLParser(html)
+    
+    return {
+        'cards': [parse_card(card) for card in tree.css(CARD_SELECTOR)],
+        'breadcrumb': parse_breadcrumb(tree),
+        'filters': parse_applied_filters(tree)
+    }
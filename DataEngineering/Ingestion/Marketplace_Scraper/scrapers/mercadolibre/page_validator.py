@@ -1,10 +1,13 @@
 import asyncio
+from config.settings import Settings
 
 class PageValidator:
     """Maneja validaciones de página específicas de MercadoLibre"""
     
-    def __init__(self, page):
+    def __init__(self, page, browser_manager=None):
         self.page = page
+        # Permite guardar/reusar la sesión para no volver a ver el popup de ubicación
+        self.browser_manager = browser_manager
     
     async def validate_page_after_navigation(self) -> bool:
         """Ejecuta todas las validaciones post-navegación"""
@@ -26,17 +29,32 @@ class PageValidator:
     
     async def _handle_location_popup(self):
         """Maneja el popup de ubicación"""
+        session_loaded = bool(self.browser_manager and self.browser_manager.session_loaded)
+        
         try:
             print("🔍 Verificando popup de ubicación...")
             
-            await self.page.wait_for_selector('text="Agregar ubicación"', timeout=5000)
+            # Con la sesión guardada el popup no debería aparecer: basta una verificación corta
+            timeout = Settings.SESSION_STATE_CONFIG['popup_check_timeout'] * 1000 if session_loaded else 5000
+            await self.page.wait_for_selector('text="Agregar ubicación"', timeout=timeout)
+            
+        except Exception:
+            print("📍 No se detectó popup de ubicación")
+            return
+        
+        try:
+            if session_loaded:
+                print("🗝️ La sesión guardada ya no suprime el popup, renovándola")
+            
             print("📍 Popup de ubicación detectado, haciendo clic en 'Más tarde'...")
             await self.page.click('text="Más tarde"')
             await asyncio.sleep(1)
+            
+            if self.browser_manager:
+                await self.browser_manager.save_session()
                 
-        except Exception:
-            print("📍 No se detectó popup de ubicación")
-            pass
+        except Exception as e:
+            print(f"⚠️ No se pudo cerrar el popup de ubicación: {e}")
     
     async def _apply_shipping_filter(self):
         """Aplica filtro de envío destacado"""
@@ -1,7 +1,43 @@
 from typing import Optional, List
 from models.product import Product
 from models.price_info import PriceInfo
-from utils.helpers import extract_number,clean_price
+from utils.helpers import extract_number,extract_integer,clean_price
+
+CARD_SELECTOR = 'li.ui-search-layout__item'
+
+# Lee todos los campos de todas las tarjetas en una sola evaluación.
+# Los valores por defecto replican lo que retornan los métodos _extract_* por elemento.
+BULK_EXTRACTION_SCRIPT = """
+(cards) => cards.map((card) => {
+    try {
+        const q = (root, selector) => root ? root.querySelector(selector) : null;
+        const text = (element) => element ? element.innerText : null;
+        
+        const linkElement = q(card, 'a.poly-component__title');
+        const sellerElement = q(card, 'span.poly-component__brand');
+        const imageElement = q(card, 'img.poly-component__picture');
+        const priceContainer = q(card, 'div.poly-component__price');
+        
+        return {
+            title: text(q(card, 'h3')),
+            has_price: !!q(card, 'span.andes-money-amount.andes-money-amount--cents-superscript'),
+            has_link: !!linkElement,
+            link: linkElement ? linkElement.getAttribute('href') : null,
+            seller: sellerElement ? sellerElement.innerText : '',
+            image_url: imageElement ? imageElement.getAttribute('src') : '',
+            rating_text: text(q(card, 'span.poly-reviews__rating')),
+            reviews_text: text(q(card, 'span.poly-reviews__total')),
+            has_price_container: !!priceContainer,
+            previous_price_text: text(q(priceContainer, 's.andes-money-amount.andes-money-amount--previous.andes-money-amount--cents-comma')),
+            superscript_price_text: text(q(priceContainer, 'div.poly-price__current span.andes-money-amount.andes-money-amount--cents-superscript')),
+            current_price_text: text(q(priceContainer, '.poly-price__current .andes-money-amount__fraction')),
+            discount_text: text(q(priceContainer, '.poly-price__current .andes-money-amount__discount'))
+        };
+    } catch (e) {
+        return null;
+    }
+})
+"""
 
 
 class ProductExtractor:
@@ -26,6 +62,101 @@ class ProductExtractor:
             print(f"❌ Error obteniendo elementos de productos: {e}")
             return []
     
+    async def extract_products_bulk(self, category_info: dict) -> Optional[List[Product]]:
+        """
+        Extrae todas las tarjetas de la página en una sola ida y vuelta al navegador.
+        
+        Retorna None si la evaluación falla, para que se use la extracción por elemento.
+        """
+        try:
+            await self.page.wait_for_selector(CARD_SELECTOR, timeout=15000)
+        except Exception as e:
+            print(f"❌ Error obteniendo elementos de productos: {e}")
+            return []
+        
+        try:
+            raw_cards = await self.page.eval_on_selector_all(CARD_SELECTOR, BULK_EXTRACTION_SCRIPT)
+        except Exception as e:
+            print(f"⚠️ Extracción masiva no disponible, usando extracción por elemento: {e}")
+            return None
+        
+        print(f"🔍 Se encontraron {len(raw_cards)} elementos de productos")
+        
+        products = []
+        for raw in raw_cards:
+            product = self.build_product(raw, category_info)
+            if product:
+                products.append(product)
+        
+        return products
+    
+    def build_product(self, raw: Optional[dict], category_info: dict) -> Optional[Product]:
+        """Construye un Product a partir de los campos crudos de una tarjeta"""
+        try:
+            if not raw or raw['title'] is None or not raw['has_price'] or not raw['has_link']:
+                return None
+            
+            # Sin contenedor de precios el extractor por elemento descarta el producto
+            if not raw['has_price_container']:
+                print(f"⚠️ No price container found")
+                return None
+            
+            price_info = self._build_price_info(raw)
+            
+            return Product(
+                title = raw['title'].strip(),
+                price = price_info.current_price,
+                original_price = price_info.original_price,
+                marketplace = self.marketplace_name,
+                currency = "COP" if self.country == "co" else "USD",
+                seller = raw['seller'],
+                parent_category = category_info.get('parent_category', ''),
+                category = category_info.get('category', ''),
+                category2 = category_info.get('category2', ''),
+                rating = extract_number(raw['rating_text']) if raw['rating_text'] is not None else None,
+                reviews_count = extract_integer(raw['reviews_text']) if raw['reviews_text'] is not None else None,
+                url = raw['link'],
+                image_url = raw['image_url'],
+            )
+            
+        except Exception as e:
+            print(f"⚠️ Error extrayendo información de producto: {e}")
+            return None
+    
+    def _build_price_info(self, raw: dict) -> PriceInfo:
+        """Replica _extract_price sobre los textos crudos de la tarjeta"""
+        original_price = None
+        
+        # Precio subrayado primero, luego el precio actual con centavos en superíndice
+        for key in ('previous_price_text', 'superscript_price_text'):
+            if raw[key] is not None:
+                original_price = clean_price(raw[key].replace("\n", "").strip())
+                break
+        
+        current_price = None
+        if raw['current_price_text'] is not None:
+            current_price = clean_price(raw['current_price_text'])
+        else:
+            print("⚠️ No se encontraron elementos de precio actual")
+        
+        if not current_price:
+            current_price = original_price
+        
+        discount = raw['discount_text'].strip() if raw['discount_text'] is not None else ""
+        
+        return PriceInfo(original_price, current_price, discount)
+    
+    def build_structured_product(self, item: dict, category_info: dict) -> Product:
+        """Construye un Product a partir de un resultado del estado JSON embebido"""
+        return Product(
+            **item,
+            marketplace     = self.marketplace_name,
+            currency        = "COP" if self.country == "co" else "USD",
+            parent_category = category_info.get('parent_category', ''),
+            category        = category_info.get('category', ''),
+            category2       = category_info.get('category2', ''),
+        )
+    
     async def extract_product_info(self, element, category_info: dict) -> Optional[Product]:
         """Extrae información del producto desde el elemento HTML"""
         try:
@@ -200,13 +331,13 @@ class ProductExtractor:
         except:
             return None
     
-    async def _extract_reviews_count(self, element) -> Optional[float]:
+    async def _extract_reviews_count(self, element) -> Optional[int]:
         """Extrae total de calificaciones del producto"""
         try:
             span_element = await element.query_selector('span.poly-reviews__total')
             if span_element:
                 span_text = await span_element.inner_text()
-                return extract_number(span_text)
+                return extract_integer(span_text)
             
             return None
         except:
@@ -1,19 +1,30 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from urllib.parse import quote_plus
 from models.product import Product
 from scrapers.base_scraper import BaseScraper
+from utils.browser import BrowserPool, BrowserManager
+from utils.rate_limiter import DomainRateLimiter
+from utils.http_fetcher import HttpFetcher
+from utils.response_cache import ResponseCache
+from utils.structured_data import extract_embedded_state
+from config.settings import Settings
 from scrapers.mercadolibre.category_extractor import CategoryExtractor
 from scrapers.mercadolibre.filter_extractor import FilterExtractor
 from scrapers.mercadolibre.url_builder import URLBuilder
 from scrapers.mercadolibre.page_validator import PageValidator
-from scrapers.mercadolibre.product_extractor import ProductExtractor
+from scrapers.mercadolibre.product_extractor import ProductExtractor, CARD_SELECTOR
+from scrapers.mercadolibre.html_parser import parse_cards, looks_like_listing, parse_listing
+from scrapers.mercadolibre.structured_data import STATE_SOURCES, parse_state
 # https://mercadolibre.com/robots.txt
 
 class MercadoLibreScraper(BaseScraper):
     """Scraper para MercadoLibre"""
     
-    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None):
-        super().__init__(mobile=mobile, device=device)
+    def __init__(self, country: str = "co", mobile: bool = False, device: Optional[str] = None,
+                 browser_pool: Optional[BrowserPool] = None, http_fetcher: Optional[HttpFetcher] = None,
+                 rate_limiter: Optional[DomainRateLimiter] = None, response_cache: Optional[ResponseCache] = None):
+        super().__init__(mobile=mobile, device=device, browser_pool=browser_pool, rate_limiter=rate_limiter,
+                         session_profile=f"mercadolibre-{country}", response_cache=response_cache)
         self.marketplace_name = "MercadoLibre"
         self.country = country
         self.base_url = f"https://listado.mercadolibre.com.{country}"
@@ -26,8 +37,25 @@ class MercadoLibreScraper(BaseScraper):
         self.page_validator = None
         self.product_extractor = None
         
+        # Modo captura + parseo offline
+        self.card_selectors = [CARD_SELECTOR]
+        self.html_parser = parse_cards
+        
+        # Estado embebido (__PRELOADED_STATE__)
+        self.state_sources = STATE_SOURCES
+        
+        # Las URLs _Desde_{offset} de las páginas 2..N salen de la página 1
+        self.concurrent_pagination = True
+        
+        # Camino rápido HTTP (listados renderizados en el servidor)
+        self.http_fetcher = http_fetcher
+        
+        # La caché de respuestas solo guarda listados reales, nunca un interstitial o captcha
+        self.browser_manager.cache_validator = looks_like_listing
+        
         # Estado
         self.category_info = {}
+        self.applied_filters: List[str] = []
     
     def _initialize_components(self):
         """Inicializa los componentes que requieren la página del browser"""
@@ -37,7 +65,7 @@ class MercadoLibreScraper(BaseScraper):
         page = self.browser_manager.page
         self.category_extractor = CategoryExtractor(page)
         self.filter_extractor = FilterExtractor(page)
-        self.page_validator = PageValidator(page)
+        self.page_validator = PageValidator(page, self.browser_manager)
         self.product_extractor = ProductExtractor(page, self.marketplace_name, self.country)
     
     async def build_search_url(self, query: str, **kwargs) -> str:
@@ -56,7 +84,7 @@ class MercadoLibreScraper(BaseScraper):
                 await self._extract_category_info()
             
             encoded_query = quote_plus(query)
-            filters = await self.filter_extractor.get_active_filters() if self.filter_extractor else []
+            filters = await self.filter_extractor.get_active_filters() if self.filter_extractor else self.applied_filters
             category_url = self.category_info.get('category_url')
             
             return self.url_builder.build_advanced_pagination_url(
@@ -67,6 +95,39 @@ class MercadoLibreScraper(BaseScraper):
             print(f"❌ Error construyendo URL de paginación avanzada: {e}")
             return self.url_builder.build_search_url(query, page)
     
+    async def fetch_page_products(self, url: str) -> Optional[List[Product]]:
+        """Descarga el listado por HTTP y lo parsea sin abrir el navegador"""
+        if not self.http_fetcher:
+            return None
+        
+        html = await self.http_fetcher.fetch_html(url, validator=looks_like_listing)
+        if not looks_like_listing(html):
+            print("↪️ La respuesta HTTP no es un listado, usando el navegador")
+            return None
+        
+        listing = parse_listing(html)
+        
+        # Mismo estado que deja la navegación con Playwright
+        self.category_info = CategoryExtractor(None).build_category_info(listing['breadcrumb'])
+        self.applied_filters = listing['filters']
+        
+        if not self.product_extractor:
+            self.product_extractor = ProductExtractor(None, self.marketplace_name, self.country)
+        
+        # Estado embebido primero, tarjetas del DOM como respaldo
+        if Settings.EXTRACTION_CONFIG['structured']:
+            products = self.build_products_from_state(extract_embedded_state(html, self.state_sources))
+            if products:
+                return products
+        
+        products = []
+        for raw in listing['cards']:
+            product = self.product_extractor.build_product(raw, self.category_info)
+            if product:
+                products.append(product)
+        
+        return products
+    
     async def post_navigate_validation(self) -> bool:
         """Maneja validaciones específicas después de navegar"""
         self._initialize_components()
@@ -81,6 +142,15 @@ class MercadoLibreScraper(BaseScraper):
         
         return success
     
+    async def prepare_worker_page(self, browser_manager: BrowserManager) -> bool:
+        """Mismas validaciones post-navegación sobre la página de un worker"""
+        return await PageValidator(browser_manager.page, browser_manager).validate_page_after_navigation()
+    
+    async def extract_products_from(self, page) -> Optional[List[Product]]:
+        """Extracción masiva en la página de un worker, con las categorías de la página 1"""
+        extractor = ProductExtractor(page, self.marketplace_name, self.country)
+        return await extractor.extract_products_bulk(self.category_info)
+    
     async def _extract_category_info(self):
         """Extrae información de categorías"""
         if not self.category_extractor:
@@ -95,6 +165,30 @@ class MercadoLibreScraper(BaseScraper):
         
         return await self.product_extractor.get_product_elements()
     
+    async def extract_page_products(self) -> Optional[List[Product]]:
+        """Extrae todos los productos de la página en una sola evaluación"""
+        if not self.product_extractor:
+            return None
+        
+        return await self.product_extractor.extract_products_bulk(self.category_info)
+    
+    def build_products_from_state(self, state: Any) -> Optional[List[Product]]:
+        """Construye los productos desde las polycards de __PRELOADED_STATE__"""
+        if not self.product_extractor:
+            return None
+        
+        return [
+            self.product_extractor.build_structured_product(item, self.category_info)
+            for item in parse_state(state)
+        ]
+    
+    def build_product_from_raw(self, raw: Optional[dict]) -> Optional[Product]:
+        """Construye el producto a partir de una tarjeta parseada offline"""
+        if not self.product_extractor:
+            return None
+        
+        return self.product_extractor.build_product(raw, self.category_info)
+    
     async def extract_product_info(self, element) -> Optional[Product]:
         """Extrae información del producto desde el elemento HTML"""
         if not self.product_extractor:
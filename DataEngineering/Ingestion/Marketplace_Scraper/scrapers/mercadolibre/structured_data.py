@@ -0,0 +1,73 @@
+from typing import Any, Dict, List, Optional
+from utils.structured_data import dig, find_list, to_price, to_number, mentions_free_shipping
+
+# MercadoLibre embebe el listado en __PRELOADED_STATE__ (script JSON o variable global)
+STATE_SOURCES = [
+    {'selector': 'script#__PRELOADED_STATE__'},
+    {'global': '__PRELOADED_STATE__'}
+]
+
+# Las imágenes del estado vienen como id; el DOM usa este mismo CDN
+IMAGE_URL_TEMPLATE = "https://http2.mlstatic.com/D_Q_NP_{}-O.webp"
+
+
+def find_results(state: Any) -> List[dict]:
+    """Ubica la lista de resultados (polycards) dentro del estado"""
+    results = dig(state, 'pageState', 'initialState', 'results')
+    if isinstance(results, list):
+        return results
+    
+    return find_list(state, lambda item: isinstance(item, dict) and 'polycard' in item) or []
+
+
+def parse_result(result: Any) -> Optional[Dict[str, Any]]:
+    """Mapea una polycard del estado a los campos de Product"""
+    polycard = dig(result, 'polycard')
+    if not isinstance(polycard, dict):
+        # Publicidad e intervenciones no tienen polycard
+        return None
+    
+    components = {
+        component.get('type'): component.get(component.get('type'))
+        for component in polycard.get('components') or []
+        if isinstance(component, dict)
+    }
+    
+    title = dig(components, 'title', 'text')
+    current_price = to_price(dig(components, 'price', 'current_price', 'value'))
+    
+    # Igual que el extractor del DOM: sin título o sin precio la tarjeta se descarta
+    if not title or current_price is None:
+        return None
+    
+    previous_price = to_price(dig(components, 'price', 'previous_price', 'value'))
+    
+    url = dig(polycard, 'metadata', 'url', default='')
+    if url and not url.startswith('http'):
+        url = f"https://{url}"
+    
+    picture_id = dig(polycard, 'pictures', 'pictures', 0, 'id')
+    
+    return {
+        'title':          title.strip(),
+        'price':          current_price,
+        'original_price': previous_price if previous_price is not None else current_price,
+        'url':            url,
+        'image_url':      IMAGE_URL_TEMPLATE.format(picture_id) if picture_id else '',
+        'seller':         dig(components, 'brand', 'text') or dig(components, 'seller', 'text', default=''),
+        'rating':         to_number(dig(components, 'reviews', 'rating_average')),
+        'reviews_count':  to_number(dig(components, 'reviews', 'total'), int),
+        'free_shipping':  mentions_free_shipping(components.get('shipping')) if components.get('shipping') else False,
+    }
+
+
+def parse_state(state: Any) -> List[Dict[str, Any]]:
+    """Mapea todas las polycards del estado embebido"""
+    items = []
+    
+    for result in find_results(state):
+        item = parse_result(result)
+        if item:
+            items.append(item)
+    
+    return items
@@ -0,0 +1,52 @@
+from utils.batch import BatchQuery, load_queries, parse_marketplaces
+
+DEFAULTS = BatchQuery(query='', marketplaces=['mercadolibre'], pages=2, country='co')
+
+
+class TestLoadQueries:
+    """Pruebas de la lectura de archivos de lote"""
+    
+    def test_text_file(self, tmp_path):
+        """Prueba una query por línea, ignorando comentarios y líneas vacías"""
+        path = tmp_path / "queries.txt"
+        path.write_text("# SKUs a monitorear\niphone 15\n\n  airpods  \n", encoding="utf-8")
+        
+        queries = load_queries(str(path), DEFAULTS)
+        assert [query.query for query in queries] == ["iphone 15", "airpods"]
+        assert queries[0] == BatchQuery("iphone 15", ['mercadolibre'], 2, 'co')
+    
+    def test_csv_file(self, tmp_path):
+        """Prueba columnas opcionales por query"""
+        path = tmp_path / "queries.csv"
+        path.write_text(
+            "query,marketplaces,pages,country\n"
+            "televisor,falabella|megatienda,3,\n"
+            "celular,,,mx\n",
+            encoding="utf-8"
+        )
+        
+        queries = load_queries(str(path), DEFAULTS)
+        assert queries[0] == BatchQuery("televisor", ['falabella', 'megatienda'], 3, 'co')
+        assert queries[1] == BatchQuery("celular", ['mercadolibre'], 2, 'mx')
+    
+    def test_jsonl_file(self, tmp_path):
+        """Prueba JSON Lines, saltando líneas inválidas"""
+        path = tmp_path / "queries.jsonl"
+        path.write_text(
+            '{"query": "galleta", "marketplace": "megatienda", "pages": 1}\n'
+            'no es json\n'
+            '{"query": "iphone", "marketplaces": ["mercadolibre", "falabella"]}\n'
+            '{"query": "sin paginas", "pages": "muchas"}\n',
+            encoding="utf-8"
+        )
+        
+        queries = load_queries(str(path), DEFAULTS)
+        assert queries == [
+            BatchQuery("galleta", ['megatienda'], 1, 'co'),
+            BatchQuery("iphone", ['mercadolibre', 'falabella'], 2, 'co')
+        ]
+    
+    def test_parse_marketplaces(self):
+        """Prueba los separadores aceptados para la lista de marketplaces"""
+        assert parse_marketplaces("Falabella, megatienda;mercadolibre", []) == ['falabella', 'megatienda', 'mercadolibre']
+        assert parse_marketplaces(None, ['mercadolibre']) == ['mercadolibre']
@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+
+pytest.importorskip("playwright")
+
+from utils.browser import BrowserManager, ADAPTIVE_SCROLL_SCRIPT
+
+
+class FakePage:
+    """Página de prueba que registra la evaluación del scroll"""
+    
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = []
+    
+    async def evaluate(self, script, arg=None):
+        self.calls.append((script, arg))
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def make_manager(page):
+    manager = BrowserManager()
+    manager.page = page
+    return manager
+
+
+class TestAdaptiveScroll:
+    def test_passes_selector_and_config_to_script(self):
+        page = FakePage({'initial': 10, 'cards': 30, 'steps': [8, 12, 0, 0], 'elapsed_ms': 2100})
+        result = asyncio.run(make_manager(page).scroll_to_bottom(".card", max_steps=5))
+        
+        script, arg = page.calls[0]
+        assert script == ADAPTIVE_SCROLL_SCRIPT
+        assert arg['selector'] == ".card"
+        assert arg['maxSteps'] == 5
+        assert result['steps'] == [8, 12, 0, 0]
+    
+    def test_errors_return_none(self):
+        page = FakePage(error=RuntimeError("page closed"))
+        assert asyncio.run(make_manager(page).scroll_to_bottom(".card")) is None
@@ -0,0 +1,233 @@
+import asyncio
+import pytest
+
+pytest.importorskip("playwright")
+
+import utils.browser as browser_module
+from utils.browser import BrowserPool
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+    
+    def set_default_timeout(self, timeout):
+        pass
+    
+    def is_closed(self):
+        return self.closed
+    
+    async def evaluate(self, script):
+        if not self.healthy:
+            raise RuntimeError("Target closed")
+        return "complete"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+        self.cookies = []
+        self.permissions = []
+    
+    async def new_page(self):
+        return FakePage()
+    
+    async def clear_cookies(self):
+        self.cookies = []
+    
+    async def clear_permissions(self):
+        self.permissions = []
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+        self.fail_next_context = False
+    
+    def is_connected(self):
+        return not self.closed
+    
+    async def new_context(self, **config):
+        if self.fail_next_context:
+            self.fail_next_context = False
+            raise RuntimeError("new_context falló")
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+    
+    async def launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    """Playwright de prueba: registra los navegadores lanzados"""
+    
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+    
+    async def start(self):
+        return self
+    
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_module, "async_playwright", lambda: fake)
+    return fake
+
+
+def make_pool(**overrides):
+    config = {"max_browsers": 1, "max_contexts_per_browser": 2, "max_pages_per_context": 3,
+              "max_pages_per_browser": 100, "prewarm_contexts": 0, "health_check_timeout": 1}
+    return BrowserPool(headless=True, **{**config, **overrides})
+
+
+class TestBrowserPool:
+    """Pruebas del pool de navegadores con objetos de Playwright falsos"""
+    
+    def test_reuses_idle_context(self, playwright):
+        """Prueba que un contexto devuelto se preste de nuevo sin crear otro"""
+        async def run():
+            pool = make_pool()
+            first = await pool.acquire()
+            await pool.release(first)
+            second = await pool.acquire()
+            await pool.release(second)
+            await pool.close()
+            return first, second
+        
+        first, second = asyncio.run(run())
+        assert second is first
+        assert len(playwright.chromium.launched) == 1
+        assert playwright.stopped
+    
+    def test_recycles_context_after_max_pages(self, playwright):
+        """Prueba que el contexto se cierre tras max_pages_per_context navegaciones"""
+        async def run():
+            pool = make_pool(max_pages_per_context=2)
+            lease = await pool.acquire()
+            pool.record_navigation(lease)
+            pool.record_navigation(lease)
+            await pool.release(lease)
+            return lease, await pool.acquire()
+        
+        lease, replacement = asyncio.run(run())
+        assert lease.context.closed
+        assert replacement.context is not lease.context
+        assert replacement.slot is lease.slot
+    
+    def test_recycles_browser_after_max_pages(self, playwright):
+        """Prueba que el proceso Chromium se retire y se cierre tras max_pages_per_browser"""
+        async def run():
+            pool = make_pool(max_pages_per_browser=2)
+            lease = await pool.acquire()
+            pool.record_navigation(lease)
+            pool.record_navigation(lease)
+            await pool.release(lease)
+            return lease, await pool.acquire()
+        
+        lease, replacement = asyncio.run(run())
+        first_browser, second_browser = playwright.chromium.launched
+        assert lease.slot.retired and first_browser.closed
+        assert replacement.slot.browser is second_browser
+    
+    def test_release_after_exception(self, playwright):
+        """Prueba que un préstamo liberado en finally tras un error devuelva la capacidad"""
+        async def run():
+            pool = make_pool(max_contexts_per_browser=1)
+            lease = await pool.acquire()
+            try:
+                lease.page.healthy = False
+                raise RuntimeError("fallo durante el scraping")
+            except RuntimeError:
+                pass
+            finally:
+                await pool.release(lease)
+            
+            # La página dañada no vuelve al pool, pero el cupo sí
+            return lease, await asyncio.wait_for(pool.acquire(), timeout=1)
+        
+        lease, replacement = asyncio.run(run())
+        assert lease.context.closed
+        assert replacement.context is not lease.context
+    
+    def test_failed_acquire_releases_capacity(self, playwright):
+        """Prueba que un error creando el contexto no consuma un cupo del pool"""
+        async def run():
+            pool = make_pool(max_contexts_per_browser=1)
+            await pool.start()
+            slot = await pool._get_slot()
+            slot.browser.fail_next_context = True
+            
+            with pytest.raises(RuntimeError):
+                await pool.acquire()
+            return await asyncio.wait_for(pool.acquire(), timeout=1)
+        
+        assert asyncio.run(run()).context is not None
+    
+    def test_max_concurrency(self, playwright):
+        """Prueba que el préstamo número max_browsers * max_contexts + 1 espere una liberación"""
+        async def run():
+            pool = make_pool(max_browsers=1, max_contexts_per_browser=2)
+            leases = [await pool.acquire(), await pool.acquire()]
+            
+            waiting = asyncio.ensure_future(pool.acquire())
+            await asyncio.sleep(0.05)
+            blocked = not waiting.done()
+            
+            await pool.release(leases[0])
+            third = await asyncio.wait_for(waiting, timeout=1)
+            return blocked, third, leases
+        
+        blocked, third, leases = asyncio.run(run())
+        assert blocked
+        assert third is leases[0]
+        assert len(playwright.chromium.launched) == 1
+    
+    def test_release_clears_shared_context_session(self, playwright):
+        """Prueba que un contexto sin perfil vuelva al pool sin cookies ni permisos del sitio anterior"""
+        async def run():
+            pool = make_pool()
+            first = await pool.acquire()
+            first.context.cookies.append({"name": "sid", "domain": ".falabella.com.co"})
+            first.context.permissions.append("geolocation")
+            await pool.release(first)
+            return first, await pool.acquire()
+        
+        first, second = asyncio.run(run())
+        assert second is first
+        assert second.context.cookies == [] and second.context.permissions == []
+    
+    def test_release_keeps_profile_session(self, playwright):
+        """Prueba que un contexto con perfil de sesión conserve sus cookies para el mismo perfil"""
+        async def run():
+            pool = make_pool()
+            first = await pool.acquire(profile="mercadolibre-co")
+            first.context.cookies.append({"name": "sid", "domain": ".mercadolibre.com.co"})
+            await pool.release(first)
+            other = await pool.acquire(profile="megatienda")
+            return first, other, await pool.acquire(profile="mercadolibre-co")
+        
+        first, other, same = asyncio.run(run())
+        assert other.context is not first.context
+        assert same is first and same.context.cookies
@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+
+pytest.importorskip("playwright")
+
+from utils.browser import ResourcePolicy
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    """Ruta de prueba que registra si se abortó o continuó"""
+    
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+    
+    async def abort(self):
+        self.outcome = "abort"
+    
+    async def fallback(self):
+        self.outcome = "fallback"
+
+
+class FakeResponse:
+    def __init__(self, length):
+        self.headers = {'content-length': str(length)}
+
+
+def route(policy, resource_type, url):
+    fake = FakeRoute(resource_type, url)
+    asyncio.run(policy.handle_route(fake))
+    return fake.outcome
+
+
+class TestResourcePolicy:
+    """Pruebas de la política de bloqueo de recursos"""
+    
+    def test_block_by_type_and_domain(self):
+        """Prueba el bloqueo por tipo de recurso y por dominio de tracker"""
+        policy = ResourcePolicy(block_types=["image"], block_domains=["google-analytics.com"])
+        assert policy.should_block("image", "https://http2.mlstatic.com/1.webp")
+        assert policy.should_block("script", "https://www.google-analytics.com/analytics.js")
+        assert not policy.should_block("script", "https://http2.mlstatic.com/app.js")
+        assert not policy.should_block("document", "https://listado.mercadolibre.com.co/iphone")
+    
+    def test_allow_list_wins(self):
+        """Prueba que un dominio permitido no se bloquee aunque su tipo sí"""
+        policy = ResourcePolicy(block_types=["image"], allow_domains=["vteximg.com.br"])
+        assert not policy.should_block("image", "https://megatiendas.vteximg.com.br/1.jpg")
+        assert policy.should_block("image", "https://media.falabella.com/1.jpg")
+    
+    def test_marketplace_profile(self):
+        """Prueba que el perfil del marketplace sume sus dominios extra al perfil por defecto"""
+        policy = ResourcePolicy.for_marketplace("Falabella")
+        assert policy.should_block("script", "https://cdn.cookielaw.org/otSDKStub.js")
+        assert policy.should_block("script", "https://www.googletagmanager.com/gtm.js")
+        assert policy.should_block("font", "https://www.falabella.com.co/fonts/lato.woff2")
+    
+    def test_stats(self):
+        """Prueba el conteo de peticiones y bytes por página y acumulado"""
+        policy = ResourcePolicy(block_types=["image"], estimated_bytes={"image": 1000})
+        assert route(policy, "image", "https://a.test/1.jpg") == "abort"
+        assert route(policy, "image", "https://a.test/2.jpg") == "abort"
+        assert route(policy, "document", "https://a.test/") == "fallback"
+        policy.record_response(FakeResponse(2048))
+        
+        stats = policy.take_page_stats()
+        assert stats == {'allowed': 1, 'blocked': 2, 'bytes_loaded': 2048, 'bytes_saved': 2000,
+                         'blocked_by_type': {'image': 2}}
+        assert policy.page_stats['blocked'] == 0
+        
+        route(policy, "image", "https://a.test/3.jpg")
+        policy.take_page_stats()
+        assert policy.total_stats['blocked'] == 3
+        assert policy.total_stats['blocked_by_type'] == {'image': 3}
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+import pytest
+from utils.response_cache import ResponseCache, normalize_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(directory=str(tmp_path), max_mb=1, default_ttl=60, ttl_overrides={"megatiendas.co": 5})
+
+
+class TestNormalizeUrl:
+    """Pruebas de la URL canónica usada como llave"""
+    
+    def test_sorts_query_and_drops_tracking_and_fragment(self):
+        """Prueba que se ordene la query y se quiten el tracking y el fragmento"""
+        url = "HTTPS://Listado.MercadoLibre.com.co/celular?b=2&utm_source=x&a=1#top"
+        assert normalize_url(url) == "https://listado.mercadolibre.com.co/celular?a=1&b=2"
+
+
+class TestResponseCache:
+    """Pruebas de la caché de respuestas en disco"""
+    
+    def test_miss_then_hit(self, cache):
+        """Prueba un miss, el guardado sin encabezados de codificación y luego un hit"""
+        url = "https://listado.mercadolibre.com.co/celular"
+        
+        assert cache.get(url, "desktop") is None
+        cache.put(url, "desktop", b"<html>ok</html>", 200, {"Content-Type": "text/html", "Content-Encoding": "br"})
+        entry = cache.get(url, "desktop")
+        
+        assert entry['body'] == b"<html>ok</html>"
+        assert entry['headers'] == {"Content-Type": "text/html"}
+        assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+    
+    def test_profiles_are_separate_entries(self, cache):
+        """Prueba que desktop y mobile sean entradas distintas"""
+        url = "https://listado.mercadolibre.com.co/celular"
+        cache.put(url, "desktop", b"desktop")
+        
+        assert cache.get(url, "mobile") is None
+    
+    def test_errors_are_not_stored(self, cache):
+        """Prueba que las respuestas 4xx no se guarden"""
+        url = "https://listado.mercadolibre.com.co/celular"
+        cache.put(url, "desktop", b"blocked", 403)
+        
+        assert not cache.contains(url, "desktop")
+    
+    def test_ttl_by_domain(self, cache, monkeypatch):
+        """Prueba que el TTL del dominio venza la entrada"""
+        url = "https://www.megatiendas.co/arroz"
+        cache.put(url, "desktop", b"arroz")
+        
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 10)
+        
+        assert cache.ttl_for(url) == 5
+        assert cache.get(url, "desktop") is None
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Prueba que al superar el tope se expulse la entrada usada hace más tiempo"""
+        cache = ResponseCache(directory=str(tmp_path), max_mb=0.5, default_ttl=60, ttl_overrides={})
+        body = os.urandom(200 * 1024)  # No comprimible
+        
+        cache.put("https://a.com/1", "desktop", body)
+        cache.put("https://a.com/2", "desktop", body)
+        
+        # La entrada 2 queda como la usada hace más tiempo
+        old = time.time() - 100
+        os.utime(cache.path_for("https://a.com/2", "desktop"), (old, old))
+        cache.put("https://a.com/3", "desktop", body)
+        
+        assert cache.contains("https://a.com/1", "desktop")
+        assert not cache.contains("https://a.com/2", "desktop")
+        assert cache.stats['evictions'] == 1
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+        self._body = body
+    
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    """Route de Playwright mínima: registra si se sirvió desde caché, red o fallback"""
+    
+    def __init__(self, url, body=b"", resource_type="document"):
+        self.request = SimpleNamespace(url=url, method="GET", resource_type=resource_type)
+        self.network_body = body
+        self.result = None
+    
+    async def fetch(self):
+        return FakeResponse(self.network_body)
+    
+    async def fulfill(self, response=None, body=None, **kwargs):
+        self.result = ("network", body) if response else ("cache", body)
+    
+    async def fallback(self):
+        self.result = ("fallback", None)
+
+
+def is_listing(html):
+    return "listado" in html
+
+
+class TestHandleRoute:
+    """Pruebas del handler de page.route de la caché"""
+    
+    URL = "https://listado.mercadolibre.com.co/celular"
+    
+    def test_stores_only_validated_documents(self, cache):
+        """Prueba que un captcha con status 200 no quede en caché"""
+        asyncio.run(cache.handle_route(FakeRoute(self.URL, b"<html>captcha</html>"), "desktop", is_listing))
+        assert not cache.contains(self.URL, "desktop")
+        
+        asyncio.run(cache.handle_route(FakeRoute(self.URL, b"<html>listado</html>"), "desktop", is_listing))
+        route = FakeRoute(self.URL, b"<html>otro</html>")
+        asyncio.run(cache.handle_route(route, "desktop", is_listing))
+        assert route.result == ("cache", b"<html>listado</html>")
+    
+    def test_rejected_entry_is_not_replayed(self, cache):
+        """Prueba que una entrada que el validator rechaza se descarte y se vaya a la red"""
+        cache.put(self.URL, "desktop", b"<html>captcha</html>")
+        route = FakeRoute(self.URL, b"<html>listado</html>")
+        asyncio.run(cache.handle_route(route, "desktop", is_listing))
+        
+        assert route.result == ("network", b"<html>listado</html>")
+        assert cache.get(self.URL, "desktop")['body'] == b"<html>listado</html>"
+    
+    def test_without_validator_skips_cache(self, cache):
+        """Prueba que sin validator el documento no se guarde ni se sirva desde disco"""
+        cache.put(self.URL, "desktop", b"<html>listado</html>")
+        route = FakeRoute(self.URL, b"<html>listado</html>")
+        asyncio.run(cache.handle_route(route, "desktop"))
+        
+        assert route.result == ("fallback", None)
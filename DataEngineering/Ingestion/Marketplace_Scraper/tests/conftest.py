@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List
+import pytest
+from models.product import Product
+
+SCRAPED_AT = datetime(2024, 5, 1, 10, 30, 0, 123456)
+
+# (título, marketplace, URL, precio, precio original, día del mes) de cada plantilla
+PRODUCT_TEMPLATES = [
+    ("Celular Samsung Galaxy A15 128 GB", "MercadoLibre", "https://articulo.mercadolibre.com.co/MCO-{index}-galaxy",
+     899000.0, 999000.0, 1),
+    ("Celular Motorola Moto G84 256 GB", "MercadoLibre", "https://articulo.mercadolibre.com.co/MCO-{index}-moto",
+     None, None, 2),
+    ("Televisor LG 55 pulgadas 4K UHD", "Falabella", "https://www.falabella.com.co/falabella-co/product/{index}/televisor",
+     1500000.0, 1899900.0, 1)
+]
+
+
+def build_products(count: int = 3) -> List[Product]:
+    """
+    Productos con los tipos que entregan los extractores: precios float, reviews_count
+    float (extract_number), textos con tildes y campos faltantes (None o "").
+    """
+    products = []
+    
+    for index in range(count):
+        title, marketplace, url, price, original_price, day = PRODUCT_TEMPLATES[index % len(PRODUCT_TEMPLATES)]
+        has_reviews = price is not None
+        
+        products.append(Product(
+            title           = title,
+            price           = price,
+            original_price  = original_price,
+            currency        = "COP",
+            url             = url.format(index=index),
+            marketplace     = marketplace,
+            brand           = title.split()[1],
+            seller          = "Tienda oficial" if index % 2 == 0 else "",
+            rating          = 4.5 if has_reviews else None,
+            reviews_count   = float(1234 + index) if has_reviews else None,
+            free_shipping   = marketplace == "MercadoLibre" and has_reviews,
+            category        = "Celulares" if marketplace == "MercadoLibre" else "Televisores",
+            description     = "Pantalla AMOLED, cámara de 50 MP y batería de 5000 mAh. " * 5,
+            scraped_at      = SCRAPED_AT.replace(day=day)
+        ))
+    
+    return products
+
+
+@pytest.fixture
+def make_products():
+    """Fábrica de productos compartida por las pruebas del lote y las exportaciones"""
+    return build_products
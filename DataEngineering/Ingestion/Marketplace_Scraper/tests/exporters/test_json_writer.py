@@ -0,0 +1,92 @@
+import io
+import json
+import pytest
+from models.product_batch import ProductBatch
+from utils.exporters import DataExporter
+from utils.json_writer import JsonEncoder, write_json_document, write_json_lines
+
+
+def to_frame(products):
+    return ProductBatch.from_products(products).export_frame()
+
+
+def orjson_available():
+    try:
+        import orjson
+    except ImportError:
+        return False
+    return True
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    if request.param == "orjson" and not orjson_available():
+        pytest.skip("orjson no está instalado")
+    return request.param
+
+
+FIELDS = {"total_count": 7, "exported_at": "2024-05-01T10:30:00", "marketplaces": ["MercadoLibre", "Falabella"]}
+
+
+class TestJsonWriter:
+    """Pruebas de la escritura JSON incremental"""
+    
+    def test_indented_matches_json_dump(self, backend, make_products):
+        """Prueba que la salida indentada sea idéntica a json.dump con indent=2"""
+        frame = to_frame(make_products(7))
+        buffer = io.StringIO()
+        written = write_json_document(buffer, frame, FIELDS, encoder=JsonEncoder(backend, indent=2), chunk_rows=3)
+        
+        expected = json.dumps({"products": frame.to_dicts(), **FIELDS}, indent=2, ensure_ascii=False)
+        assert written == 7
+        assert buffer.getvalue() == expected
+    
+    def test_compact(self, backend, make_products):
+        """Prueba que el modo compacto no tenga saltos de línea y conserve los datos"""
+        frame = to_frame(make_products(7))
+        buffer = io.StringIO()
+        write_json_document(buffer, frame, FIELDS, encoder=JsonEncoder(backend), chunk_rows=2)
+        
+        assert "\n" not in buffer.getvalue()
+        assert json.loads(buffer.getvalue()) == {"products": frame.to_dicts(), **FIELDS}
+    
+    def test_empty_products(self, backend, make_products):
+        for indent in (2, None):
+            buffer = io.StringIO()
+            write_json_document(buffer, to_frame(make_products(0)), FIELDS, encoder=JsonEncoder(backend, indent=indent))
+            assert buffer.getvalue() == json.dumps({"products": [], **FIELDS}, indent=indent, ensure_ascii=False,
+                                                   separators=(",", ": ") if indent else (",", ":"))
+    
+    @pytest.mark.parametrize("lines_backend", ["auto", "json"])
+    def test_json_lines(self, lines_backend, make_products):
+        frame = to_frame(make_products(7))
+        buffer = io.StringIO()
+        assert write_json_lines(buffer, frame, lines_backend, chunk_rows=3) == 7
+        
+        lines = buffer.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == frame.to_dicts()
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            JsonEncoder("ujson")
+
+
+class TestJsonExport:
+    """Pruebas de la exportación JSON de DataExporter"""
+    
+    def test_export_to_json(self, tmp_path, make_products):
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        
+        path = exporter.export_to_json(make_products(7), "products.json", compact=True)
+        data = json.load(open(path, encoding="utf-8"))
+        assert data["total_count"] == 7
+        assert data["marketplaces"] == ["MercadoLibre", "Falabella"]
+        assert len(data["products"]) == 7
+    
+    def test_export_to_jsonl(self, tmp_path, make_products):
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        
+        path = exporter.export_to_jsonl(make_products(7), "products.jsonl")
+        assert len(open(path, encoding="utf-8").read().splitlines()) == 7
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("selectolax")
+
+from utils.http_fetcher import HttpFetcher
+from utils.response_cache import ResponseCache
+from scrapers.mercadolibre.scraper import MercadoLibreScraper
+from scrapers.mercadolibre.html_parser import looks_like_listing, parse_listing
+
+FRAGMENTS = Path(__file__).parent.parent / "fragments"
+
+
+def build_listing() -> str:
+    """Arma un listado con breadcrumb, filtro aplicado y una tarjeta de precios guardada"""
+    with open(FRAGMENTS / "mercadolibre" / "price_sin_descuento.html", encoding="utf-8") as f:
+        price_html = f.read()
+    
+    return (
+        '<html><body>'
+        '<ol class="andes-breadcrumb">'
+        '<li class="andes-breadcrumb__item"><a class="andes-breadcrumb__link" href="https://listado.mercadolibre.com.co/celulares">'
+        '<span itemprop="name">Celulares</span></a><meta itemprop="position" content="1"></li>'
+        '<li class="andes-breadcrumb__item"><a class="andes-breadcrumb__link" href="https://listado.mercadolibre.com.co/celulares/smartphones">'
+        '<span itemprop="name">Smartphones</span></a><meta itemprop="position" content="2"></li>'
+        '</ol>'
+        '<section class="ui-search-applied-filters"><span class="andes-tag__label">Apple</span></section>'
+        '<ul><li class="ui-search-layout__item">'
+        '<h3><a class="poly-component__title" href="https://articulo.mercadolibre.com.co/MCO-1">iPhone</a></h3>'
+        f'{price_html}'
+        '</li></ul>'
+        '</body></html>'
+    )
+
+
+PAGES = {
+    "/iphone": build_listing(),
+    "/login": '<html><body><a href="https://www.mercadolibre.com/jms/co/lgz/login.mercadolibre">Ingresa</a></body></html>'
+}
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    """Sirve los listados de prueba"""
+    
+    def do_GET(self):
+        body = PAGES.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        self.wfile.write((body or "not found").encode("utf-8"))
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ListingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+async def fetch(url: str):
+    fetcher = HttpFetcher(http2=False)
+    try:
+        return await fetcher.fetch_html(url)
+    finally:
+        await fetcher.close()
+
+
+class TestHttpFetcher:
+    """Pruebas del camino rápido HTTP contra un servidor local"""
+    
+    def test_fetch_html(self, server_url):
+        """Prueba que se retorne el HTML de una respuesta válida"""
+        html = asyncio.run(fetch(f"{server_url}/iphone"))
+        assert looks_like_listing(html)
+    
+    def test_fetch_error_status(self, server_url):
+        """Prueba que una respuesta 4xx retorne None"""
+        assert asyncio.run(fetch(f"{server_url}/missing")) is None
+    
+    def test_fetch_connection_error(self):
+        """Prueba que un error de conexión retorne None"""
+        assert asyncio.run(fetch("http://127.0.0.1:9/iphone")) is None
+    
+    def test_interstitial_is_not_listing(self, server_url):
+        """Prueba que una página de login no se considere listado"""
+        html = asyncio.run(fetch(f"{server_url}/login"))
+        assert not looks_like_listing(html)
+    
+    def test_parse_listing(self):
+        """Prueba la extracción de tarjetas, breadcrumb y filtros"""
+        listing = parse_listing(build_listing())
+        assert len(listing['cards']) == 1
+        assert listing['breadcrumb'][1] == {
+            'name': 'Smartphones',
+            'url': 'https://listado.mercadolibre.com.co/celulares/smartphones',
+            'position': 2
+        }
+        assert listing['filters'] == ['Apple']
+    
+    def test_scraper_fetch_page_products(self, server_url):
+        """Prueba que el scraper arme productos y categorías sin navegador"""
+        async def run():
+            fetcher = HttpFetcher(http2=False)
+            scraper = MercadoLibreScraper(http_fetcher=fetcher)
+            try:
+                return scraper, await scraper.fetch_page_products(f"{server_url}/iphone")
+            finally:
+                await fetcher.close()
+        
+        scraper, products = asyncio.run(run())
+        assert len(products) == 1
+        assert products[0].price == 2299900.0
+        assert scraper.category_info['category'] == 'Smartphones'
+        assert scraper.applied_filters == ['Apple']
+    
+    def test_scraper_without_fetcher(self):
+        """Prueba que sin cliente HTTP se use el navegador"""
+        scraper = MercadoLibreScraper()
+        assert asyncio.run(scraper.fetch_page_products("http://127.0.0.1:9/iphone")) is None
+    
+    def test_interstitial_is_not_cached(self, server_url, tmp_path):
+        """Prueba que la caché guarde el listado pero no la página de login que rechaza el validator"""
+        cache = ResponseCache(directory=str(tmp_path), max_mb=1, default_ttl=60, ttl_overrides={})
+        
+        async def run():
+            fetcher = HttpFetcher(http2=False, response_cache=cache)
+            try:
+                for path in ("/iphone", "/login"):
+                    await fetcher.fetch_html(f"{server_url}{path}", validator=looks_like_listing)
+            finally:
+                await fetcher.close()
+        
+        asyncio.run(run())
+        assert cache.contains(f"{server_url}/iphone", "desktop")
+        assert not cache.contains(f"{server_url}/login", "desktop")
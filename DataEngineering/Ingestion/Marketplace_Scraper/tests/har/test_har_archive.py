@@ -0,0 +1,52 @@
+import asyncio
+import os
+import pytest
+from utils.har import HarArchive
+
+
+class FakeContext:
+    """Contexto de prueba que registra las rutas HAR y comunes"""
+    
+    def __init__(self):
+        self.calls = []
+    
+    async def route_from_har(self, path, **kwargs):
+        self.calls.append(('har', os.path.basename(path), kwargs))
+    
+    async def route(self, url, handler):
+        self.calls.append(('route', url, None))
+
+
+class TestHarArchive:
+    def test_record_gives_each_context_its_own_file(self, tmp_path):
+        archive = HarArchive('record', 'run1', directory=str(tmp_path))
+        first, second = FakeContext(), FakeContext()
+        
+        asyncio.run(archive.attach(first, "desktop"))
+        asyncio.run(archive.attach(second, "mobile"))
+        
+        assert first.calls[0][1] == "001-desktop.har"
+        assert second.calls[0][1] == "002-mobile.har"
+        assert first.calls[0][2]['update'] is True
+    
+    def test_replay_serves_all_files_and_aborts_the_rest(self, tmp_path):
+        run_dir = tmp_path / "run1"
+        run_dir.mkdir()
+        for name in ("001-desktop.har", "002-mobile.har"):
+            (run_dir / name).write_text("{}")
+        
+        context = FakeContext()
+        asyncio.run(HarArchive('replay', 'run1', directory=str(tmp_path)).attach(context, "desktop"))
+        
+        # El abort se registra primero para que Playwright lo evalúe de último
+        assert context.calls[0][0] == 'route'
+        assert [call[1] for call in context.calls[1:]] == ["001-desktop.har", "002-mobile.har"]
+        assert all(call[2]['not_found'] == 'fallback' for call in context.calls[1:])
+    
+    def test_replay_without_recordings_fails(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            HarArchive('replay', 'missing', directory=str(tmp_path))
+    
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            HarArchive('stream', directory=str(tmp_path))
@@ -0,0 +1,67 @@
+"""
+Microbenchmarks de utils/helpers (requiere pytest-benchmark).
+
+    python -m pytest tests/helpers/test_helpers_benchmark.py --benchmark-only
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pl = pytest.importorskip("polars")
+
+from utils.helpers import clean_price, clean_text, extract_number, extract_integer, clean_prices
+from utils.polars_helpers import normalize_frame
+
+# Una página típica de MercadoLibre: 50 tarjetas
+PRICES = ["$ 2.299.900", "1.234,56", "COP 899.000", "$ 45.990", "sin precio"] * 10
+TITLES = ["  Celular Samsung Galaxy A15 \n 128gb  ", "Apple iPhone 15\t(256 GB) - Negro"] * 25
+RATINGS = ["4.8", "Calificación 4,5 de 5", "(1.234)", "sin calificación", "5"] * 10
+
+# Un dataset exportado mediano
+DATASET_ROWS = 20_000
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    repeat = DATASET_ROWS // len(PRICES)
+    return pl.DataFrame({
+        'price': PRICES * repeat,
+        'title': (TITLES * (DATASET_ROWS // len(TITLES)))[:len(PRICES) * repeat],
+        'reviews': RATINGS * repeat
+    })
+
+
+def test_clean_price_page(benchmark):
+    benchmark(lambda: [clean_price(text) for text in PRICES])
+
+
+def test_clean_prices_batch_page(benchmark):
+    benchmark(clean_prices, PRICES)
+
+
+def test_clean_text_page(benchmark):
+    benchmark(lambda: [clean_text(text) for text in TITLES])
+
+
+def test_extract_number_page(benchmark):
+    benchmark(lambda: [extract_number(text) for text in RATINGS])
+
+
+def test_extract_integer_page(benchmark):
+    benchmark(lambda: [extract_integer(text) for text in RATINGS])
+
+
+def test_dataset_scalar_functions(benchmark, dataset):
+    columns = dataset.to_dict(as_series=False)
+    
+    def normalize():
+        return (
+            [clean_price(text) for text in columns['price']],
+            [clean_text(text) for text in columns['title']],
+            [extract_integer(text) for text in columns['reviews']]
+        )
+    
+    benchmark(normalize)
+
+
+def test_dataset_polars_expressions(benchmark, dataset):
+    benchmark(normalize_frame, dataset, prices=['price'], texts=['title'], integers=['reviews'])
@@ -0,0 +1,69 @@
+import pytest
+from utils.helpers import (
+    clean_price, clean_text, extract_number, extract_integer,
+    clean_prices, clean_texts, extract_numbers, extract_integers
+)
+
+pl = pytest.importorskip("polars")
+
+from utils.polars_helpers import price_expr, text_expr, number_expr, integer_expr, normalize_frame
+
+# Entradas de las pruebas unitarias de cada helper más casos límite
+PRICES = [
+    "2.299.900", "1.234.567", "999.999", "123", "$2.299.900", "COP 1.234.567", "$$ 999.999", "€1.234",
+    "1.234,56", "999,99", "12.345,67", "$1.234,50", "0", "1", "10", "100", "", "   ", "abc", "$$$",
+    "COP", ",,,,", "....", " 2.299.900 ", "$ 1.234,56 ", "  999.999  ", "1,2,3", "1,", ",5", None
+]
+TEXTS = [
+    "Texto normal", "Texto  con   espacios", "   Texto con espacios   ", "Texto\ncon\rsaltos\tde\nlínea",
+    "Texto\r\ncon\t\tespacios", "Múltiples\n\n\nsaltos", "", "   ", None, "   \n\t\r   ", "\n\n\n", "\t\t\t"
+]
+NUMBERS = [
+    "4.5", "4,5", "(1,234)", "Calificación 4.8 de 5", "1234", "sin número", "", None, "3.", "12,34,56"
+]
+INTEGERS = [
+    "123", "0", "999", "1,234", "1.234.567", "999,999", "Total: 1,234 reviews", "Stock: 999 unidades",
+    "abc123def456", "Tel: +57 1 234-5678", "ID: A1B2C3", "", "abc", "$$$", None, "12.5"
+]
+
+
+class TestBatchHelpers:
+    """Pruebas de las versiones por lote de los helpers de limpieza"""
+    
+    def test_batch_functions_match_scalar_functions(self):
+        """Prueba que cada función por lote dé lo mismo que la función escalar"""
+        assert clean_prices(PRICES) == [clean_price(text) for text in PRICES]
+        assert clean_texts(TEXTS) == [clean_text(text) for text in TEXTS]
+        assert extract_numbers(NUMBERS) == [extract_number(text) for text in NUMBERS]
+        assert extract_integers(INTEGERS) == [extract_integer(text) for text in INTEGERS]
+
+
+class TestPolarsHelpers:
+    """Pruebas de las expresiones de Polars equivalentes a los helpers"""
+    
+    def column(self, values, expr):
+        frame = pl.DataFrame({'value': values}, schema={'value': pl.Utf8})
+        return frame.select(expr('value'))['value'].to_list()
+    
+    def test_price_expr_matches_clean_price(self):
+        """Prueba price_expr contra clean_price"""
+        assert self.column(PRICES, price_expr) == [clean_price(text) for text in PRICES]
+    
+    def test_text_expr_matches_clean_text(self):
+        """Prueba text_expr contra clean_text"""
+        assert self.column(TEXTS, text_expr) == [clean_text(text) for text in TEXTS]
+    
+    def test_number_expr_matches_extract_number(self):
+        """Prueba number_expr contra extract_number"""
+        assert self.column(NUMBERS, number_expr) == [extract_number(text) for text in NUMBERS]
+    
+    def test_integer_expr_matches_extract_integer(self):
+        """Prueba integer_expr contra extract_integer"""
+        assert self.column(INTEGERS, integer_expr) == [extract_integer(text) for text in INTEGERS]
+    
+    def test_normalize_frame(self):
+        """Prueba la normalización de varias columnas en una sola pasada"""
+        frame = pl.DataFrame({'price': ["$1.234,50"], 'title': ["  Celular \n X "], 'reviews': ["(1.234)"]})
+        result = normalize_frame(frame, prices=['price'], texts=['title'], integers=['reviews'])
+        
+        assert result.row(0) == (1234.5, "Celular X", 1234)
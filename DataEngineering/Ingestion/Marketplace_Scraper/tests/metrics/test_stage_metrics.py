@@ -0,0 +1,108 @@
+import pytest
+from utils.metrics import StageMetrics, percentile, browser_process_tree
+from benchmarks.report import compare_reports
+
+
+def scenario(products_per_s=10.0, navigate_p95=800.0, chromium_peak=400.0):
+    return {
+        'pages_per_s': 1.0,
+        'products_per_s': products_per_s,
+        'stages': {
+            'navigate': {'count': 3, 'p50_ms': 500.0, 'p95_ms': navigate_p95},
+            'export': {'count': 1, 'p50_ms': 1.0, 'p95_ms': 1.0}
+        },
+        'rss_mb': {'python_peak': 80.0, 'chromium_peak': chromium_peak}
+    }
+
+
+class TestStageMetrics:
+    """Pruebas de los tiempos por etapa"""
+    
+    def test_percentile_interpolates(self):
+        """Prueba el percentil con interpolación lineal"""
+        assert percentile([1, 2, 3, 4], 50) == pytest.approx(2.5)
+        assert percentile([1, 2, 3, 4], 95) == pytest.approx(3.85)
+        assert percentile([], 50) is None
+    
+    def test_stage_records_samples_even_on_error(self):
+        """Prueba que una etapa que falla también deje su muestra"""
+        metrics = StageMetrics()
+        
+        with metrics.stage('navigate'):
+            pass
+        with pytest.raises(RuntimeError):
+            with metrics.stage('navigate'):
+                raise RuntimeError("timeout")
+        
+        summary = metrics.summary()
+        assert summary['navigate']['count'] == 2
+        assert set(summary['navigate']) == {'count', 'total_s', 'p50_ms', 'p95_ms', 'max_ms'}
+    
+    def test_reset_clears_samples_and_counters(self):
+        """Prueba que reset limpie muestras y contadores"""
+        metrics = StageMetrics()
+        metrics.count('products', 50)
+        with metrics.stage('export'):
+            pass
+        
+        metrics.reset()
+        assert metrics.summary() == {}
+        assert metrics.counters['products'] == 0
+
+
+class TestBrowserProcessTree:
+    """Pruebas de la selección de procesos del navegador para medir su memoria"""
+    
+    def test_only_playwright_and_chromium_subtrees(self):
+        """Prueba que solo cuenten el driver de Playwright y Chromium, no los workers de Python"""
+        children = {1: [2, 3, 4], 2: [5], 3: [6, 7], 7: [8], 4: [9]}
+        commands = {
+            2: "/home/dev/playwright-scraper/.venv/bin/python main.py --query iphone",
+            3: "/venv/playwright/driver/node /venv/playwright/driver/package/cli.js run-driver",
+            6: "/ms-playwright/chromium-1091/chrome-linux/chrome --headless",
+            7: "/ms-playwright/chromium-1091/chrome-linux/chrome --type=zygote",
+            8: "/ms-playwright/chromium-1091/chrome-linux/chrome --type=renderer",
+            4: "/bin/sh -c git status",
+            9: "git status",
+            5: "/usr/bin/python3 -c from multiprocessing.resource_tracker import main"
+        }
+        
+        assert sorted(browser_process_tree(1, children, commands.get)) == [3, 6, 7, 8]
+    
+    def test_chromium_under_other_process(self):
+        """Prueba que se encuentre Chromium bajo un proceso intermedio"""
+        children = {1: [2], 2: [3]}
+        commands = {2: "bash", 3: "headless_shell --remote-debugging-pipe"}
+        
+        assert browser_process_tree(1, children, commands.get) == [3]
+
+
+class TestCompareReports:
+    """Pruebas de la detección de regresiones entre reportes"""
+    
+    def test_no_regressions_within_tolerance(self):
+        """Prueba que variaciones dentro de la tolerancia no sean regresiones"""
+        baseline = {'scenarios': {'single-page': scenario()}}
+        current = {'scenarios': {'single-page': scenario(products_per_s=9.0, navigate_p95=900.0)}}
+        
+        assert compare_reports(current, baseline, tolerance=0.15) == []
+    
+    def test_detects_throughput_latency_and_memory_regressions(self):
+        """Prueba la detección de regresiones de throughput, latencia y memoria"""
+        baseline = {'scenarios': {'single-page': scenario()}}
+        current = {'scenarios': {'single-page': scenario(products_per_s=5.0, navigate_p95=1200.0, chromium_peak=600.0)}}
+        
+        regressions = compare_reports(current, baseline, tolerance=0.15)
+        
+        assert len(regressions) == 3
+        assert any('products_per_s' in regression for regression in regressions)
+        assert any('navigate p95' in regression for regression in regressions)
+        assert any('chromium_peak' in regression for regression in regressions)
+    
+    def test_ignores_noise_in_fast_stages(self):
+        """Prueba que se ignoren las etapas más rápidas que MIN_STAGE_MS"""
+        baseline = {'scenarios': {'single-page': scenario()}}
+        current = {'scenarios': {'single-page': scenario()}}
+        current['scenarios']['single-page']['stages']['export']['p95_ms'] = 3.0
+        
+        assert compare_reports(current, baseline) == []
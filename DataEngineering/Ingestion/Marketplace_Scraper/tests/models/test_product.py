@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+import pytest
+from models.product import Product, batch_timestamp
+from benchmarks.product_memory import measure_product_memory
+
+EXPORT_COLUMNS = [
+    'title', 'price', 'original_price', 'brand', 'seller', 'currency', 'free_shipping',
+    'parent_category', 'category', 'category2', 'rating', 'reviews_count',
+    'availability', 'description', 'marketplace', 'scraped_at', 'url', 'image_url'
+]
+
+
+class TestProduct:
+    """Pruebas del modelo Product con __slots__"""
+    
+    def test_slotted_without_instance_dict(self):
+        """Prueba que Product no tenga __dict__ ni acepte atributos nuevos"""
+        product = Product(title="Celular")
+        
+        assert not hasattr(product, '__dict__')
+        with pytest.raises(AttributeError):
+            product.unknown_field = 1
+    
+    def test_products_share_batch_timestamp(self):
+        """Prueba que los productos de un lote compartan el mismo scraped_at"""
+        with batch_timestamp(datetime(2024, 5, 1, 10, 30)) as stamp:
+            first, second = Product(title="A"), Product(title="B")
+            
+            assert first.scraped_at is stamp and second.scraped_at is stamp
+            assert Product(title="C", scraped_at=datetime(2024, 1, 1)).scraped_at.year == 2024
+    
+    def test_later_product_gets_fresh_timestamp(self):
+        """Prueba que un Product creado fuera del lote reciba la hora actual"""
+        with batch_timestamp(datetime(2024, 5, 1, 10, 30)):
+            pass
+        
+        before = datetime.now()
+        assert Product(title="D").scraped_at >= before
+    
+    def test_batch_timestamp_is_per_task(self):
+        """Prueba que tareas concurrentes no se mezclen el scraped_at"""
+        async def scrape(stamp):
+            with batch_timestamp(stamp):
+                await asyncio.sleep(0)
+                return Product(title="E").scraped_at
+        
+        async def run():
+            return await asyncio.gather(scrape(datetime(2024, 5, 1)), scrape(datetime(2024, 6, 1)))
+        
+        assert asyncio.run(run()) == [datetime(2024, 5, 1), datetime(2024, 6, 1)]
+    
+    def test_categorical_strings_are_interned(self):
+        """Prueba que los campos categóricos compartan el mismo str"""
+        category = "".join(["Celulares ", "y Teléfonos"])
+        first = Product(title="A", category=category, currency="".join(["CO", "P"]))
+        second = Product(title="B", category="".join(["Celulares y ", "Teléfonos"]), currency="COP")
+        
+        assert first.category is second.category
+        assert first.currency is second.currency
+    
+    def test_to_dict_keeps_export_columns(self):
+        """Prueba que to_dict conserve las columnas y el formato de exportación"""
+        with batch_timestamp(datetime(2024, 5, 1, 10, 30)):
+            data = Product(title="Celular", price=1000.0, description="x" * 250).to_dict()
+        
+        assert list(data) == EXPORT_COLUMNS
+        assert data['scraped_at'] == "2024-05-01T10:30:00"
+        assert data['description'] == "x" * 200 + "..."
+    
+    def test_slotted_product_uses_less_memory(self):
+        """Prueba que Product use menos memoria que la representación anterior"""
+        memory = measure_product_memory(2_000)
+        
+        assert memory['bytes_per_product'] < memory['legacy_bytes_per_product']
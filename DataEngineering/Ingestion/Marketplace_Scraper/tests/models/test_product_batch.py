@@ -0,0 +1,168 @@
+import csv
+import dataclasses
+import io
+import json
+from pathlib import Path
+import polars as pl
+import pytest
+from models.product_batch import ProductBatch, PRODUCT_COLUMNS
+from utils.exporters import DataExporter
+
+
+def legacy_csv(products):
+    """CSV tal como lo escribía DataExporter con csv.DictWriter y to_dict()"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(products[0].to_dict().keys()))
+    writer.writeheader()
+    for product in products:
+        writer.writerow(product.to_dict())
+    return buffer.getvalue().replace('\r\n', '\n')
+
+
+class TestProductBatch:
+    """Pruebas del lote columnar de productos"""
+    
+    def test_pages_are_appended_as_chunks(self, make_products):
+        """Prueba que cada página quede como un bloque sin copiar las anteriores"""
+        batch = ProductBatch()
+        products = make_products(4)
+        batch.append_products(products[:2])
+        batch.append_products(products[2:])
+        batch.append_products([])
+        
+        frame = batch.to_polars()
+        assert len(batch) == 4
+        assert frame.columns == PRODUCT_COLUMNS
+        assert frame.n_chunks() == 2
+        assert frame['reviews_count'].dtype == pl.Int64
+    
+    def test_round_trip_to_products(self, make_products):
+        """Prueba que el lote se pueda convertir de vuelta a Product sin perder datos"""
+        products = make_products()
+        
+        assert [product.to_dict() for product in ProductBatch.from_products(products).to_products()] == \
+            [product.to_dict() for product in products]
+    
+    def test_append_frame_fills_missing_columns(self):
+        """Prueba que un DataFrame parcial se complete con el esquema de Product"""
+        batch = ProductBatch.from_frame(pl.DataFrame({'title': ["Arroz"], 'price': [4500]}))
+        
+        row = batch.to_polars().row(0, named=True)
+        assert row['price'] == 4500.0
+        assert row['url'] is None
+    
+    def test_dedup_by_marketplace_and_url(self, make_products):
+        """Prueba la deduplicación por marketplace y URL conservando el orden"""
+        products = make_products()
+        batch = ProductBatch.from_products(products + products[:1])
+        
+        assert batch.dedup().to_polars()['url'].to_list() == [product.url for product in products]
+    
+    def test_summary_and_cheapest(self, make_products):
+        """Prueba el resumen por marketplace y los productos más baratos"""
+        batch = ProductBatch.from_products(make_products())
+        summary = {row['marketplace']: row for row in batch.summary().iter_rows(named=True)}
+        
+        assert summary['MercadoLibre']['count'] == 2
+        assert summary['MercadoLibre']['with_price'] == 1
+        assert summary['Falabella']['avg_price'] == 1500000.0
+        assert batch.cheapest(1)['title'].to_list() == ["Celular Samsung Galaxy A15 128 GB"]
+    
+    def test_partition_by_marketplace(self, make_products):
+        """Prueba la partición del lote por marketplace"""
+        parts = ProductBatch.from_products(make_products()).partition_by_marketplace()
+        
+        assert {name: len(part) for name, part in parts.items()} == {'MercadoLibre': 2, 'Falabella': 1}
+
+
+class TestBatchExport:
+    """Pruebas de la exportación desde el lote"""
+    
+    def test_csv_matches_legacy_writer(self, tmp_path, make_products):
+        """Prueba que el CSV sea idéntico al de csv.DictWriter con to_dict()"""
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        products = make_products()
+        
+        filepath = exporter.export_to_csv(products, "products.csv")
+        
+        # reviews_count es Int64 en el lote: el CSV trae 1234 donde to_dict() del extractor trae 1234.0
+        legacy_products = [
+            dataclasses.replace(product, reviews_count=int(product.reviews_count))
+            if product.reviews_count is not None else product
+            for product in products
+        ]
+        with open(filepath, encoding='utf-8') as file:
+            assert file.read() == legacy_csv(legacy_products)
+    
+    def test_json_rows_match_to_dict(self, tmp_path, make_products):
+        """Prueba que las filas del JSON coincidan con to_dict()"""
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        products = make_products()
+        
+        with open(exporter.export_to_json(products, "products.json"), encoding='utf-8') as file:
+            data = json.load(file)
+        
+        assert data['products'] == [product.to_dict() for product in products]
+        assert data['marketplaces'] == ["MercadoLibre", "Falabella"]
+    
+    def test_append_csv_with_query_column(self, tmp_path, make_products):
+        """Prueba el CSV incremental con la columna query al inicio"""
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        products = make_products(4)
+        
+        exporter.append_to_csv(products[:2], "batch.csv", extra={'query': "celular"})
+        filepath = exporter.append_to_csv(products[2:], "batch.csv", extra={'query': "tv"})
+        
+        with open(filepath, encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        
+        assert list(rows[0]) == ['query'] + PRODUCT_COLUMNS
+        assert [row['query'] for row in rows] == ["celular", "celular", "tv", "tv"]
+        assert rows[0]['reviews_count'] == "1234"
+
+
+class TestExtractedProducts:
+    """Pruebas del lote con productos armados por los extractores (no a mano)"""
+    
+    def extracted_products(self):
+        pytest.importorskip("selectolax")
+        from scrapers.mercadolibre.html_parser import parse_cards
+        from scrapers.mercadolibre.product_extractor import ProductExtractor
+        
+        with open(Path(__file__).parent.parent / "fragments" / "mercadolibre" / "price_con_descuento.html", encoding="utf-8") as file:
+            price_html = file.read()
+        
+        card = (
+            '<li class="ui-search-layout__item">'
+            '<h3><a class="poly-component__title" href="https://articulo.mercadolibre.com.co/MCO-123456">Celular</a></h3>'
+            '<span class="poly-reviews__rating">4.8</span><span class="poly-reviews__total">(1.234)</span>'
+            f'{price_html}</li>'
+        )
+        extractor = ProductExtractor(None, "MercadoLibre", "co")
+        return [extractor.build_product(raw, {}) for raw in parse_cards([card])]
+    
+    def test_extractor_products_build_batch(self, tmp_path):
+        """Prueba que los productos del extractor entren al lote y se exporten sin errores de tipo"""
+        products = self.extracted_products()
+        batch = ProductBatch.from_products(products)
+        
+        assert batch.to_polars()['reviews_count'].to_list() == [1234]
+        
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        exporter.append_to_csv(products, "batch.csv", extra={'query': "celular"})
+        exporter.export_to_parquet(products, "products.parquet")
+        assert pl.read_parquet(tmp_path / "products.parquet")['reviews_count'].to_list() == [1234]
+    
+    def test_float_reviews_count_is_cast(self):
+        """Prueba que un reviews_count float (1234.0) se convierta al entero del esquema"""
+        products = self.extracted_products()
+        products[0].reviews_count = 1234.0
+        
+        batch = ProductBatch()
+        batch.append_products(products)
+        assert batch.to_polars()['reviews_count'].dtype == pl.Int64
+        assert batch.to_polars()['reviews_count'].to_list() == [1234]
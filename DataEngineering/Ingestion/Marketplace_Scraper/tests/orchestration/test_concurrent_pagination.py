@@ -0,0 +1,162 @@
+import asyncio
+import time
+import pytest
+
+pytest.importorskip("playwright")
+
+from models.product import Product
+import scrapers.base_scraper as base_scraper
+from scrapers.base_scraper import BaseScraper
+from utils.rate_limiter import DomainRateLimiter
+
+NO_DELAYS = {"min_delay": 0, "max_delay": 0, "burst": 1}
+
+
+class PagedScraper(BaseScraper):
+    """Scraper de prueba que sirve páginas por HTTP con tiempos distintos"""
+    
+    def __init__(self, products_per_page: dict):
+        super().__init__(rate_limiter=DomainRateLimiter(NO_DELAYS))
+        self.marketplace_name = "Paged"
+        self.concurrent_pagination = True
+        self.products_per_page = products_per_page
+    
+    async def build_search_url(self, query: str, **kwargs) -> str:
+        return f"https://paged.test/{query}?page={kwargs['page']}"
+    
+    async def fetch_page_products(self, url: str):
+        page = int(url.rsplit("=", 1)[1])
+        # Las páginas altas terminan primero para probar el reensamblado en orden
+        await asyncio.sleep(0.2 / page)
+        return [Product(title=f"p{page}-{i}") for i in range(self.products_per_page.get(page, 0))]
+    
+    async def extract_product_info(self, element):
+        return None
+    
+    async def get_product_elements(self):
+        return []
+    
+    async def post_navigate_validation(self) -> bool:
+        return True
+
+
+class StreamingScraper(PagedScraper):
+    """Registra cuándo termina cada descarga y cuándo se agrega cada página"""
+    
+    def __init__(self, delays: dict):
+        super().__init__({page: 1 for page in range(1, len(delays) + 2)})
+        self.delays = delays
+        self.events = []
+    
+    async def fetch_page_products(self, url: str):
+        page = int(url.rsplit("=", 1)[1])
+        await asyncio.sleep(self.delays.get(page, 0))
+        self.events.append(f"fetched {page}")
+        return [Product(title=f"p{page}-0")]
+    
+    def add_page_products(self, products):
+        self.events.append(f"added {products[0].title[1]}")
+        super().add_page_products(products)
+
+
+class FakeBrowserManager:
+    """Navegador de prueba: solo registra la navegación"""
+    
+    page = None
+    
+    def is_cached(self, url):
+        return False
+    
+    async def start(self, **kwargs):
+        return None
+    
+    async def goto(self, url):
+        return True
+    
+    async def close(self):
+        pass
+
+
+class OfflinePagedScraper(PagedScraper):
+    """La página 1 va por el navegador y su parseo offline termina después de las páginas 2..N"""
+    
+    def __init__(self, products_per_page: dict):
+        super().__init__(products_per_page)
+        self.browser_manager = FakeBrowserManager()
+        self.written_pages = []
+    
+    async def fetch_page_products(self, url: str):
+        if url.endswith("page=1"):
+            return None
+        return await super().fetch_page_products(url)
+    
+    async def wait_until_ready(self, page=None) -> bool:
+        return True
+    
+    def offline_parsing_enabled(self) -> bool:
+        return True
+    
+    async def capture_cards_html(self):
+        return ["<li>p1-0</li>"]
+    
+    def build_product_from_raw(self, raw):
+        return Product(title=raw["title"])
+    
+    def add_page_products(self, products):
+        self.written_pages.append([product.title for product in products])
+        super().add_page_products(products)
+
+
+async def slow_parse(parser, cards_html, *args):
+    await asyncio.sleep(0.3)
+    return [{"title": "p1-0"}]
+
+
+class TestConcurrentPagination:
+    """Pruebas de la paginación concurrente de BaseScraper"""
+    
+    def test_pages_in_order(self):
+        """Prueba que los resultados se reensamblen en orden de página"""
+        scraper = PagedScraper({page: 2 for page in range(1, 7)})
+        products = asyncio.run(scraper.search_products("iphone", max_pages=6))
+        assert [product.title for product in products][::2] == [f"p{page}-0" for page in range(1, 7)]
+        assert all(product.marketplace == "Paged" for product in products)
+    
+    def test_stops_at_first_empty_page(self):
+        """Prueba que se corte en la primera página sin productos, como el modo secuencial"""
+        scraper = PagedScraper({1: 1, 2: 1, 4: 1})
+        products = asyncio.run(scraper.search_products("iphone", max_pages=4))
+        assert [product.title for product in products] == ["p1-0", "p2-0"]
+    
+    def test_pages_fetched_in_parallel(self):
+        """Prueba que las páginas 2..N se descarguen en paralelo"""
+        scraper = PagedScraper({page: 1 for page in range(1, 5)})
+        started = time.monotonic()
+        asyncio.run(scraper.search_products("iphone", max_pages=4))
+        # En orden serían 0.2 + 0.1 + 0.067 + 0.05 segundos
+        assert time.monotonic() - started < 0.38
+    
+    def test_offline_first_page_added_before_concurrent_pages(self, monkeypatch):
+        """Prueba que la página 1 en parseo offline se agregue antes que las páginas 2..N"""
+        monkeypatch.setattr(base_scraper, "parse_in_process", slow_parse)
+        scraper = OfflinePagedScraper({page: 1 for page in range(1, 4)})
+        products = asyncio.run(scraper.search_products("iphone", max_pages=3))
+        
+        assert [product.title for product in products] == ["p1-0", "p2-0", "p3-0"]
+        assert scraper.written_pages == [["p1-0"], ["p2-0"], ["p3-0"]]
+    
+    def test_pages_added_as_soon_as_in_order(self):
+        """Prueba que cada página se agregue apenas terminan ella y las anteriores, sin esperar a las demás"""
+        scraper = StreamingScraper({2: 0.01, 3: 0.05, 4: 0.3})
+        asyncio.run(scraper.search_products("iphone", max_pages=4))
+        
+        assert scraper.events == [
+            "fetched 1", "added 1", "fetched 2", "added 2", "fetched 3", "added 3", "fetched 4", "added 4"
+        ]
+    
+    def test_later_page_waits_for_earlier_one(self):
+        """Prueba que una página que termina antes espere a la anterior para agregarse"""
+        scraper = StreamingScraper({2: 0.2, 3: 0.01, 4: 0.05})
+        asyncio.run(scraper.search_products("iphone", max_pages=4))
+        
+        assert scraper.events[2:] == ["fetched 3", "fetched 4", "fetched 2", "added 2", "added 3", "added 4"]
@@ -0,0 +1,106 @@
+import asyncio
+import time
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("httpx")
+
+from main import MarketplaceScraper
+from models.product import Product
+from utils.batch import BatchQuery
+
+
+def fake_scraper(delay: float, fail: bool = False):
+    """Crea una clase de scraper de prueba que tarda `delay` segundos"""
+    class FakeScraper:
+        def __init__(self, **kwargs):
+            pass
+        
+        async def search_products(self, query, max_pages):
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError("sitio caído")
+            return [Product(title=f"{query} {delay}", marketplace=str(delay))]
+    
+    return FakeScraper
+
+
+def run(scrapers, **kwargs):
+    orchestrator = MarketplaceScraper()
+    orchestrator.scrapers = scrapers
+    started = time.monotonic()
+    products = asyncio.run(orchestrator.scrape_multiple_marketplaces(list(scrapers), "iphone", **kwargs))
+    return products, time.monotonic() - started
+
+
+class TestMarketplaceScraper:
+    """Pruebas del orquestador concurrente de marketplaces"""
+    
+    def test_runs_in_parallel(self):
+        """Prueba que el tiempo total sea el del marketplace más lento"""
+        products, elapsed = run({'a': fake_scraper(0.3), 'b': fake_scraper(0.3), 'c': fake_scraper(0.3)})
+        assert len(products) == 3
+        assert elapsed < 0.6
+    
+    def test_results_merged_as_finished(self):
+        """Prueba que los resultados se agreguen en orden de finalización"""
+        products, _ = run({'slow': fake_scraper(0.2), 'fast': fake_scraper(0.05)})
+        assert [product.marketplace for product in products] == ['0.05', '0.2']
+    
+    def test_concurrency_cap(self):
+        """Prueba que el límite de concurrencia serialice los marketplaces"""
+        _, elapsed = run({'a': fake_scraper(0.2), 'b': fake_scraper(0.2)}, concurrency=1)
+        assert elapsed >= 0.4
+    
+    def test_error_isolation(self):
+        """Prueba que un marketplace con error no afecte a los demás"""
+        products, _ = run({'down': fake_scraper(0.01, fail=True), 'up': fake_scraper(0.01)})
+        assert len(products) == 1
+    
+    def test_timeout(self):
+        """Prueba que un marketplace lento se corte por tiempo límite"""
+        products, elapsed = run({'hung': fake_scraper(5), 'up': fake_scraper(0.01)}, timeout=0.2)
+        assert len(products) == 1
+        assert elapsed < 1
+    
+    def test_reports_failed_marketplaces(self):
+        """Prueba que los marketplaces con error o timeout se informen en la lista `failed`"""
+        failed = []
+        products, _ = run({'down': fake_scraper(0.01, fail=True), 'hung': fake_scraper(5), 'up': fake_scraper(0.01)},
+                          timeout=0.2, failed=failed)
+        assert len(products) == 1
+        assert sorted(failed) == ['down', 'hung']
+    
+    def test_batch_streams_results(self, tmp_path):
+        """Prueba que el lote agregue los resultados de cada búsqueda al mismo archivo"""
+        orchestrator = MarketplaceScraper()
+        orchestrator.scrapers = {'a': fake_scraper(0.01), 'down': fake_scraper(0.01, fail=True)}
+        orchestrator.exporter.output_dir = str(tmp_path)
+        jobs = [BatchQuery(f"sku {i}", ['a', 'down']) for i in range(5)]
+        
+        summary = asyncio.run(orchestrator.run_batch(jobs, workers=2))
+        
+        assert summary == {'queries': 5, 'products': 5, 'failed': 0}
+        lines = next(tmp_path.glob("batch_*.csv")).read_text(encoding="utf-8").splitlines()
+        assert lines[0].startswith("query,title")
+        assert len(lines) == 6
+    
+    def test_batch_counts_failed_queries(self, tmp_path):
+        """Prueba que una búsqueda cuente como fallida si ninguno de sus marketplaces terminó bien"""
+        orchestrator = MarketplaceScraper()
+        orchestrator.scrapers = {'a': fake_scraper(0.01), 'down': fake_scraper(0.01, fail=True)}
+        orchestrator.exporter.output_dir = str(tmp_path)
+        jobs = [BatchQuery("sku 1", ['a', 'down']), BatchQuery("sku 2", ['down'])]
+        
+        summary = asyncio.run(orchestrator.run_batch(jobs, workers=2))
+        
+        assert summary == {'queries': 1, 'products': 1, 'failed': 1}
+    
+    def test_http_fetcher_per_device_mode(self):
+        """Prueba que cada modo de dispositivo use su propio User-Agent y perfil de caché"""
+        orchestrator = MarketplaceScraper(use_http=True)
+        desktop, mobile = orchestrator._get_http_fetcher(False), orchestrator._get_http_fetcher(True)
+        
+        assert mobile is orchestrator._get_http_fetcher(True)
+        assert (desktop.mobile, desktop.cache_profile) == (False, "desktop")
+        assert (mobile.mobile, mobile.cache_profile) == (True, "mobile")
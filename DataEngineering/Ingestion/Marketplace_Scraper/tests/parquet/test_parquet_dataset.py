@@ -0,0 +1,96 @@
+import os
+from datetime import datetime, date
+import polars as pl
+import pytest
+from models.product import Product
+from utils.exporters import DataExporter
+from utils.parquet_dataset import ParquetDataset
+from config.settings import Settings
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    return ParquetDataset(str(tmp_path / "products"), partition_by=["marketplace", "scrape_date"])
+
+
+class TestParquetDataset:
+    """Pruebas del dataset Parquet particionado"""
+    
+    def test_hive_partitions(self, dataset, make_products):
+        """Prueba que cada (marketplace, fecha) quede en su propia carpeta Hive"""
+        dataset.write(make_products())
+        
+        partitions = sorted(os.path.relpath(directory, dataset.root) for directory in dataset.partitions())
+        assert partitions == [
+            os.path.join("marketplace=Falabella", "scrape_date=2024-05-01"),
+            os.path.join("marketplace=MercadoLibre", "scrape_date=2024-05-01"),
+            os.path.join("marketplace=MercadoLibre", "scrape_date=2024-05-02")
+        ]
+    
+    def test_typed_columns(self, dataset, make_products):
+        """Prueba que los tipos se conserven y las columnas de partición se reconstruyan al leer"""
+        dataset.write(make_products())
+        frame = dataset.scan().collect()
+        
+        assert frame.schema["price"] == pl.Float64
+        assert frame.schema["reviews_count"] == pl.Int64
+        assert frame.schema["scraped_at"] == pl.Datetime("us")
+        assert frame.schema["scrape_date"] == pl.Date
+        
+        falabella = frame.filter(pl.col("marketplace") == "Falabella")
+        assert falabella["title"].to_list() == ["Televisor LG 55 pulgadas 4K UHD"]
+        assert frame.sort("url")["reviews_count"].to_list() == [1234, None, 1236]
+        assert falabella["scrape_date"].to_list() == [date(2024, 5, 1)]
+    
+    def test_append_and_compact(self, dataset, make_products):
+        """Prueba que append agregue archivos y compact los una sin duplicar filas"""
+        dataset.write(make_products())
+        dataset.write(make_products())
+        assert len(dataset.files()) == 6
+        assert dataset.scan().collect().height == 6
+        
+        summary = dataset.compact(min_files=2)
+        assert summary == {"partitions": 3, "files_removed": 6, "rows": 3}
+        assert len(dataset.files()) == 3
+        assert len(dataset.read_batch()) == 3
+    
+    def test_compact_skips_small_partitions(self, dataset, make_products):
+        dataset.write(make_products())
+        assert dataset.compact(min_files=2)["partitions"] == 0
+        assert len(dataset.files()) == 3
+    
+    def test_partition_values_escaped(self, dataset):
+        """Prueba que los separadores en el valor no creen carpetas de más"""
+        dataset.write([Product(title="x", marketplace="Mega/Tiendas", scraped_at=datetime(2024, 5, 1))])
+        assert dataset.scan().collect()["marketplace"].to_list() == ["Mega/Tiendas"]
+    
+    def test_invalid_partition_column(self, tmp_path):
+        with pytest.raises(ValueError):
+            ParquetDataset(str(tmp_path), partition_by=["color"])
+
+
+class TestParquetExport:
+    """Pruebas de la exportación Parquet de DataExporter"""
+    
+    def test_by_marketplace_is_partitioned(self, tmp_path, make_products):
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        
+        for _ in range(Settings.PARQUET_CONFIG["compact_min_files"] - 1):
+            exporter.export_by_marketplace(make_products(), "parquet")
+        assert len(exporter.parquet_dataset().files()) > 3
+        
+        exporter.export_by_marketplace(make_products(), "parquet", compact=True)
+        
+        dataset = exporter.parquet_dataset()
+        assert len(dataset.files()) == 3
+        assert dataset.scan().collect().height == 3
+    
+    def test_single_file(self, tmp_path, make_products):
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        
+        path = exporter.export_to_parquet(make_products(), "products.parquet")
+        frame = pl.read_parquet(path)
+        assert frame.height == 3
+        assert frame.schema["reviews_count"] == pl.Int64
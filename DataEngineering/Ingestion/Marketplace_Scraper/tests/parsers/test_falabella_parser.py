@@ -0,0 +1,51 @@
+from pathlib import Path
+import pytest
+
+pytest.importorskip("selectolax")
+
+from scrapers.falabella.html_parser import parse_document, parse_cards
+from scrapers.falabella.product_extractor import ProductExtractor
+
+FRAGMENT = Path(__file__).parent.parent / "fragments" / "falabella" / "product.html"
+
+
+def load_fragment() -> str:
+    with open(FRAGMENT, encoding="utf-8") as f:
+        return f.read()
+
+
+class TestFalabellaParser:
+    """Pruebas del parser offline de Falabella contra HTML guardado"""
+    
+    def test_parse_document_reads_all_pods(self):
+        """Prueba que se lean todos los pods del fragmento"""
+        raw_pods = parse_document(load_fragment())
+        assert len(raw_pods) == 7
+        assert all(raw is not None for raw in raw_pods)
+    
+    def test_parse_document_basic_fields(self):
+        """Prueba los campos de texto y atributos del primer pod"""
+        raw = parse_document(load_fragment())[0]
+        assert raw['title'] == "Audífonos AirPods 4"
+        assert raw['brand'] == "APPLE"
+        assert raw['seller'] == "Por Falabella"
+        assert raw['internet_price'] == "689.900"
+        assert raw['normal_price'] is None
+        assert raw['link'] == "https://www.falabella.com.co/falabella-co/product/73060682/Audifonos-AirPods-4/73060682"
+        assert raw['image_url'].startswith("https://media.falabella.com.co/falabellaCO/73060682_1/")
+        assert raw['free_shipping'] is False
+    
+    def test_build_product_with_discount(self):
+        """Prueba la construcción del producto con precio normal y descuento"""
+        raw = parse_document(load_fragment())[1]
+        product = ProductExtractor(None, "Falabella", "co").build_product(raw, {})
+        assert product.title == "Audífonos AirPods Pro 2ª generación USB"
+        assert product.price == 1299900.0
+        assert product.original_price == 1499900.0
+        assert product.currency == "COP"
+    
+    def test_parse_cards_matches_parse_document(self):
+        """Prueba que parsear tarjetas capturadas equivalga a parsear el documento"""
+        html = load_fragment()
+        parts = ['<div pod-layout' + part for part in html.split('<div pod-layout')[1:]]
+        assert parse_cards(parts) == parse_document(html)
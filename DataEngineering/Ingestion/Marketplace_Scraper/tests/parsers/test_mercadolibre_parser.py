@@ -0,0 +1,48 @@
+from pathlib import Path
+import pytest
+
+pytest.importorskip("selectolax")
+
+from scrapers.mercadolibre.html_parser import parse_cards, parse_document
+from scrapers.mercadolibre.product_extractor import ProductExtractor
+
+FRAGMENTS = Path(__file__).parent.parent / "fragments" / "mercadolibre"
+
+
+def build_card(price_fragment: str) -> str:
+    """Arma una tarjeta de resultados alrededor de un fragmento de precios guardado"""
+    with open(FRAGMENTS / price_fragment, encoding="utf-8") as f:
+        price_html = f.read()
+    
+    return (
+        '<li class="ui-search-layout__item">'
+        '<h3><a class="poly-component__title" href="https://articulo.mercadolibre.com.co/MCO-1">Producto</a></h3>'
+        '<span class="poly-component__brand">Marca</span>'
+        '<img class="poly-component__picture" src="https://http2.mlstatic.com/1.webp">'
+        '<span class="poly-reviews__rating">4.8</span><span class="poly-reviews__total">(1234)</span>'
+        f'{price_html}'
+        '</li>'
+    )
+
+
+class TestMercadoLibreParser:
+    """Pruebas del parser offline de MercadoLibre contra HTML guardado"""
+    
+    def test_price_with_discount(self):
+        """Prueba precio actual, precio anterior y descuento"""
+        raw = parse_cards([build_card("price_con_descuento.html")])[0]
+        product = ProductExtractor(None, "MercadoLibre", "co").build_product(raw, {})
+        assert product.price == 93916.0
+        assert product.original_price == 125222.0
+        assert product.rating == 4.8
+        assert product.reviews_count == 1234
+        assert isinstance(product.reviews_count, int)
+        assert product.url == "https://articulo.mercadolibre.com.co/MCO-1"
+    
+    def test_price_without_discount(self):
+        """Prueba que sin precio anterior se use el precio actual como original"""
+        raw = parse_document(f"<ul>{build_card('price_sin_descuento.html')}</ul>")[0]
+        product = ProductExtractor(None, "MercadoLibre", "co").build_product(raw, {})
+        assert product.price == 2299900.0
+        assert product.original_price == 2299900.0
+        assert raw['discount_text'] is None
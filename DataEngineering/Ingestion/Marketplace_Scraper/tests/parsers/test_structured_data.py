@@ -0,0 +1,135 @@
+import json
+import pytest
+
+pytest.importorskip("selectolax")
+pytest.importorskip("playwright")
+
+from utils.structured_data import extract_embedded_state, dig, to_price
+from scrapers.falabella import structured_data as falabella_state
+from scrapers.falabella.product_extractor import ProductExtractor as FalabellaProductExtractor
+from scrapers.mercadolibre import structured_data as mercadolibre_state
+from scrapers.megatienda import parse_vtex_state, VTEX_STATE_SOURCES
+
+NEXT_DATA = {
+    "props": {"pageProps": {"results": [
+        {
+            "displayName": "Audífonos AirPods 4",
+            "brand": "APPLE",
+            "sellerName": "Falabella",
+            "url": "https://www.falabella.com.co/falabella-co/product/1/airpods-4",
+            "mediaUrls": ["https://media.falabella.com/1.jpg"],
+            "prices": [
+                {"type": "internetPrice", "price": ["689.900"], "crossed": False},
+                {"type": "normalPrice", "price": ["799.900"], "crossed": True}
+            ],
+            "rating": "4.7",
+            "totalReviews": "32",
+            "badges": [{"label": "Envío gratis"}]
+        },
+        {"displayName": "", "prices": []}
+    ]}}
+}
+
+PRELOADED_STATE = {
+    "pageState": {"initialState": {"results": [
+        {"id": "ad", "type": "intervention"},
+        {"polycard": {
+            "metadata": {"id": "MCO1", "url": "articulo.mercadolibre.com.co/MCO-1-iphone"},
+            "pictures": {"pictures": [{"id": "123-MLA456"}]},
+            "components": [
+                {"type": "title", "title": {"text": "iPhone 15 "}},
+                {"type": "price", "price": {
+                    "current_price": {"value": 93916},
+                    "previous_price": {"value": 125222}
+                }},
+                {"type": "reviews", "reviews": {"rating_average": 4.8, "total": 1234}},
+                {"type": "shipping", "shipping": {"text": "Envío gratis"}}
+            ]
+        }}
+    ]}}
+}
+
+VTEX_STATE = {
+    "Product:sp-1": {
+        "productName": "Galletas Saltin",
+        "brand": "Noel",
+        "link": "/galletas-saltin/p",
+        "priceRange": {"type": "id", "id": "$Product:sp-1.priceRange"},
+        "items": [{"type": "id", "id": "Product:sp-1.items.0"}]
+    },
+    "$Product:sp-1.priceRange": {
+        "sellingPrice": {"type": "id", "id": "$Product:sp-1.priceRange.sellingPrice"},
+        "listPrice": {"type": "id", "id": "$Product:sp-1.priceRange.listPrice"}
+    },
+    "$Product:sp-1.priceRange.sellingPrice": {"lowPrice": 8120, "highPrice": 8120},
+    "$Product:sp-1.priceRange.listPrice": {"lowPrice": 10150, "highPrice": 10150},
+    "Product:sp-1.items.0": {"images": [{"type": "id", "id": "Image:1"}]},
+    "Image:1": {"imageUrl": "https://megatiendas.vteximg.com.br/1.jpg"}
+}
+
+
+class TestStructuredData:
+    """Pruebas del mapeo del estado JSON embebido a campos de Product"""
+    
+    def test_falabella_next_data(self):
+        """Prueba precios, insignia de envío y reseñas desde __NEXT_DATA__"""
+        items = falabella_state.parse_state(NEXT_DATA)
+        assert len(items) == 1
+        assert items[0]['price'] == 689900.0
+        assert items[0]['original_price'] == 799900.0
+        assert items[0]['free_shipping'] is True
+        assert items[0]['rating'] == 4.7
+        assert items[0]['reviews_count'] == 32
+    
+    def test_falabella_structured_product_keeps_categories(self):
+        """Prueba que el producto del estado embebido reciba las categorías de la búsqueda"""
+        category_info = {'parent_category': "Tecnología", 'category': "Celulares", 'category2': "Smartphones"}
+        item = falabella_state.parse_state(NEXT_DATA)[0]
+        product = FalabellaProductExtractor(None, "Falabella", "co").build_structured_product(item, category_info)
+        
+        assert (product.parent_category, product.category, product.category2) == ("Tecnología", "Celulares", "Smartphones")
+        assert product.marketplace == "Falabella"
+    
+    def test_mercadolibre_preloaded_state(self):
+        """Prueba que se ignoren intervenciones y se mapeen las polycards"""
+        items = mercadolibre_state.parse_state(PRELOADED_STATE)
+        assert len(items) == 1
+        assert items[0]['title'] == "iPhone 15"
+        assert items[0]['price'] == 93916.0
+        assert items[0]['original_price'] == 125222.0
+        assert items[0]['url'] == "https://articulo.mercadolibre.com.co/MCO-1-iphone"
+        assert items[0]['image_url'] == "https://http2.mlstatic.com/D_Q_NP_123-MLA456-O.webp"
+        assert items[0]['free_shipping'] is True
+    
+    def test_vtex_state(self):
+        """Prueba la resolución de referencias del estado normalizado de VTEX"""
+        items = parse_vtex_state(VTEX_STATE, "https://www.megatiendas.co")
+        assert items == [{
+            'title': "Galletas Saltin",
+            'price': 8120.0,
+            'original_price': 10150.0,
+            'url': "https://www.megatiendas.co/galletas-saltin/p",
+            'image_url': "https://megatiendas.vteximg.com.br/1.jpg",
+            'brand': "Noel",
+        }]
+    
+    def test_extract_from_script(self):
+        """Prueba la lectura de un <script> JSON en un documento descargado"""
+        html = f'<html><body><script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT_DATA)}</script></body></html>'
+        assert extract_embedded_state(html, falabella_state.STATE_SOURCES) == NEXT_DATA
+    
+    def test_extract_from_template(self):
+        """Prueba la lectura del <template> de VTEX"""
+        html = f'<html><body><template data-varname="__STATE__"><script>{json.dumps(VTEX_STATE)}</script></template></body></html>'
+        assert extract_embedded_state(html, VTEX_STATE_SOURCES) == VTEX_STATE
+    
+    def test_missing_state(self):
+        """Prueba que sin estado embebido se retorne None (respaldo al DOM)"""
+        assert extract_embedded_state("<html><body></body></html>", falabella_state.STATE_SOURCES) is None
+        assert falabella_state.parse_state(None) == []
+    
+    def test_helpers(self):
+        """Prueba el acceso seguro y la conversión de precios"""
+        assert dig(NEXT_DATA, 'props', 'pageProps', 'missing', default='x') == 'x'
+        assert to_price(8120) == 8120.0
+        assert to_price("$ 2.299.900") == 2299900.0
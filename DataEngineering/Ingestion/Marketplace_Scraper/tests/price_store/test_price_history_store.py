@@ -0,0 +1,115 @@
+from datetime import datetime
+import pytest
+from models.product import Product
+from utils.exporters import DataExporter
+from utils.price_store import PriceHistoryStore, product_key
+
+ML_URL = "https://articulo.mercadolibre.com.co/MCO-123456789-iphone-15-_JM"
+
+
+def observation(price, day, url=ML_URL, marketplace="MercadoLibre", category="Celulares", **kwargs):
+    return Product(title="iPhone 15", price=price, url=url, marketplace=marketplace, category=category,
+                   scraped_at=datetime(2024, 5, day, 10, 0), **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with PriceHistoryStore(str(tmp_path / "prices.db"), only_changes=True) as store:
+        yield store
+
+
+class TestProductKey:
+    """Pruebas de la llave canónica del producto"""
+    
+    def test_mercadolibre_item_id(self):
+        assert product_key(ML_URL, "MercadoLibre") == "MCO123456789"
+        assert product_key("https://www.mercadolibre.com.co/iphone/p/MCO123456789?pdp_filters=x") == "MCO123456789"
+    
+    def test_falabella_product_id(self):
+        url = "https://www.falabella.com.co/falabella-co/product/72751839/Celular-Samsung/72751839"
+        assert product_key(url, "Falabella") == "72751839"
+    
+    def test_url_without_tracking(self):
+        url = "https://www.megatiendas.co/Galletas-Festival/p?utm_source=x#reviews"
+        assert product_key(url, "Megatiendas") == "www.megatiendas.co/Galletas-Festival/p"
+        assert product_key("", "Megatiendas") is None
+
+
+class TestPriceHistoryStore:
+    """Pruebas del historial de precios en SQLite"""
+    
+    def test_upsert_and_history(self, store):
+        """Prueba la serie de un producto a lo largo de varias corridas"""
+        assert store.upsert([observation(4000000.0, 1)])["new_products"] == 1
+        store.upsert([observation(3800000.0, 2)])
+        store.upsert([observation(3900000.0, 3)])
+        
+        history = store.history(ML_URL + "?tracking_id=abc")
+        assert history["price"].to_list() == [4000000.0, 3800000.0, 3900000.0]
+        assert history["scraped_at"].to_list()[0] == datetime(2024, 5, 1, 10, 0)
+        assert store.stats() == {"products": 1, "observations": 3}
+    
+    def test_only_changes(self, store):
+        """Prueba que una corrida con el mismo precio no agregue observaciones"""
+        store.upsert([observation(4000000.0, 1)])
+        summary = store.upsert([observation(4000000.0, 2)])
+        store.upsert([observation(3500000.0, 3)])
+        
+        assert summary["observations"] == 0
+        assert store.history("MCO123456789")["price"].to_list() == [4000000.0, 3500000.0]
+        
+        latest = store.latest_prices()
+        assert latest["price"].to_list() == [3500000.0]
+        assert latest["last_seen"].to_list() == [datetime(2024, 5, 3, 10, 0)]
+    
+    def test_all_observations(self, tmp_path):
+        with PriceHistoryStore(str(tmp_path / "all.db"), only_changes=False) as store:
+            store.upsert([observation(4000000.0, 1)])
+            store.upsert([observation(4000000.0, 2)])
+            assert store.stats()["observations"] == 2
+    
+    def test_history_range(self, store):
+        for day, price in enumerate([10.0, 11.0, 12.0, 13.0], start=1):
+            store.upsert([observation(price, day)])
+        
+        history = store.history(ML_URL, since=datetime(2024, 5, 2), until=datetime(2024, 5, 3, 23, 59))
+        assert history["price"].to_list() == [11.0, 12.0]
+    
+    def test_older_observation_keeps_latest_price(self, store):
+        """Prueba que una observación atrasada no reemplace el último precio"""
+        store.upsert([observation(20.0, 5)])
+        store.upsert([observation(15.0, 2)])
+        
+        assert store.latest_prices()["price"].to_list() == [20.0]
+        assert store.history(ML_URL)["price"].to_list() == [15.0, 20.0]
+    
+    def test_latest_prices_by_category(self, store):
+        store.upsert([
+            observation(300.0, 1),
+            observation(100.0, 1, url="https://articulo.mercadolibre.com.co/MCO-555555-tv", category="Televisores"),
+            observation(200.0, 1, url="https://www.falabella.com.co/falabella-co/product/999999/tv",
+                        marketplace="Falabella", category="Televisores"),
+            observation(50.0, 1, url="")
+        ])
+        
+        latest = store.latest_prices(category="Televisores")
+        assert latest["item_key"].to_list() == ["MCO555555", "999999"]
+        assert store.latest_prices(category="Televisores", marketplace="Falabella", limit=1).height == 1
+        assert store.stats()["products"] == 3
+    
+    def test_category_index_used(self, store):
+        plan = store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM products WHERE category = ? AND last_price IS NOT NULL", ("x",)
+        ).fetchall()
+        assert "ix_products_category" in str(plan)
+
+
+class TestPriceHistoryExport:
+    def test_exporter_upsert(self, tmp_path):
+        exporter = DataExporter()
+        exporter.output_dir = str(tmp_path)
+        
+        summary = exporter.export_to_price_history([observation(10.0, 1), observation(12.0, 1, url="")])
+        assert summary["new_products"] == 1
+        assert summary["skipped"] == 1
+        assert (tmp_path / "price_history.db").exists()
@@ -0,0 +1,58 @@
+import asyncio
+import time
+from utils.rate_limiter import DomainRateLimiter, TokenBucket
+
+CONFIG = {
+    "min_delay": 0.2,
+    "max_delay": 0.2,
+    "burst": 1,
+    "overrides": {
+        "megatiendas.co": {"min_delay": 0.5, "max_delay": 0.6, "burst": 2}
+    }
+}
+
+
+class TestDomainRateLimiter:
+    """Pruebas del limitador de peticiones por dominio"""
+    
+    def test_first_request_is_free(self):
+        """Prueba que la primera petición a un dominio no espere"""
+        limiter = DomainRateLimiter(CONFIG)
+        assert asyncio.run(limiter.acquire("https://listado.mercadolibre.com.co/iphone")) == 0
+    
+    def test_same_domain_waits(self):
+        """Prueba que peticiones seguidas al mismo dominio respeten el intervalo"""
+        async def run():
+            limiter = DomainRateLimiter(CONFIG)
+            await limiter.acquire("https://www.falabella.com.co/a")
+            return await limiter.acquire("https://www.falabella.com.co/b")
+        
+        assert 0.15 < asyncio.run(run()) <= 0.2
+    
+    def test_domains_do_not_block_each_other(self):
+        """Prueba que la espera de un dominio no retrase a otro"""
+        async def run():
+            limiter = DomainRateLimiter(CONFIG)
+            await limiter.acquire("https://www.falabella.com.co/a")
+            started = time.monotonic()
+            await asyncio.gather(
+                limiter.acquire("https://www.falabella.com.co/b"),
+                limiter.acquire("https://listado.mercadolibre.com.co/c")
+            )
+            return time.monotonic() - started
+        
+        assert asyncio.run(run()) < 0.35
+    
+    def test_domain_override(self):
+        """Prueba que los overrides apliquen por sufijo de dominio"""
+        limiter = DomainRateLimiter(CONFIG)
+        assert limiter.get_domain_config("www.megatiendas.co") == {"min_delay": 0.5, "max_delay": 0.6, "burst": 2}
+        assert limiter.get_domain_config("listado.mercadolibre.com.co")["min_delay"] == 0.2
+    
+    def test_burst(self):
+        """Prueba que el burst permita varias peticiones seguidas sin esperar"""
+        async def run():
+            bucket = TokenBucket(interval=1, burst=2)
+            return [await bucket.acquire() for _ in range(2)]
+        
+        assert asyncio.run(run()) == [0.0, 0.0]
@@ -0,0 +1,47 @@
+import asyncio
+from utils.readiness import ReadinessEngine
+
+
+class GrowingPage:
+    """Página de prueba cuyo conteo de productos crece y luego se estabiliza"""
+    
+    def __init__(self, counts):
+        self.counts = list(counts)
+    
+    async def eval_on_selector_all(self, selector, script):
+        return self.counts.pop(0) if len(self.counts) > 1 else self.counts[0]
+    
+    async def wait_for_selector(self, selector, timeout):
+        raise TimeoutError(f"{selector} no apareció en {timeout} ms")
+
+
+class TestReadinessEngine:
+    """Pruebas de las condiciones de página lista"""
+    
+    def test_count_stable(self):
+        """Prueba que el conteo se considere estable tras lecturas iguales"""
+        engine = ReadinessEngine(
+            [{"condition": "count_stable", "selector": ".pod", "timeout": 2}],
+            poll_interval=0.01, stable_polls=3
+        )
+        assert asyncio.run(engine.wait_until_ready(GrowingPage([0, 12, 24, 48, 48, 48])))
+        assert engine.last_timings[0]['ready'] is True
+    
+    def test_count_never_stable(self):
+        """Prueba que sin productos la condición venza y se registre"""
+        engine = ReadinessEngine(
+            [{"condition": "count_stable", "selector": ".pod", "timeout": 0.05}],
+            poll_interval=0.01
+        )
+        assert asyncio.run(engine.wait_until_ready(GrowingPage([0])))
+        assert engine.last_timings[0]['ready'] is False
+    
+    def test_required_condition(self):
+        """Prueba que una condición requerida vencida detenga la espera"""
+        engine = ReadinessEngine([
+            {"condition": "selector", "selector": ".pod", "timeout": 1, "required": True},
+            {"condition": "count_stable", "selector": ".pod", "timeout": 1}
+        ])
+        assert not asyncio.run(engine.wait_until_ready(GrowingPage([0])))
+        assert len(engine.last_timings) == 1
+        assert len(engine.history) == 1
@@ -0,0 +1,49 @@
+import asyncio
+import json
+import os
+import time
+from utils.session_state import SessionStateStore
+
+
+class FakeContext:
+    """Contexto de prueba que escribe un storage_state como Playwright"""
+    
+    async def storage_state(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"cookies": [{"name": "store", "value": "prado"}], "origins": []}, f)
+
+
+class TestSessionStateStore:
+    """Pruebas del almacenamiento de estado de sesión por perfil"""
+    
+    def test_save_and_load(self, tmp_path):
+        """Prueba que un estado guardado quede disponible para el perfil"""
+        store = SessionStateStore(directory=str(tmp_path / "sessions"), max_age_hours=72)
+        assert store.get_valid_path("megatiendas-bolivar-cartagena") is None
+        
+        path = asyncio.run(store.save(FakeContext(), "megatiendas-bolivar-cartagena"))
+        
+        assert store.get_valid_path("megatiendas-bolivar-cartagena") == path
+        assert store.get_valid_path("mercadolibre-co") is None
+    
+    def test_expired_state(self, tmp_path):
+        """Prueba que un estado más viejo que max_age_hours no se use"""
+        store = SessionStateStore(directory=str(tmp_path), max_age_hours=1)
+        path = asyncio.run(store.save(FakeContext(), "mercadolibre-co"))
+        old = time.time() - 2 * 3600
+        os.utime(path, (old, old))
+        
+        assert store.get_valid_path("mercadolibre-co") is None
+    
+    def test_invalidate(self, tmp_path):
+        """Prueba que invalidar elimine el estado guardado"""
+        store = SessionStateStore(directory=str(tmp_path))
+        asyncio.run(store.save(FakeContext(), "mercadolibre-co"))
+        store.invalidate("mercadolibre-co")
+        
+        assert store.get_valid_path("mercadolibre-co") is None
+    
+    def test_profile_filename(self, tmp_path):
+        """Prueba que el nombre del perfil se normalice a un nombre de archivo seguro"""
+        store = SessionStateStore(directory=str(tmp_path))
+        assert store.path_for("MercadoLibre / CO") == os.path.join(str(tmp_path), "mercadolibre-co.json")
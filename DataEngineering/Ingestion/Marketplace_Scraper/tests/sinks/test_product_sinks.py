@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+import polars as pl
+import pytest
+from models.product import Product
+from utils.sinks import JsonlSink, CsvSink, ParquetSink
+
+SCRAPED_AT = datetime(2024, 5, 1, 10, 30)
+
+
+def page(start, count, marketplace="MercadoLibre"):
+    return [
+        Product(title=f"Producto {index}", price=float(index), currency="COP", url=f"https://a.co/{index}",
+                marketplace=marketplace, scraped_at=SCRAPED_AT)
+        for index in range(start, start + count)
+    ]
+
+
+class TestProductSinks:
+    """Pruebas de los destinos de streaming"""
+    
+    def test_jsonl_written_per_page(self, tmp_path):
+        """Prueba que cada página quede en disco apenas se escribe, antes de cerrar"""
+        path = str(tmp_path / "products.jsonl")
+        sink = JsonlSink(path)
+        sink.write(page(0, 2))
+        
+        lines = open(path, encoding="utf-8").read().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["Producto 0", "Producto 1"]
+        
+        sink.write(page(2, 1))
+        sink.close()
+        assert len(open(path, encoding="utf-8").read().splitlines()) == 3
+        assert json.loads(lines[0])["scraped_at"] == "2024-05-01T10:30:00"
+    
+    def test_csv_header_once(self, tmp_path):
+        """Prueba que el CSV en append escriba el encabezado una sola vez"""
+        path = str(tmp_path / "products.csv")
+        with CsvSink(path) as sink:
+            sink.write(page(0, 2), extra={"query": "celular"})
+            sink.write(page(2, 2), extra={"query": "celular"})
+        
+        frame = pl.read_csv(path)
+        assert frame.height == 4
+        assert frame.columns[:2] == ["query", "title"]
+    
+    def test_dedup_across_pages(self, tmp_path):
+        """Prueba que un (marketplace, url) ya escrito se descarte en páginas siguientes"""
+        sink = JsonlSink(str(tmp_path / "products.jsonl"), dedup=True)
+        assert sink.write(page(0, 3)) == 3
+        assert sink.write(page(2, 2)) == 1
+        assert sink.write(page(2, 2, marketplace="Falabella")) == 2
+        sink.close()
+        
+        assert sink.rows_written == 6
+        assert sink.duplicates == 1
+        assert sink.counts == {"MercadoLibre": 4, "Falabella": 2}
+    
+    def test_parquet_parts(self, tmp_path):
+        """Prueba que el Parquet se escriba en partes completas y tipadas"""
+        path = str(tmp_path / "products.parquet")
+        sink = ParquetSink(path, rows_per_part=3)
+        sink.write(page(0, 2))
+        assert os.listdir(path) == []
+        
+        sink.write(page(2, 2))
+        assert os.listdir(path) == ["part-00000.parquet"]
+        
+        sink.write(page(4, 1))
+        sink.close()
+        
+        frame = pl.read_parquet(os.path.join(path, "*.parquet"))
+        assert frame.height == 5
+        assert frame.schema["price"] == pl.Float64
+        assert frame.schema["scraped_at"] == pl.Datetime("us")
+        assert sorted(os.listdir(path)) == ["part-00000.parquet", "part-00001.parquet"]
+    
+    def test_write_after_close_fails(self, tmp_path):
+        sink = JsonlSink(str(tmp_path / "products.jsonl"))
+        sink.close()
+        with pytest.raises(ValueError):
+            sink.write(page(0, 1))
+
+
+class TestScraperStreaming:
+    """Pruebas de BaseScraper escribiendo cada página en el destino"""
+    
+    def test_pages_streamed_without_accumulating(self, tmp_path):
+        pytest.importorskip("playwright")
+        from scrapers.base_scraper import BaseScraper
+        from utils.rate_limiter import DomainRateLimiter
+        
+        class StreamingScraper(BaseScraper):
+            def __init__(self):
+                super().__init__(rate_limiter=DomainRateLimiter({"min_delay": 0, "max_delay": 0, "burst": 1}))
+                self.marketplace_name = "Stream"
+                self.lines_at_fetch = []
+            
+            async def build_search_url(self, query, **kwargs):
+                return f"https://stream.test/{query}?page={kwargs['page']}"
+            
+            async def fetch_page_products(self, url):
+                # Lo escrito hasta ahora: las páginas anteriores ya deben estar en disco
+                self.lines_at_fetch.append(len(open(path, encoding="utf-8").read().splitlines()))
+                page_num = int(url.rsplit("=", 1)[1])
+                return page((page_num - 1) * 2, 2)
+            
+            async def extract_product_info(self, element):
+                return None
+            
+            async def get_product_elements(self):
+                return []
+            
+            async def post_navigate_validation(self):
+                return True
+        
+        path = str(tmp_path / "products.jsonl")
+        open(path, "w").close()
+        
+        scraper = StreamingScraper()
+        scraper.sink = JsonlSink(path)
+        scraper.keep_results = False
+        products = asyncio.run(scraper.search_products("celular", max_pages=3))
+        scraper.sink.close()
+        
+        assert products == []
+        assert scraper.products_count == 6
+        assert scraper.lines_at_fetch == [0, 2, 4]
+        assert len(open(path, encoding="utf-8").read().splitlines()) == 6
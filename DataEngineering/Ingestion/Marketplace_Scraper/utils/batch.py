@@ -0,0 +1,92 @@
+import csv
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+_MARKETPLACE_SEPARATORS = re.compile(r'[\s,;|]+')
+
+
+@dataclass
+class BatchQuery:
+    """Una búsqueda del modo por lotes"""
+    query: str
+    marketplaces: List[str] = field(default_factory=lambda: ['mercadolibre'])
+    pages: int = 1
+    country: str = "co"
+
+
+def parse_marketplaces(value: Any, default: List[str]) -> List[str]:
+    """Acepta una lista o un texto separado por espacios, comas, ';' o '|'"""
+    if not value:
+        return list(default)
+    
+    if isinstance(value, str):
+        value = _MARKETPLACE_SEPARATORS.split(value.strip())
+    
+    return [marketplace.strip().lower() for marketplace in value if marketplace and marketplace.strip()]
+
+
+def build_query(record: Dict[str, Any], defaults: BatchQuery) -> Optional[BatchQuery]:
+    """Crea un BatchQuery desde un registro de CSV/JSONL, completando con los valores por defecto"""
+    query = str(record.get('query') or '').strip()
+    if not query:
+        return None
+    
+    return BatchQuery(
+        query        = query,
+        marketplaces = parse_marketplaces(record.get('marketplaces') or record.get('marketplace'), defaults.marketplaces),
+        pages        = int(record.get('pages') or defaults.pages),
+        country      = str(record.get('country') or defaults.country).strip()
+    )
+
+
+def load_queries(path: str, defaults: Optional[BatchQuery] = None) -> List[BatchQuery]:
+    """
+    Lee las búsquedas de un archivo de lote.
+    
+    Formatos según la extensión:
+    - .txt: una query por línea (las líneas que empiezan con # se ignoran)
+    - .csv: columnas query, marketplaces, pages, country (solo query es obligatoria)
+    - .jsonl: un objeto por línea con las mismas claves
+    """
+    defaults = defaults or BatchQuery(query='')
+    extension = os.path.splitext(path)[1].lower()
+    queries = []
+    
+    with open(path, encoding='utf-8', newline='') as batch_file:
+        if extension == '.csv':
+            records = csv.DictReader(batch_file)
+        elif extension in ('.jsonl', '.ndjson'):
+            records = _read_jsonl(batch_file)
+        else:
+            records = (
+                {'query': line} for line in batch_file
+                if line.strip() and not line.lstrip().startswith('#')
+            )
+        
+        for line_number, record in enumerate(records, 1):
+            try:
+                batch_query = build_query(record, defaults)
+            except (AttributeError, TypeError, ValueError) as e:
+                print(f"⚠️ Registro {line_number} inválido en {path}: {e}")
+                continue
+            
+            if batch_query:
+                queries.append(batch_query)
+    
+    print(f"📋 {len(queries)} búsquedas cargadas desde {path}")
+    return queries
+
+
+def _read_jsonl(batch_file):
+    """Genera un dict por línea JSON no vacía (las líneas inválidas se reportan y se saltan)"""
+    for line_number, line in enumerate(batch_file, 1):
+        if not line.strip():
+            continue
+        
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            print(f"⚠️ Línea {line_number} no es JSON válido: {e}")
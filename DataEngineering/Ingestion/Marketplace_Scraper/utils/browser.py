@@ -1,21 +1,492 @@
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
-from typing import Optional, Dict, Any
+from typing import Optional, Callable, Dict, Any, List
+from urllib.parse import urlparse
+from dataclasses import dataclass
 import asyncio
 import random
 from config.settings import Settings
+from utils.session_state import SessionStateStore
+from utils.response_cache import ResponseCache
+from utils.har import HarArchive
+
+
+# Scroll adaptativo en una sola evaluación: salta de a una pantalla, espera (con un
+# MutationObserver) a que crezca el número de tarjetas y termina cuando el conteo se
+# mantiene estable en el fondo de la página durante stableWindowMs.
+ADAPTIVE_SCROLL_SCRIPT = """
+async ({ selector, stepRatio, settleMs, stableWindowMs, maxSteps, maxMs }) => {
+    const count = () => selector
+        ? document.querySelectorAll(selector).length
+        : document.body.scrollHeight;
+    
+    const waitForGrowth = (previous, timeout) => new Promise((resolve) => {
+        if (count() !== previous) return resolve();
+        let timer = null;
+        const observer = new MutationObserver(() => {
+            if (count() !== previous) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve();
+            }
+        });
+        observer.observe(document.body, { childList: true, subtree: true });
+        timer = setTimeout(() => {
+            observer.disconnect();
+            resolve();
+        }, timeout);
+    });
+    
+    const started = performance.now();
+    const initial = count();
+    const steps = [];
+    let cards = initial;
+    let lastChange = started;
+    
+    for (let step = 0; step < maxSteps && performance.now() - started < maxMs; step++) {
+        const atBottom = window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;
+        window.scrollBy(0, Math.max(window.innerHeight * stepRatio, 100));
+        await waitForGrowth(cards, settleMs);
+        
+        const current = count();
+        steps.push(current - cards);
+        
+        if (current !== cards) {
+            cards = current;
+            lastChange = performance.now();
+        } else if (atBottom && performance.now() - lastChange >= stableWindowMs) {
+            break;
+        }
+    }
+    
+    return {
+        initial: initial,
+        cards: cards,
+        steps: steps,
+        elapsed_ms: Math.round(performance.now() - started)
+    };
+}
+"""
+
+
+def build_context_config(mobile: bool, browser_config: Dict[str, Any],
+                         storage_state: Optional[str] = None) -> Dict[str, Any]:
+    """Construye la configuración del contexto (user agent, viewport, mobile, sesión guardada)"""
+    # Seleccionar user agent según el modo
+    user_agents = Settings.get_user_agents(mobile)
+    user_agent = random.choice(user_agents)
+    
+    # Configurar contexto con parámetros móviles si es necesario
+    context_config = {
+        "user_agent": user_agent,
+        "viewport": browser_config['viewport']
+    }
+    
+    # Añadir configuraciones específicas para mobile
+    if mobile:
+        context_config["is_mobile"] = browser_config.get('is_mobile', True)
+        context_config["has_touch"] = browser_config.get('has_touch', True)
+    
+    # Cookies y localStorage de una sesión anterior
+    if storage_state:
+        context_config["storage_state"] = storage_state
+    
+    return context_config
+
+
+class ResourcePolicy:
+    """
+    Política de bloqueo de recursos basada en page.route.
+    
+    Bloquea por tipo de recurso (image, font, media, ...) y por dominio (trackers),
+    con una lista de dominios permitidos que tiene prioridad. Lleva la cuenta de las
+    peticiones bloqueadas y de los bytes descargados/ahorrados por página.
+    """
+    
+    def __init__(self, block_types=(), block_domains=(), allow_domains=(),
+                 estimated_bytes: Optional[Dict[str, int]] = None):
+        self.block_types = set(block_types)
+        self.block_domains = list(block_domains)
+        self.allow_domains = list(allow_domains)
+        self.estimated_bytes = estimated_bytes or {}
+        self.page_stats = self._empty_stats()
+        self.total_stats = self._empty_stats()
+    
+    @classmethod
+    def for_marketplace(cls, marketplace: str) -> Optional['ResourcePolicy']:
+        """Crea la política del perfil del marketplace (None si el bloqueo está desactivado)"""
+        config = Settings.RESOURCE_POLICY_CONFIG
+        if not config['enabled']:
+            return None
+        
+        profile = {**config['default'], **config['marketplaces'].get(marketplace, {})}
+        return cls(
+            block_types=profile['block_types'],
+            block_domains=list(profile['block_domains']) + list(profile.get('extra_block_domains', [])),
+            allow_domains=profile['allow_domains'],
+            estimated_bytes=config['estimated_bytes']
+        )
+    
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {'allowed': 0, 'blocked': 0, 'bytes_loaded': 0, 'bytes_saved': 0, 'blocked_by_type': {}}
+    
+    @staticmethod
+    def _matches(host: str, domains: List[str]) -> bool:
+        """Coincidencia por dominio exacto o subdominio"""
+        return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+    
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Indica si la petición se debe abortar"""
+        host = urlparse(url).hostname or ''
+        
+        if self._matches(host, self.allow_domains):
+            return False
+        
+        return resource_type in self.block_types or self._matches(host, self.block_domains)
+    
+    async def handle_route(self, route):
+        """Handler de page.route: aborta o deja pasar cada petición"""
+        request = route.request
+        
+        if self.should_block(request.resource_type, request.url):
+            self.page_stats['blocked'] += 1
+            by_type = self.page_stats['blocked_by_type']
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            self.page_stats['bytes_saved'] += self.estimated_bytes.get(
+                request.resource_type, self.estimated_bytes.get('other', 0)
+            )
+            await route.abort()
+        else:
+            self.page_stats['allowed'] += 1
+            # fallback (y no continue_) deja actuar a las rutas del contexto, ej: reproducción HAR
+            await route.fallback()
+    
+    def record_response(self, response):
+        """Suma los bytes descargados según Content-Length (cuando el servidor lo envía)"""
+        try:
+            self.page_stats['bytes_loaded'] += int(response.headers.get('content-length', 0))
+        except (TypeError, ValueError):
+            pass
+    
+    async def attach(self, page):
+        """Activa la política en una página"""
+        await page.route("**/*", self.handle_route)
+        page.on("response", self.record_response)
+    
+    async def detach(self, page):
+        """Desactiva la política (antes de devolver la página al pool)"""
+        try:
+            page.remove_listener("response", self.record_response)
+            await page.unroute("**/*", self.handle_route)
+        except Exception:
+            pass
+    
+    def take_page_stats(self) -> Dict[str, Any]:
+        """Retorna las estadísticas de la página actual, las acumula y las reinicia"""
+        stats, self.page_stats = self.page_stats, self._empty_stats()
+        
+        for key in ('allowed', 'blocked', 'bytes_loaded', 'bytes_saved'):
+            self.total_stats[key] += stats[key]
+        for resource_type, count in stats['blocked_by_type'].items():
+            by_type = self.total_stats['blocked_by_type']
+            by_type[resource_type] = by_type.get(resource_type, 0) + count
+        
+        return stats
+    
+    def report_page(self):
+        """Imprime el ahorro de la página actual (si hubo peticiones)"""
+        stats = self.take_page_stats()
+        if not stats['allowed'] and not stats['blocked']:
+            return
+        
+        by_type = ", ".join(f"{resource_type}: {count}" for resource_type, count in stats['blocked_by_type'].items())
+        print(f"🧹 Recursos: {stats['blocked']} bloqueados ({by_type or '-'}), {stats['allowed']} permitidos | "
+              f"{stats['bytes_loaded'] / 1024:.0f} KB descargados, ≈{stats['bytes_saved'] / 1024:.0f} KB ahorrados")
+
+
+@dataclass
+class _BrowserSlot:
+    """Proceso Chromium administrado por el pool"""
+    browser: Browser
+    open_contexts: int = 0
+    pages_served: int = 0
+    retired: bool = False
+    
+    def has_room(self, max_contexts: int) -> bool:
+        """Indica si el navegador puede abrir un contexto más"""
+        return (not self.retired 
+                and self.browser.is_connected() 
+                and self.open_contexts < max_contexts)
+
+
+@dataclass
+class BrowserLease:
+    """Contexto y página prestados por el pool a un scraper"""
+    slot: _BrowserSlot
+    context: BrowserContext
+    page: Page
+    mobile: bool
+    pages_served: int = 0
+    profile: Optional[str] = None
+
+
+class BrowserPool:
+    """
+    Pool de larga vida con uno o pocos procesos Chromium.
+    
+    Presta contextos/páginas pre-calentados a los scrapers para que el costo de
+    lanzar el navegador se pague una vez por worker y no una vez por búsqueda.
+    Los contextos se reciclan tras N navegaciones y los navegadores tras M.
+    """
+    
+    def __init__(self, headless: Optional[bool] = None, har_archive: Optional[HarArchive] = None, **overrides):
+        config = {**Settings.BROWSER_POOL_CONFIG, **overrides}
+        self.max_browsers = config['max_browsers']
+        self.max_contexts_per_browser = config['max_contexts_per_browser']
+        self.max_pages_per_context = config['max_pages_per_context']
+        self.max_pages_per_browser = config['max_pages_per_browser']
+        self.prewarm_contexts = config['prewarm_contexts']
+        self.health_check_timeout = config['health_check_timeout']
+        self.headless = Settings.BROWSER_CONFIG['headless'] if headless is None else headless
+        
+        # Grabación / reproducción HAR aplicada a cada contexto nuevo
+        self.har_archive = har_archive
+        
+        self.playwright = None
+        self._slots: List[_BrowserSlot] = []
+        # Contextos ociosos por (mobile, perfil de sesión)
+        self._idle: Dict[tuple, List[BrowserLease]] = {}
+        self._lock = asyncio.Lock()
+        self._capacity = asyncio.Semaphore(self.max_browsers * self.max_contexts_per_browser)
+        self._started = False
+    
+    async def start(self) -> 'BrowserPool':
+        """Inicia Playwright y pre-calienta contextos desktop"""
+        async with self._lock:
+            if self._started:
+                return self
+            
+            self.playwright = await async_playwright().start()
+            self._started = True
+            
+            for _ in range(self.prewarm_contexts):
+                self._idle.setdefault((False, None), []).append(await self._create_lease(mobile=False))
+            
+            print(f"🧰 Pool de navegadores iniciado ({self.prewarm_contexts} contextos pre-calentados)")
+        return self
+    
+    async def acquire(self, mobile: bool = False, profile: Optional[str] = None,
+                      storage_state: Optional[str] = None) -> BrowserLease:
+        """
+        Presta un contexto/página, reutilizando uno ocioso si está sano.
+        
+        Los contextos con perfil de sesión solo se reutilizan para el mismo perfil;
+        los nuevos se crean con el storage_state guardado, si lo hay.
+        """
+        await self.start()
+        await self._capacity.acquire()
+        
+        try:
+            while True:
+                async with self._lock:
+                    idle = self._idle.get((mobile, profile))
+                    lease = idle.pop() if idle else None
+                    if lease is None:
+                        return await self._create_lease(mobile, profile, storage_state)
+                
+                if not lease.slot.retired and await self._is_healthy(lease):
+                    return lease
+                
+                async with self._lock:
+                    await self._discard(lease)
+        except Exception:
+            self._capacity.release()
+            raise
+    
+    async def release(self, lease: BrowserLease):
+        """
+        Devuelve un préstamo al pool, reciclándolo si ya cumplió su ciclo.
+        
+        Los contextos sin perfil de sesión se comparten entre marketplaces, así que
+        se devuelven sin cookies ni permisos del sitio que los usó.
+        """
+        try:
+            recycle = (lease.pages_served >= self.max_pages_per_context 
+                       or lease.slot.retired 
+                       or not await self._is_healthy(lease))
+            
+            if not recycle and lease.profile is None:
+                recycle = not await self._clear_session(lease)
+            
+            async with self._lock:
+                if recycle or not self._started:
+                    await self._discard(lease)
+                else:
+                    self._idle.setdefault((lease.mobile, lease.profile), []).append(lease)
+        finally:
+            self._capacity.release()
+    
+    def record_navigation(self, lease: BrowserLease):
+        """Contabiliza una navegación para las políticas de reciclaje"""
+        lease.pages_served += 1
+        lease.slot.pages_served += 1
+        
+        if lease.slot.pages_served >= self.max_pages_per_browser:
+            lease.slot.retired = True
+    
+    async def close(self):
+        """Cierra todos los contextos, navegadores y Playwright"""
+        async with self._lock:
+            try:
+                for idle in self._idle.values():
+                    while idle:
+                        await self._discard(idle.pop())
+                
+                for slot in self._slots:
+                    await slot.browser.close()
+                self._slots = []
+                
+                if self.playwright:
+                    await self.playwright.stop()
+            except Exception as e:
+                print(f"Error cerrando pool de navegadores: {e}")
+            finally:
+                self.playwright = None
+                self._started = False
+    
+    async def _create_lease(self, mobile: bool, profile: Optional[str] = None,
+                            storage_state: Optional[str] = None) -> BrowserLease:
+        """Crea un contexto y página nuevos en un navegador con espacio"""
+        slot = await self._get_slot()
+        browser_config = Settings.get_browser_config(mobile)
+        
+        context = await slot.browser.new_context(**build_context_config(mobile, browser_config, storage_state))
+        slot.open_contexts += 1
+        
+        if self.har_archive:
+            await self.har_archive.attach(context, "mobile" if mobile else "desktop")
+        
+        page = await context.new_page()
+        page.set_default_timeout(browser_config['timeout'])
+        
+        return BrowserLease(slot=slot, context=context, page=page, mobile=mobile, profile=profile)
+    
+    async def _get_slot(self) -> _BrowserSlot:
+        """Retorna un navegador con espacio, lanzando uno nuevo si es necesario"""
+        for slot in self._slots:
+            if slot.has_room(self.max_contexts_per_browser):
+                return slot
+        
+        # Descartar navegadores caídos; los retirados no cuentan contra el límite
+        self._slots = [slot for slot in self._slots if slot.browser.is_connected()]
+        active_slots = [slot for slot in self._slots if not slot.retired]
+        
+        if len(active_slots) < self.max_browsers:
+            browser = await self.playwright.chromium.launch(headless=self.headless)
+            slot = _BrowserSlot(browser=browser)
+            self._slots.append(slot)
+            print(f"🚀 Chromium lanzado en el pool ({len(active_slots) + 1}/{self.max_browsers})")
+            return slot
+        
+        # Liberar un contexto ocioso para hacer espacio
+        for idle in self._idle.values():
+            if idle:
+                await self._discard(idle.pop(0))
+                return await self._get_slot()
+        
+        raise RuntimeError("Pool de navegadores sin capacidad disponible")
+    
+    async def _is_healthy(self, lease: BrowserLease) -> bool:
+        """Chequea que el navegador, el contexto y la página sigan respondiendo"""
+        try:
+            if not lease.slot.browser.is_connected() or lease.page.is_closed():
+                return False
+            
+            await asyncio.wait_for(
+                lease.page.evaluate("() => document.readyState"),
+                timeout=self.health_check_timeout
+            )
+            return True
+        except Exception:
+            return False
+    
+    async def _clear_session(self, lease: BrowserLease) -> bool:
+        """Borra las cookies y permisos del contexto; False si no se pudo limpiar"""
+        try:
+            await lease.context.clear_cookies()
+            await lease.context.clear_permissions()
+            return True
+        except Exception:
+            return False
+    
+    async def _discard(self, lease: BrowserLease):
+        """Cierra el contexto de un préstamo y retira el navegador si quedó vacío"""
+        slot = lease.slot
+        
+        try:
+            await lease.context.close()
+        except Exception:
+            pass
+        
+        slot.open_contexts = max(0, slot.open_contexts - 1)
+        
+        if slot.retired and slot.open_contexts == 0 and slot in self._slots:
+            self._slots.remove(slot)
+            try:
+                await slot.browser.close()
+                print("♻️ Chromium reciclado por el pool")
+            except Exception:
+                pass
+
 
 class BrowserManager:
     """Wrapper para manejar Playwright de forma sencilla"""
     
-    def __init__(self, mobile: bool = False):
+    def __init__(self, mobile: bool = False, pool: Optional[BrowserPool] = None,
+                 session_profile: Optional[str] = None, response_cache: Optional[ResponseCache] = None,
+                 har_archive: Optional[HarArchive] = None, cache_validator: Optional[Callable[[str], bool]] = None):
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.mobile = mobile
+        self.pool = pool
+        self.lease: Optional[BrowserLease] = None
+        
+        # Política de bloqueo de recursos activa en la página
+        self.resource_policy: Optional[ResourcePolicy] = None
+        
+        # Grabación / reproducción HAR (la del pool, si se usa uno)
+        self.har_archive = har_archive or (pool.har_archive if pool else None)
+        
+        # Perfil de sesión persistido (marketplace + ubicación) y si el contexto ya la trae.
+        # Con HAR no se usa: los popups deben resolverse igual al grabar y al reproducir.
+        session_enabled = Settings.SESSION_STATE_CONFIG['enabled'] and not self.har_archive
+        self.session_profile = session_profile if session_enabled else None
+        self.session_store = SessionStateStore()
+        self.session_loaded = False
+        
+        # Caché de documentos en disco, por perfil de dispositivo. Solo guarda las páginas
+        # que aprueba cache_validator (el chequeo de listado del scraper).
+        self.response_cache = response_cache
+        self.cache_validator = cache_validator
+        self._cache_handler = None
     
-    async def start(self, **kwargs):
-        """Inicia el navegador"""
+    async def start(self, resource_policy: Optional[ResourcePolicy] = None, **kwargs):
+        """Inicia el navegador (o toma un contexto prestado del pool)"""
+        storage_state = self.session_store.get_valid_path(self.session_profile) if self.session_profile else None
+        
+        if self.pool:
+            self.lease = await self.pool.acquire(self.mobile, self.session_profile, storage_state)
+            self.context = self.lease.context
+            self.page = self.lease.page
+            # Un contexto reutilizado del mismo perfil ya resolvió el popup antes
+            # (los contextos sin perfil vuelven al pool sin cookies)
+            self.session_loaded = bool(storage_state) or (bool(self.lease.profile) and self.lease.pages_served > 0)
+            await self._attach_resource_policy(resource_policy)
+            await self._attach_response_cache()
+            return self.page
+        
         self.playwright = await async_playwright().start()
         
         # Obtener configuración según el modo (desktop o mobile)
@@ -26,22 +497,13 @@ class BrowserManager:
             headless=browser_config['headless']
         )
         
-        # Seleccionar user agent según el modo
-        user_agents = Settings.get_user_agents(self.mobile)
-        user_agent = random.choice(user_agents)
-        
-        # Configurar contexto con parámetros móviles si es necesario
-        context_config = {
-            "user_agent": user_agent,
-            "viewport": browser_config['viewport']
-        }
-        
-        # Añadir configuraciones específicas para mobile
-        if self.mobile:
-            context_config["is_mobile"] = browser_config.get('is_mobile', True)
-            context_config["has_touch"] = browser_config.get('has_touch', True)
+        self.context = await self.browser.new_context(
+            **build_context_config(self.mobile, browser_config, storage_state)
+        )
+        self.session_loaded = bool(storage_state)
         
-        self.context = await self.browser.new_context(**context_config)
+        if self.har_archive:
+            await self.har_archive.attach(self.context, "mobile" if self.mobile else "desktop")
         
         # Crear página
         self.page = await self.context.new_page()
@@ -49,11 +511,57 @@ class BrowserManager:
         # Configurar timeouts
         self.page.set_default_timeout(browser_config['timeout'])
         
+        await self._attach_resource_policy(resource_policy)
+        await self._attach_response_cache()
         return self.page
     
+    async def _attach_resource_policy(self, resource_policy: Optional[ResourcePolicy]):
+        """Activa el bloqueo de recursos en la página"""
+        if resource_policy:
+            self.resource_policy = resource_policy
+            await resource_policy.attach(self.page)
+    
+    async def _attach_response_cache(self):
+        """
+        Sirve los documentos desde la caché en disco.
+        
+        Se registra después de la política de recursos para que Playwright lo ejecute
+        primero; lo que no es un documento sigue hacia la política con fallback().
+        """
+        if not self.response_cache:
+            return
+        
+        profile = "mobile" if self.mobile else "desktop"
+        
+        async def handler(route):
+            await self.response_cache.handle_route(route, profile, self.cache_validator)
+        
+        self._cache_handler = handler
+        await self.page.route("**/*", handler)
+    
+    def is_cached(self, url: str) -> bool:
+        """Indica si la URL se servirá desde la caché (no hace falta esperar turno del dominio)"""
+        return (bool(self.response_cache) and self.cache_validator is not None
+                and self.response_cache.contains(url, "mobile" if self.mobile else "desktop"))
+    
+    async def save_session(self):
+        """Guarda cookies + localStorage del contexto actual en el perfil de sesión"""
+        if not self.session_profile or not self.context:
+            return
+        
+        await self.session_store.save(self.context, self.session_profile)
+        self.session_loaded = True
+    
     async def goto(self, url: str, **kwargs) -> bool:
         """Navega a una URL"""
+        # Reporte de recursos de la página anterior
+        if self.resource_policy:
+            self.resource_policy.report_page()
+        
         try:
+            if self.lease:
+                self.pool.record_navigation(self.lease)
+            
             response = await self.page.goto(url, **kwargs)
             return response.status < 400
         except Exception as e:
@@ -98,33 +606,57 @@ class BrowserManager:
         except Exception:
             return []
     
-    async def scroll_to_bottom(self, delay: float = 1):
-        """Hace scroll hasta abajo de la página"""
+    async def scroll_to_bottom(self, card_selector: Optional[str] = None, **overrides) -> Optional[Dict[str, Any]]:
+        """
+        Hace scroll hasta que no aparezcan más tarjetas (scroll infinito / lazy loading).
+        
+        Con card_selector se vigila el número de tarjetas; sin él, el alto de la página.
+        Retorna el conteo inicial y final y cuántas tarjetas nuevas produjo cada paso.
+        """
+        config = {**Settings.SCROLL_CONFIG, **overrides}
+        
         try:
-            await self.page.evaluate("""
-                () => {
-                    return new Promise((resolve) => {
-                        let totalHeight = 0;
-                        let distance = 100;
-                        let timer = setInterval(() => {
-                            let scrollHeight = document.body.scrollHeight;
-                            window.scrollBy(0, distance);
-                            totalHeight += distance;
-                            
-                            if(totalHeight >= scrollHeight){
-                                clearInterval(timer);
-                                resolve();
-                            }
-                        }, 100);
-                    });
-                }
-            """)
-            await asyncio.sleep(delay)
+            result = await self.page.evaluate(ADAPTIVE_SCROLL_SCRIPT, {
+                'selector': card_selector,
+                'stepRatio': config['step_ratio'],
+                'settleMs': config['settle_ms'],
+                'stableWindowMs': config['stable_window_ms'],
+                'maxSteps': config['max_steps'],
+                'maxMs': config['max_ms']
+            })
         except Exception as e:
             print(f"Error en scroll: {e}")
+            return None
+        
+        if card_selector:
+            print(f"🖱️ Scroll: {len(result['steps'])} pasos, {result['initial']} → {result['cards']} tarjetas "
+                  f"en {result['elapsed_ms'] / 1000:.1f}s")
+        
+        return result
     
     async def close(self):
-        """Cierra el navegador"""
+        """Cierra el navegador (o devuelve el contexto al pool)"""
+        if self.resource_policy:
+            self.resource_policy.report_page()
+            if self.page:
+                await self.resource_policy.detach(self.page)
+            self.resource_policy = None
+        
+        if self._cache_handler:
+            try:
+                if self.page:
+                    await self.page.unroute("**/*", self._cache_handler)
+            except Exception:
+                pass
+            self._cache_handler = None
+        
+        if self.lease:
+            lease, self.lease = self.lease, None
+            self.context = None
+            self.page = None
+            await self.pool.release(lease)
+            return
+        
         try:
             if self.page:
                 await self.page.close()
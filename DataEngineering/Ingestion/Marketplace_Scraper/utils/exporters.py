@@ -1,9 +1,10 @@
-import csv
-import json
 import os
-from typing import List, Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
-from models.product import Product
+from models.product_batch import ProductsLike, as_batch
+from utils.parquet_dataset import ParquetDataset, parquet_options
+from utils.json_writer import JsonEncoder, write_json_document, write_json_lines
+from utils.price_store import PriceHistoryStore
 from config.settings import Settings
 
 class DataExporter:
@@ -12,8 +13,8 @@ class DataExporter:
     def __init__(self):
         self.output_dir = Settings.get_output_dir()
     
-    def export_to_csv(self, products: List[Product], filename: str = None) -> str:
-        """Exporta productos a CSV"""
+    def export_to_csv(self, products: ProductsLike, filename: str = None) -> str:
+        """Exporta productos a CSV (escritura columnar desde el ProductBatch)"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"products_{timestamp}.csv"
@@ -24,59 +25,151 @@ class DataExporter:
             print("No hay productos para exportar")
             return filepath
         
-        # Obtener todas las claves posibles
-        fieldnames = list(products[0].to_dict().keys())
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(
-                csvfile, 
-                fieldnames=fieldnames,
-                delimiter=Settings.EXPORT_CONFIG['csv_delimiter']
-            )
-            
-            writer.writeheader()
-            for product in products:
-                writer.writerow(product.to_dict())
+        batch = as_batch(products)
+        batch.export_frame(csv=True).write_csv(filepath, separator=Settings.EXPORT_CONFIG['csv_delimiter'])
         
         print(f"Exportado CSV: {filepath} ({len(products)} productos)")
         return filepath
     
-    def export_to_json(self, products: List[Product], filename: str = None) -> str:
-        """Exporta productos a JSON"""
+    def export_to_json(self, products: ProductsLike, filename: str = None, compact: bool = False,
+                       backend: Optional[str] = None) -> str:
+        """
+        Exporta productos a JSON codificando por bloques (sin armar el documento en memoria).
+        
+        `compact` escribe sin indentación ni espacios; `backend` elige orjson o json
+        (por defecto EXPORT_CONFIG['json_backend']: orjson si está instalado).
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"products_{timestamp}.json"
         
         filepath = os.path.join(self.output_dir, filename)
         
-        data = {
-            'products': [product.to_dict() for product in products],
-            'total_count': len(products),
+        batch = as_batch(products)
+        encoder = JsonEncoder(
+            backend or Settings.EXPORT_CONFIG['json_backend'],
+            indent=None if compact else Settings.EXPORT_CONFIG['json_indent']
+        )
+        fields = {
+            'total_count': len(batch),
             'exported_at': datetime.now().isoformat(),
-            'marketplaces': list(set(p.marketplace for p in products))
+            'marketplaces': batch.marketplaces()
         }
         
         with open(filepath, 'w', encoding='utf-8') as jsonfile:
-            json.dump(
-                data, 
-                jsonfile, 
-                indent=Settings.EXPORT_CONFIG['json_indent'],
-                ensure_ascii=False
-            )
+            write_json_document(jsonfile, batch.export_frame(), fields, encoder=encoder)
         
         print(f"Exportado JSON: {filepath} ({len(products)} productos)")
         return filepath
     
-    def export_by_marketplace(self, products: List[Product], format: str = 'csv'):
+    def export_to_jsonl(self, products: ProductsLike, filename: str = None, backend: Optional[str] = None) -> str:
+        """Exporta productos a JSON Lines (un producto por línea), escritos por bloques"""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"products_{timestamp}.jsonl"
+        
+        filepath = os.path.join(self.output_dir, filename)
+        
+        with open(filepath, 'w', encoding='utf-8') as jsonlfile:
+            write_json_lines(jsonlfile, as_batch(products).export_frame(), backend or 'auto')
+        
+        print(f"Exportado JSON Lines: {filepath} ({len(products)} productos)")
+        return filepath
+    
+    def export_to_parquet(self, products: ProductsLike, filename: str = None) -> str:
+        """Exporta productos a un archivo Parquet con columnas tipadas y compresión zstd"""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"products_{timestamp}.parquet"
+        
+        filepath = os.path.join(self.output_dir, filename)
+        
+        if not products:
+            print("No hay productos para exportar")
+            return filepath
+        
+        as_batch(products).to_polars().write_parquet(filepath, **parquet_options())
+        
+        print(f"Exportado Parquet: {filepath} ({len(products)} productos)")
+        return filepath
+    
+    def parquet_dataset(self, name: Optional[str] = None) -> ParquetDataset:
+        """Dataset particionado (marketplace/fecha) dentro de la carpeta de salida"""
+        return ParquetDataset(os.path.join(self.output_dir, name or Settings.PARQUET_CONFIG['dataset']))
+    
+    def export_to_parquet_dataset(self, products: ProductsLike, name: Optional[str] = None, compact: bool = False) -> str:
+        """
+        Agrega productos al dataset Parquet particionado (un archivo nuevo por partición).
+        
+        Con `compact` se unen después los archivos de las particiones que ya acumulan varios.
+        """
+        dataset = self.parquet_dataset(name)
+        written = dataset.write(products)
+        print(f"Exportado Parquet particionado: {dataset.root} ({len(products)} productos, {len(written)} particiones)")
+        
+        if compact:
+            summary = dataset.compact()
+            if summary['partitions']:
+                print(f"🗜️ Compactadas {summary['partitions']} particiones ({summary['files_removed']} archivos unidos)")
+        
+        return dataset.root
+    
+    def export_to_price_history(self, products: ProductsLike, store: Optional[PriceHistoryStore] = None) -> Dict[str, int]:
+        """Agrega los productos al historial de precios (SQLite) y retorna el resumen del upsert"""
+        owned = store is None
+        store = store or PriceHistoryStore(os.path.join(self.output_dir, Settings.PRICE_STORE_CONFIG['database']))
+        
+        try:
+            summary = store.upsert(products)
+        finally:
+            if owned:
+                store.close()
+        
+        print(f"Historial de precios: {store.path} ({summary['new_products']} productos nuevos, "
+              f"{summary['observations']} observaciones)")
+        return summary
+    
+    def append_to_csv(self, products: ProductsLike, filename: str, extra: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Agrega productos al final de un CSV (escribe el encabezado si el archivo es nuevo).
+        
+        `extra` agrega columnas fijas al inicio de cada fila (por ejemplo, la query del lote).
+        """
+        filepath = os.path.join(self.output_dir, filename)
+        
+        if not products:
+            return filepath
+        
+        frame = as_batch(products).export_frame(csv=True, extra=extra)
+        write_header = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+        
+        with open(filepath, 'a', newline='', encoding='utf-8') as csvfile:
+            frame.write_csv(csvfile, include_header=write_header, separator=Settings.EXPORT_CONFIG['csv_delimiter'])
+        
+        return filepath
+    
+    def append_to_jsonl(self, products: ProductsLike, filename: str, extra: Optional[Dict[str, Any]] = None) -> str:
+        """Agrega productos a un archivo JSON Lines (un producto por línea)"""
+        filepath = os.path.join(self.output_dir, filename)
+        batch = as_batch(products)
+        
+        if not batch:
+            return filepath
+        
+        with open(filepath, 'a', encoding='utf-8') as jsonlfile:
+            write_json_lines(jsonlfile, batch.export_frame(extra=extra))
+        
+        return filepath
+    
+    def export_by_marketplace(self, products: ProductsLike, format: str = 'csv', compact: bool = False,
+                              compact_json: bool = False):
         """Exporta productos separados por marketplace"""
-        marketplaces = {}
+        # Parquet: una sola escritura particionada (marketplace=X/scrape_date=...) en lugar de N archivos
+        if format == 'parquet':
+            return [self.export_to_parquet_dataset(products, compact=compact)]
         
-        # Agrupar por marketplace
-        for product in products:
-            marketplace = product.marketplace or 'unknown'
-            if marketplace not in marketplaces:
-                marketplaces[marketplace] = []
-            marketplaces[marketplace].append(product)
+        # Agrupar por marketplace (partition_by sobre el lote columnar)
+        marketplaces = as_batch(products).partition_by_marketplace()
         
         # Exportar cada marketplace
         exported_files = []
@@ -88,7 +181,9 @@ class DataExporter:
             if format == 'csv':
                 filepath = self.export_to_csv(mp_products, filename)
             elif format == 'json':
-                filepath = self.export_to_json(mp_products, filename)
+                filepath = self.export_to_json(mp_products, filename, compact=compact_json)
+            elif format == 'jsonl':
+                filepath = self.export_to_jsonl(mp_products, filename)
             else:
                 continue
             
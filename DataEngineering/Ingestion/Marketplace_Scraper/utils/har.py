@@ -0,0 +1,70 @@
+import glob
+import itertools
+import os
+from datetime import datetime
+from typing import Optional, List
+from config.settings import Settings
+
+HAR_MODES = ('record', 'replay')
+
+
+class HarArchive:
+    """
+    Grabación y reproducción de corridas completas con archivos HAR de Playwright.
+    
+    En modo record cada contexto del navegador graba su propio HAR dentro de la
+    carpeta de la corrida (Playwright lo escribe al cerrar el contexto). En modo
+    replay cada contexto nuevo se sirve con todos los HAR de la corrida vía
+    route_from_har y lo que no esté grabado se aborta: la corrida no toca la red.
+    """
+    
+    def __init__(self, mode: str, name: Optional[str] = None, directory: Optional[str] = None):
+        if mode not in HAR_MODES:
+            raise ValueError(f"Modo HAR no soportado: {mode}")
+        
+        config = Settings.HAR_CONFIG
+        self.mode = mode
+        self.name = name or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.run_dir = os.path.join(directory or config['directory'], self.name)
+        self.update_content = config['update_content']
+        self.update_mode = config['update_mode']
+        self._counter = itertools.count(1)
+        
+        if self.replaying and not self.har_files():
+            raise FileNotFoundError(f"No hay archivos HAR grabados en {self.run_dir}")
+    
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+    
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+    
+    def har_files(self) -> List[str]:
+        """Archivos HAR de la corrida, en orden de grabación"""
+        return sorted(glob.glob(os.path.join(self.run_dir, "*.har")))
+    
+    async def attach(self, context, label: str):
+        """Activa la grabación o la reproducción en un contexto recién creado"""
+        if self.recording:
+            os.makedirs(self.run_dir, exist_ok=True)
+            path = os.path.join(self.run_dir, f"{next(self._counter):03d}-{label}.har")
+            await context.route_from_har(
+                path,
+                update=True,
+                update_content=self.update_content,
+                update_mode=self.update_mode
+            )
+            return
+        
+        # Las rutas registradas al final se evalúan primero: el abort queda como último recurso
+        await context.route("**/*", lambda route: route.abort())
+        for path in self.har_files():
+            await context.route_from_har(path, not_found='fallback')
+    
+    def describe(self) -> str:
+        """Texto corto para los mensajes de la corrida"""
+        if self.recording:
+            return f"🎙️ Grabando HAR en {self.run_dir}"
+        return f"📼 Reproduciendo {len(self.har_files())} HAR de {self.run_dir} (sin red)"
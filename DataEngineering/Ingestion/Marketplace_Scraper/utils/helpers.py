@@ -1,9 +1,13 @@
 import re
-import time
-import random
-from typing import Optional
+from typing import Optional, Iterable, List
 from urllib.parse import urljoin, urlparse
 
+# Patrones compilados una vez: estas funciones se llaman por campo y por producto
+_PRICE_JUNK_PATTERN = re.compile(r'[^\d.,]')
+_WHITESPACE_PATTERN = re.compile(r'[\r\n\t\s]+')
+_NUMBER_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)')
+_NON_DIGIT_PATTERN = re.compile(r'\D')
+
 
 def clean_price(price_text: str) -> Optional[float]:
     """
@@ -21,7 +25,7 @@ def clean_price(price_text: str) -> Optional[float]:
         return None
     
     # Limpiar: mantener solo números, puntos y comas
-    clean = re.sub(r'[^\d.,]', '', price_text.strip())
+    clean = _PRICE_JUNK_PATTERN.sub('', price_text)
     if not clean:
         return None
     
@@ -46,7 +50,7 @@ def clean_text(text: str) -> str:
         return ""
     
     # Reemplazar caracteres de control y múltiples espacios
-    normalized = re.sub(r'[\r\n\t\s]+', ' ', text.strip())
+    normalized = _WHITESPACE_PATTERN.sub(' ', text.strip())
     return normalized
 
 
@@ -60,7 +64,7 @@ def extract_number(text: str) -> Optional[float]:
         return None
     
     # Buscar patrón numérico: 4.5, 4,5, 1234, etc.
-    match = re.search(r'(\d+(?:[.,]\d+)?)', text)
+    match = _NUMBER_PATTERN.search(text)
     if match:
         try:
             # Normalizar separador decimal
@@ -76,8 +80,8 @@ def extract_integer(text: str) -> Optional[int]:
     if not text:
         return None
     
-    # Encontrar todos los dígitos y unirlos
-    digits = ''.join(re.findall(r'\d', text))
+    # Quitar todo lo que no sea dígito (equivale a unir los dígitos encontrados)
+    digits = _NON_DIGIT_PATTERN.sub('', text)
     if digits:
         try:
             return int(digits)
@@ -86,10 +90,24 @@ def extract_integer(text: str) -> Optional[int]:
     return None
 
 
-def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
-    """Pausa la ejecución por un tiempo aleatorio."""
-    delay = random.uniform(min_seconds, max_seconds)
-    time.sleep(delay)
+def clean_prices(price_texts: Iterable[str]) -> List[Optional[float]]:
+    """Versión en lote de clean_price (mismos resultados, una sola pasada)"""
+    return [clean_price(text) for text in price_texts]
+
+
+def clean_texts(texts: Iterable[str]) -> List[str]:
+    """Versión en lote de clean_text"""
+    return [clean_text(text) for text in texts]
+
+
+def extract_numbers(texts: Iterable[str]) -> List[Optional[float]]:
+    """Versión en lote de extract_number"""
+    return [extract_number(text) for text in texts]
+
+
+def extract_integers(texts: Iterable[str]) -> List[Optional[int]]:
+    """Versión en lote de extract_integer"""
+    return [extract_integer(text) for text in texts]
 
 
 def is_valid_url(url: str) -> bool:
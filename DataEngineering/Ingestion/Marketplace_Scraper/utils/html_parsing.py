@@ -0,0 +1,136 @@
+import asyncio
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Callable
+from selectolax.lexbor import LexborHTMLParser as HTMLParser, LexborNode as Node
+from config.settings import Settings
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_HAS_TEXT_PATTERN = re.compile(r'^(.*):has-text\("(.*)"\)$')
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+
+
+def inner_text(node: Optional[Node], default: Optional[str] = None) -> Optional[str]:
+    """Aproxima innerText: texto del nodo con espacios colapsados"""
+    if node is None:
+        return default
+    
+    return _WHITESPACE_PATTERN.sub(' ', node.text(deep=True)).strip()
+
+
+def get_attribute(node: Optional[Node], name: str, default: Optional[str] = None) -> Optional[str]:
+    """Retorna un atributo del nodo (None si el nodo existe sin el atributo)"""
+    if node is None:
+        return default
+    
+    return node.attributes.get(name)
+
+
+def fragment_root(html: str) -> Optional[Node]:
+    """Retorna el elemento raíz de un fragmento HTML (outerHTML de una tarjeta)"""
+    body = HTMLParser(html).body
+    if body is None:
+        return None
+    
+    return next(iter(body.iter()), None)
+
+
+def select_all(root: Node, selector: str) -> List[Node]:
+    """css() con soporte para la pseudo-clase :has-text("...") de Playwright"""
+    match = _HAS_TEXT_PATTERN.match(selector)
+    if not match:
+        return root.css(selector)
+    
+    needle = match.group(2).lower()
+    return [
+        node for node in root.css(match.group(1) or '*')
+        if needle in (node.text(deep=True) or '').lower()
+    ]
+
+
+def select_first(root: Node, selector: str) -> Optional[Node]:
+    """Primer nodo que coincide con el selector, o None si no hay o es inválido"""
+    try:
+        nodes = select_all(root, selector)
+    except Exception:
+        return None
+    
+    return nodes[0] if nodes else None
+
+
+def probe_fields(card: Node, fields: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Equivalente en Python del probe de selectores en lote.
+    
+    Cada campo define sus selectores candidatos y un modo (text, attr, candidates, exists);
+    el resultado tiene la misma forma que el que retorna el probe en el navegador.
+    """
+    result = {}
+    
+    for field, spec in fields.items():
+        candidates = []
+        result[field] = None
+        
+        for selector in spec['selectors']:
+            node = select_first(card, selector)
+            if node is None:
+                continue
+            
+            if spec['mode'] == 'exists':
+                result[field] = {'selector': selector, 'value': True}
+                break
+            
+            if spec['mode'] == 'attr':
+                value = node.attributes.get(spec['attribute'])
+                if value:
+                    result[field] = {'selector': selector, 'value': value}
+                    break
+                continue
+            
+            match = {'selector': selector, 'value': inner_text(node)}
+            if spec['mode'] == 'text':
+                result[field] = match
+                break
+            candidates.append(match)
+        
+        if spec['mode'] == 'candidates':
+            result[field] = candidates
+    
+    return result
+
+
+def parse_probe_cards(cards_html: List[str], fields: Dict[str, Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Aplica probe_fields a cada tarjeta capturada"""
+    cards = []
+    
+    for card_html in cards_html:
+        root = fragment_root(card_html)
+        cards.append(probe_fields(root, fields) if root is not None else None)
+    
+    return cards
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Pool de procesos compartido para el parseo de HTML (CPU-bound)"""
+    global _parse_executor
+    
+    if _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(max_workers=Settings.EXTRACTION_CONFIG['parse_workers'])
+    
+    return _parse_executor
+
+
+async def parse_in_process(parser: Callable[..., Any], *args) -> Any:
+    """Ejecuta un parser en el pool de procesos sin bloquear el event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_parse_executor(), parser, *args)
+
+
+def shutdown_parse_executor():
+    """Cierra el pool de procesos de parseo si fue creado"""
+    global _parse_executor
+    
+    if _parse_executor is not None:
+        _parse_executor.shutdown(wait=True)
+        _parse_executor = None
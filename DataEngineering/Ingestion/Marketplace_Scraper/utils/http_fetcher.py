@@ -0,0 +1,79 @@
+import random
+from typing import Callable, Optional
+import httpx
+from config.settings import Settings
+from utils.response_cache import ResponseCache
+
+
+class HttpFetcher:
+    """
+    Cliente HTTP asíncrono con pool de conexiones y HTTP/2.
+    
+    Sirve para páginas renderizadas en el servidor que no necesitan Chromium;
+    los scrapers vuelven al camino con Playwright cuando la respuesta no sirve.
+    """
+    
+    def __init__(self, mobile: bool = False, response_cache: Optional[ResponseCache] = None, **overrides):
+        self.config = {**Settings.HTTP_FETCH_CONFIG, **overrides}
+        self.mobile = mobile
+        self.client: Optional[httpx.AsyncClient] = None
+        
+        # Caché de respuestas en disco (opcional)
+        self.response_cache = response_cache
+        self.cache_profile = "mobile" if mobile else "desktop"
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Crea el cliente la primera vez que se usa"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=self.config['http2'],
+                timeout=self.config['timeout'],
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.config['max_connections'],
+                    max_keepalive_connections=self.config['max_keepalive_connections']
+                ),
+                headers={
+                    "User-Agent": random.choice(Settings.get_user_agents(self.mobile)),
+                    "Accept": "text/html,application/xhtml+xml",
+                    "Accept-Language": "es-CO,es;q=0.9"
+                }
+            )
+        return self.client
+    
+    async def fetch_html(self, url: str, validator: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+        """
+        Descarga una página y retorna su HTML, o None si la respuesta no es válida.
+        
+        La caché solo guarda (y solo sirve) páginas que aprueba el validator del scraper:
+        un interstitial o captcha con status 200 no debe repetirse durante todo el TTL.
+        """
+        if self.response_cache and validator:
+            entry = self.response_cache.get(url, self.cache_profile)
+            if entry is not None:
+                html = entry['body'].decode('utf-8', errors='replace')
+                if validator(html):
+                    return html
+                self.response_cache.discard(url, self.cache_profile)
+        
+        try:
+            response = await self._get_client().get(url)
+        except httpx.HTTPError as e:
+            print(f"⚠️ Error HTTP descargando {url}: {e}")
+            return None
+        
+        if response.status_code >= 400:
+            print(f"⚠️ Respuesta HTTP {response.status_code} para {url}")
+            return None
+        
+        if self.response_cache and validator and validator(response.text):
+            self.response_cache.put(url, self.cache_profile, response.content, response.status_code,
+                                    dict(response.headers))
+        
+        return response.text
+    
+    async def close(self):
+        """Cierra el cliente y sus conexiones"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
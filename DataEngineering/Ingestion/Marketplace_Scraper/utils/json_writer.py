@@ -0,0 +1,109 @@
+"""
+Escritura incremental de JSON para exportaciones grandes.
+
+Los productos se codifican por bloques de filas del DataFrame (nunca todos los
+dict a la vez) y se escriben a medida que se codifican, así que el tiempo crece
+en línea con la cantidad de productos y la memoria extra queda acotada al bloque.
+Usa orjson si está instalado y, si no, el módulo json estándar.
+"""
+import json
+from typing import Any, Dict, Iterator, Optional, TextIO
+import polars as pl
+from config.settings import Settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKENDS = ('auto', 'orjson', 'json')
+
+
+class JsonEncoder:
+    """
+    Codifica valores a texto JSON con el backend elegido.
+    
+    indent=None produce JSON compacto (sin espacios); orjson solo soporta indentación
+    de 2, con otra indentación se usa json. Ambos dejan los caracteres no ASCII tal cual.
+    """
+    
+    def __init__(self, backend: str = 'auto', indent: Optional[int] = None):
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Backend JSON no soportado: {backend}")
+        if backend == 'orjson' and orjson is None:
+            raise ImportError("El backend 'orjson' requiere: pip install orjson")
+        
+        self.indent = indent
+        self.backend = 'orjson' if backend != 'json' and orjson is not None and indent in (None, 2) else 'json'
+        
+        if self.backend == 'orjson':
+            self._options = orjson.OPT_INDENT_2 if indent else 0
+    
+    def encode(self, value: Any) -> str:
+        if self.backend == 'orjson':
+            return orjson.dumps(value, option=self._options).decode('utf-8')
+        
+        separators = (',', ': ') if self.indent else (',', ':')
+        return json.dumps(value, indent=self.indent, ensure_ascii=False, separators=separators)
+
+
+def _row_chunks(frame: pl.DataFrame, chunk_rows: int) -> Iterator[list]:
+    for chunk in frame.iter_slices(n_rows=chunk_rows):
+        yield chunk.to_dicts()
+
+
+def write_json_document(file: TextIO, frame: pl.DataFrame, fields: Dict[str, Any], key: str = 'products',
+                        encoder: Optional[JsonEncoder] = None, chunk_rows: Optional[int] = None) -> int:
+    """
+    Escribe {key: [filas...], **fields} sin armar el documento completo en memoria.
+    
+    Con indentación la salida es idéntica a json.dump(..., indent=N, ensure_ascii=False).
+    Retorna la cantidad de filas escritas.
+    """
+    encoder = encoder or JsonEncoder()
+    chunk_rows = chunk_rows or Settings.EXPORT_CONFIG['json_chunk_rows']
+    indent = ' ' * encoder.indent if encoder.indent else ''
+    newline = '\n' if encoder.indent else ''
+    colon = ': ' if encoder.indent else ':'
+    
+    # Cada fila va anidada dos niveles: dentro del objeto raíz y dentro de la lista
+    row_prefix = newline + indent * 2
+    row_separator = ',' + row_prefix
+    
+    file.write('{' + newline + indent + encoder.encode(key) + colon + '[')
+    
+    written = 0
+    for rows in _row_chunks(frame, chunk_rows):
+        encoded = row_separator.join(encoder.encode(row).replace('\n', row_prefix) for row in rows)
+        file.write((row_separator if written else row_prefix) + encoded)
+        written += len(rows)
+    
+    file.write((newline + indent if written else '') + ']')
+    
+    for name, value in fields.items():
+        encoded = encoder.encode(value).replace('\n', newline + indent)
+        file.write(',' + newline + indent + encoder.encode(name) + colon + encoded)
+    
+    file.write(newline + '}')
+    return written
+
+
+def write_json_lines(file: TextIO, frame: pl.DataFrame, backend: str = 'auto', chunk_rows: Optional[int] = None) -> int:
+    """
+    Escribe una fila JSON compacta por línea (JSON Lines), por bloques.
+    
+    Con backend 'auto' cada bloque lo serializa Polars directamente desde las columnas,
+    sin crear dict por fila (lo más rápido); 'orjson' o 'json' codifican fila por fila.
+    """
+    chunk_rows = chunk_rows or Settings.EXPORT_CONFIG['json_chunk_rows']
+    encoder = JsonEncoder(backend) if backend != 'auto' else None
+    
+    written = 0
+    for chunk in frame.iter_slices(n_rows=chunk_rows):
+        if encoder is None:
+            chunk.write_ndjson(file)
+        else:
+            file.write(''.join(encoder.encode(row) + '\n' for row in chunk.to_dicts()))
+        written += chunk.height
+    
+    return written
@@ -0,0 +1,221 @@
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Percentil con interpolación lineal (None si no hay valores)"""
+    if not values:
+        return None
+    
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class StageMetrics:
+    """
+    Tiempos por etapa del scraping (navigate, post_navigate_validation,
+    get_product_elements, extract_product_info, export, ...) y contadores.
+    
+    Medir cuesta un perf_counter por etapa, así que siempre está activo;
+    la suite de benchmarks reinicia y lee la instancia compartida stage_metrics.
+    """
+    
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.counters: Dict[str, int] = defaultdict(int)
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Mide la duración del bloque como una muestra de la etapa"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - started)
+    
+    def count(self, name: str, amount: int = 1):
+        """Suma a un contador (pages, products, ...)"""
+        self.counters[name] += amount
+    
+    def reset(self):
+        self.samples.clear()
+        self.counters.clear()
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Resumen por etapa: muestras, total y latencias p50/p95/max en milisegundos"""
+        return {
+            name: {
+                'count': len(values),
+                'total_s': round(sum(values), 4),
+                'p50_ms': round(percentile(values, 50) * 1000, 2),
+                'p95_ms': round(percentile(values, 95) * 1000, 2),
+                'max_ms': round(max(values) * 1000, 2)
+            }
+            for name, values in self.samples.items() if values
+        }
+
+
+# Instancia compartida por scrapers, orquestador y benchmarks
+stage_metrics = StageMetrics()
+
+
+# Ejecutables de Chromium (chrome, chrome_crashpad_handler, headless_shell, ...)
+_CHROMIUM_EXECUTABLES = ('chrome', 'chromium', 'headless_shell')
+
+
+def python_peak_rss_mb() -> Optional[float]:
+    """
+    Pico de memoria residente del proceso Python en toda su vida (ru_maxrss).
+    
+    Es acumulado: un escenario hereda el pico de los anteriores. Para comparar
+    escenarios usar python_rss_mb muestreado durante cada uno.
+    """
+    if resource is None:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB y macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def python_rss_mb() -> Optional[float]:
+    """Memoria residente actual del proceso Python (psutil o /proc)"""
+    if psutil is not None:
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+    
+    if not os.path.isdir('/proc'):
+        return None
+    
+    return round(_proc_rss_kb(os.getpid()) / 1024, 1)
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    """Árbol de procesos leído de /proc (Linux, sin psutil)"""
+    children = defaultdict(list)
+    
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as file:
+                # El nombre del comando va entre paréntesis y puede tener espacios
+                fields = file.read().rsplit(')', 1)[1].split()
+            children[int(fields[1])].append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    
+    return children
+
+
+def _proc_command(pid: int) -> str:
+    """Línea de comandos del proceso (argumentos separados por espacios)"""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as file:
+            return file.read().replace(b'\0', b' ').decode('utf-8', errors='replace')
+    except OSError:
+        return ''
+
+
+def _proc_rss_kb(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status') as file:
+            for line in file:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _is_browser_command(command: str) -> bool:
+    """
+    Indica si el comando es Chromium o el driver de Playwright (node ... playwright).
+    
+    Se mira el ejecutable y no toda la línea: los workers creados con fork heredan
+    la línea de comandos de Python, que puede incluir una ruta con 'playwright'.
+    """
+    arguments = command.split()
+    if not arguments:
+        return False
+    
+    executable = os.path.basename(arguments[0]).lower()
+    if executable.startswith(_CHROMIUM_EXECUTABLES):
+        return True
+    return executable.startswith('node') and 'playwright' in command.lower()
+
+
+def browser_process_tree(root: int, children: Dict[int, List[int]], command: Callable[[int], str]) -> List[int]:
+    """
+    PIDs del navegador bajo root: cada descendiente cuyo comando es Playwright o
+    Chromium, con todo su subárbol (renderers, GPU). Los demás procesos, como los
+    workers del ProcessPoolExecutor del parseo offline, no cuentan.
+    """
+    pids = []
+    pending = list(children.get(root, []))
+    
+    while pending:
+        pid = pending.pop()
+        if not _is_browser_command(command(pid)):
+            pending.extend(children.get(pid, []))
+            continue
+        
+        subtree = [pid]
+        while subtree:
+            browser_pid = subtree.pop()
+            pids.append(browser_pid)
+            subtree.extend(children.get(browser_pid, []))
+    
+    return pids
+
+
+def chromium_rss_mb() -> Optional[float]:
+    """
+    Memoria residente actual del driver de Playwright y de Chromium.
+    
+    Usa psutil si está instalado; si no, /proc en Linux. None si no se puede medir.
+    """
+    if psutil is not None:
+        processes = {child.pid: child for child in psutil.Process().children(recursive=True)}
+        children = defaultdict(list)
+        for pid, process in processes.items():
+            try:
+                children[process.ppid()].append(pid)
+            except psutil.Error:
+                continue
+        
+        def command(pid: int) -> str:
+            try:
+                return ' '.join(processes[pid].cmdline()) or processes[pid].name()
+            except psutil.Error:
+                return ''
+        
+        total = 0
+        for pid in browser_process_tree(os.getpid(), children, command):
+            try:
+                total += processes[pid].memory_info().rss
+            except psutil.Error:
+                continue
+        return round(total / (1024 * 1024), 1)
+    
+    if not os.path.isdir('/proc'):
+        return None
+    
+    pids = browser_process_tree(os.getpid(), _children_by_parent(), _proc_command)
+    return round(sum(_proc_rss_kb(pid) for pid in pids) / 1024, 1)
@@ -0,0 +1,145 @@
+import glob
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+import polars as pl
+from models.product_batch import ProductBatch, ProductsLike, PRODUCT_SCHEMA, as_batch
+from config.settings import Settings
+
+# Columna derivada de scraped_at para particionar por día
+SCRAPE_DATE = 'scrape_date'
+
+
+def parquet_options() -> Dict[str, object]:
+    """Compresión configurada para todos los archivos Parquet que escribe el proyecto"""
+    config = Settings.PARQUET_CONFIG
+    return {'compression': config['compression'], 'compression_level': config['compression_level']}
+
+
+def _file_stamp() -> str:
+    """Nombre único por escritura: fecha legible + sufijo aleatorio (dos procesos pueden escribir a la vez)"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def _partition_value(value) -> str:
+    """Valor de carpeta Hive (vacío -> __HIVE_DEFAULT_PARTITION__, separadores escapados)"""
+    if value is None or value == '':
+        return '__HIVE_DEFAULT_PARTITION__'
+    return quote(str(value), safe=' ')
+
+
+class ParquetDataset:
+    """
+    Dataset Parquet con particiones estilo Hive (marketplace=X/scrape_date=AAAA-MM-DD).
+    
+    Cada exportación agrega un archivo nuevo por partición (modo append), sin tocar
+    los existentes; compact() une los archivos de cada partición en uno solo. Las
+    columnas van tipadas (precios float, reseñas int, scraped_at timestamp) y las
+    de partición viven solo en la ruta: scan() las reconstruye al leer.
+    """
+    
+    def __init__(self, root: str, partition_by: Optional[Sequence[str]] = None):
+        self.root = root
+        self.partition_by = list(Settings.PARQUET_CONFIG['partition_by'] if partition_by is None else partition_by)
+        
+        unknown = [column for column in self.partition_by if column not in PRODUCT_SCHEMA and column != SCRAPE_DATE]
+        if unknown:
+            raise ValueError(f"Columnas de partición no válidas: {unknown}")
+    
+    @property
+    def hive_schema(self) -> Dict[str, pl.DataType]:
+        return {column: pl.Date if column == SCRAPE_DATE else PRODUCT_SCHEMA[column] for column in self.partition_by}
+    
+    def _frame(self, products: ProductsLike) -> pl.DataFrame:
+        return as_batch(products).to_polars().with_columns(pl.col('scraped_at').dt.date().alias(SCRAPE_DATE))
+    
+    def _partition_dir(self, key: Tuple) -> str:
+        parts = [f"{column}={_partition_value(value)}" for column, value in zip(self.partition_by, key)]
+        return os.path.join(self.root, *parts)
+    
+    def write(self, products: ProductsLike) -> List[str]:
+        """Agrega los productos como un archivo nuevo en cada partición y retorna las rutas escritas"""
+        frame = self._frame(products)
+        if not frame.height:
+            return []
+        
+        stamp = _file_stamp()
+        groups = (
+            frame.partition_by(self.partition_by, as_dict=True, maintain_order=True, include_key=False)
+            if self.partition_by else {(): frame}
+        )
+        
+        written = []
+        for key, part in groups.items():
+            directory = self._partition_dir(key)
+            os.makedirs(directory, exist_ok=True)
+            
+            path = os.path.join(directory, f"part-{stamp}.parquet")
+            self._write_file(part.drop(SCRAPE_DATE, strict=False), path)
+            written.append(path)
+        
+        return written
+    
+    def _write_file(self, frame: pl.DataFrame, path: str):
+        """Escribe a un temporal y lo renombra: un lector nunca ve un archivo a medias"""
+        temp_path = f"{path}.tmp"
+        frame.write_parquet(temp_path, **parquet_options())
+        os.replace(temp_path, path)
+    
+    def files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.root, '**', '*.parquet'), recursive=True))
+    
+    def partitions(self) -> Dict[str, List[str]]:
+        """Archivos agrupados por carpeta de partición"""
+        partitions: Dict[str, List[str]] = {}
+        for path in self.files():
+            partitions.setdefault(os.path.dirname(path), []).append(path)
+        return partitions
+    
+    def scan(self) -> pl.LazyFrame:
+        """LazyFrame sobre todo el dataset: los filtros por partición evitan leer carpetas enteras"""
+        if not self.files():
+            return pl.LazyFrame(schema={**PRODUCT_SCHEMA, **self.hive_schema})
+        
+        return pl.scan_parquet(
+            os.path.join(self.root, '**', '*.parquet'),
+            hive_partitioning=True,
+            hive_schema=self.hive_schema
+        )
+    
+    def read_batch(self) -> ProductBatch:
+        return ProductBatch.from_frame(self.scan().collect())
+    
+    def compact(self, min_files: Optional[int] = None) -> Dict[str, int]:
+        """
+        Une en un solo archivo cada partición con al menos `min_files` archivos.
+        
+        Las filas idénticas (la misma exportación agregada dos veces) se descartan y el
+        resultado queda ordenado por scraped_at. El archivo nuevo se escribe completo
+        antes de borrar los anteriores.
+        """
+        min_files = Settings.PARQUET_CONFIG['compact_min_files'] if min_files is None else min_files
+        summary = {'partitions': 0, 'files_removed': 0, 'rows': 0}
+        
+        for directory, paths in self.partitions().items():
+            if len(paths) < max(min_files, 2):
+                continue
+            
+            frame = (
+                pl.concat([pl.read_parquet(path, hive_partitioning=False) for path in paths], how='diagonal_relaxed')
+                .unique(maintain_order=True)
+                .sort('scraped_at', maintain_order=True)
+            )
+            
+            self._write_file(frame, os.path.join(directory, f"compacted-{_file_stamp()}.parquet"))
+            
+            for path in paths:
+                os.remove(path)
+            
+            summary['partitions'] += 1
+            summary['files_removed'] += len(paths)
+            summary['rows'] += frame.height
+        
+        return summary
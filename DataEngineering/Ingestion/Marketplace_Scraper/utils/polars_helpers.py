@@ -0,0 +1,75 @@
+"""
+Equivalentes en expresiones Polars de utils/helpers.
+
+Sirven para normalizar una columna completa (una página o un dataset exportado)
+en una sola pasada vectorizada, con los mismos resultados que las funciones
+por valor: clean_price, clean_text, extract_number y extract_integer.
+"""
+from typing import Iterable
+import polars as pl
+
+
+def price_expr(column: str) -> pl.Expr:
+    """clean_price: $2.299.900 -> 2299900.0, 1.234,56 -> 1234.56 (null si no es válido)"""
+    clean = pl.col(column).str.replace_all(r'[^\d.,]', '')
+    parts = clean.str.split(',')
+    
+    # Con coma: la parte entera pierde los puntos de miles y lo que sigue a la primera coma es el decimal
+    with_decimal = pl.concat_str([
+        parts.list.get(0, null_on_oob=True).str.replace_all('.', '', literal=True),
+        pl.lit('.'),
+        parts.list.get(1, null_on_oob=True)
+    ])
+    without_decimal = clean.str.replace_all('.', '', literal=True)
+    
+    return (
+        pl.when(clean.str.contains(',', literal=True))
+        .then(with_decimal)
+        .otherwise(without_decimal)
+        .cast(pl.Float64, strict=False)
+        .alias(column)
+    )
+
+
+def text_expr(column: str) -> pl.Expr:
+    """clean_text: espacios y caracteres de control colapsados ("" para nulos)"""
+    return (
+        pl.col(column)
+        .str.strip_chars()
+        .str.replace_all(r'[\r\n\t\s]+', ' ')
+        .fill_null('')
+        .alias(column)
+    )
+
+
+def number_expr(column: str) -> pl.Expr:
+    """extract_number: primer número del texto, con coma o punto decimal"""
+    return (
+        pl.col(column)
+        .str.extract(r'(\d+(?:[.,]\d+)?)', 1)
+        .str.replace(',', '.', literal=True)
+        .cast(pl.Float64, strict=False)
+        .alias(column)
+    )
+
+
+def integer_expr(column: str) -> pl.Expr:
+    """extract_integer: todos los dígitos del texto unidos (null si no hay)"""
+    return (
+        pl.col(column)
+        .str.replace_all(r'\D', '')
+        .cast(pl.Int64, strict=False)
+        .alias(column)
+    )
+
+
+def normalize_frame(frame: pl.DataFrame, prices: Iterable[str] = (), texts: Iterable[str] = (),
+                    numbers: Iterable[str] = (), integers: Iterable[str] = ()) -> pl.DataFrame:
+    """Aplica las normalizaciones a las columnas indicadas en una sola pasada"""
+    exprs = (
+        [price_expr(column) for column in prices]
+        + [text_expr(column) for column in texts]
+        + [number_expr(column) for column in numbers]
+        + [integer_expr(column) for column in integers]
+    )
+    return frame.with_columns(exprs) if exprs else frame
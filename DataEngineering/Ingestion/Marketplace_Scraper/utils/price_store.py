@@ -0,0 +1,260 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import polars as pl
+from models.product_batch import ProductsLike, as_batch
+from config.settings import Settings
+
+# Id del ítem dentro de la URL, por marketplace (sin coincidencia se usa la URL canónica)
+_ITEM_ID_PATTERNS = {
+    'MercadoLibre': re.compile(r'\b(M[A-Z]{2})-?(\d{5,})'),
+    'Falabella': re.compile(r'/product/(\d+)')
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id                  INTEGER PRIMARY KEY,
+    item_key            TEXT NOT NULL,
+    marketplace         TEXT NOT NULL,
+    url                 TEXT,
+    title               TEXT,
+    brand               TEXT,
+    seller              TEXT,
+    currency            TEXT,
+    parent_category     TEXT,
+    category            TEXT,
+    category2           TEXT,
+    image_url           TEXT,
+    first_seen          INTEGER,
+    last_seen           INTEGER,
+    last_price          REAL,
+    last_original_price REAL,
+    last_availability   TEXT,
+    UNIQUE (item_key, marketplace)
+);
+CREATE INDEX IF NOT EXISTS ix_products_category ON products (category, marketplace);
+CREATE INDEX IF NOT EXISTS ix_products_last_seen ON products (last_seen);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    product_id     INTEGER NOT NULL REFERENCES products (id),
+    scraped_at     INTEGER NOT NULL,
+    price          REAL,
+    original_price REAL,
+    free_shipping  INTEGER,
+    availability   TEXT,
+    PRIMARY KEY (product_id, scraped_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_history_scraped_at ON price_history (scraped_at);
+"""
+
+_STAGING_COLUMNS = ['item_key', 'marketplace', 'url', 'title', 'brand', 'seller', 'currency', 'parent_category',
+                    'category', 'category2', 'image_url', 'scraped_at', 'price', 'original_price', 'free_shipping',
+                    'availability']
+
+_METADATA_COLUMNS = ['url', 'title', 'brand', 'seller', 'currency', 'parent_category', 'category', 'category2',
+                     'image_url']
+
+
+def product_key(url: str, marketplace: str = '') -> Optional[str]:
+    """
+    Llave canónica del producto: el id del ítem si el marketplace lo trae en la URL
+    (MCO123456, 72751839) o, si no, host + ruta sin query ni fragmento (tracking).
+    """
+    if not url:
+        return None
+    
+    patterns = [_ITEM_ID_PATTERNS[marketplace]] if marketplace in _ITEM_ID_PATTERNS else _ITEM_ID_PATTERNS.values()
+    for pattern in patterns:
+        match = pattern.search(url)
+        if match:
+            return ''.join(match.groups())
+    
+    parts = urlsplit(url)
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+def _to_epoch(value: datetime) -> int:
+    """Segundos desde 1970 del datetime sin zona (la misma convención que dt.epoch de Polars)"""
+    return int((value - _EPOCH).total_seconds())
+
+
+class PriceHistoryStore:
+    """
+    Historial de precios en SQLite con búsquedas indexadas.
+    
+    products tiene una fila por producto (marketplace + llave canónica) con sus datos y
+    el último precio visto; price_history guarda las observaciones (product_id,
+    scraped_at) en una tabla WITHOUT ROWID cuya llave primaria ya es el índice de la
+    serie de tiempo. Con only_changes solo se agrega una observación cuando cambia el
+    precio, el precio original o la disponibilidad: la serie sigue completa (el precio
+    vale hasta el siguiente cambio) y la tabla crece con los cambios, no con las corridas.
+    """
+    
+    def __init__(self, path: Optional[str] = None, only_changes: Optional[bool] = None):
+        config = Settings.PRICE_STORE_CONFIG
+        self.path = path or os.path.join(Settings.get_output_dir(), config['database'])
+        self.only_changes = config['only_changes'] if only_changes is None else only_changes
+        
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS staging ({', '.join(_STAGING_COLUMNS)})"
+        )
+    
+    def upsert(self, products: ProductsLike) -> Dict[str, int]:
+        """
+        Agrega un lote de productos en una sola transacción.
+        
+        El lote se carga en una tabla temporal y se aplica con tres sentencias sobre
+        conjuntos (productos nuevos, observaciones, último precio) en lugar de una
+        consulta por producto. Los productos sin URL no tienen llave y se omiten.
+        """
+        frame = as_batch(products).to_polars()
+        summary = {'products': 0, 'new_products': 0, 'observations': 0, 'skipped': 0}
+        if not frame.height:
+            return summary
+        
+        keys = [product_key(url, marketplace) for marketplace, url in frame.select('marketplace', 'url').iter_rows()]
+        frame = (
+            frame.with_columns(pl.Series('item_key', keys, dtype=pl.Utf8))
+            .filter(pl.col('item_key').is_not_null() & pl.col('scraped_at').is_not_null())
+            .with_columns(
+                pl.col('scraped_at').dt.epoch('s'),
+                pl.col('free_shipping').cast(pl.Int8),
+                pl.col('marketplace').fill_null('')
+            )
+            .select(_STAGING_COLUMNS)
+        )
+        summary['skipped'] = len(keys) - frame.height
+        
+        placeholders = ', '.join('?' * len(_STAGING_COLUMNS))
+        metadata = ', '.join(f"{column} = excluded.{column}" for column in _METADATA_COLUMNS)
+        
+        with self.connection:
+            self.connection.execute("DELETE FROM staging")
+            self.connection.executemany(f"INSERT INTO staging VALUES ({placeholders})", frame.iter_rows())
+            
+            summary['new_products'] = self.connection.execute("""
+                INSERT OR IGNORE INTO products (item_key, marketplace, first_seen)
+                SELECT item_key, marketplace, MIN(scraped_at) FROM staging GROUP BY item_key, marketplace
+            """).rowcount
+            
+            summary['observations'] = self.connection.execute("""
+                INSERT OR IGNORE INTO price_history
+                    (product_id, scraped_at, price, original_price, free_shipping, availability)
+                SELECT p.id, s.scraped_at, s.price, s.original_price, s.free_shipping, s.availability
+                FROM staging s
+                JOIN products p ON p.item_key = s.item_key AND p.marketplace = s.marketplace
+                WHERE NOT :only_changes
+                   OR p.last_seen IS NULL
+                   OR s.price IS NOT p.last_price
+                   OR s.original_price IS NOT p.last_original_price
+                   OR s.availability IS NOT p.last_availability
+            """, {'only_changes': self.only_changes}).rowcount
+            
+            # Datos y último precio: se aplican en orden del lote y solo si no son más viejos
+            self.connection.execute(f"""
+                INSERT INTO products
+                    (item_key, marketplace, {', '.join(_METADATA_COLUMNS)},
+                     last_seen, last_price, last_original_price, last_availability)
+                SELECT item_key, marketplace, {', '.join(_METADATA_COLUMNS)},
+                       scraped_at, price, original_price, availability
+                FROM staging WHERE true
+                ON CONFLICT (item_key, marketplace) DO UPDATE SET
+                    {metadata},
+                    last_seen = excluded.last_seen,
+                    last_price = excluded.last_price,
+                    last_original_price = excluded.last_original_price,
+                    last_availability = excluded.last_availability
+                WHERE products.last_seen IS NULL OR excluded.last_seen >= products.last_seen
+            """)
+            
+            self.connection.execute("DELETE FROM staging")
+        
+        summary['products'] = frame.height
+        return summary
+    
+    def history(self, url: str, marketplace: Optional[str] = None, since: Optional[datetime] = None,
+                until: Optional[datetime] = None) -> pl.DataFrame:
+        """Serie de precios de un producto (por URL o llave), ordenada por fecha"""
+        conditions = ["p.item_key = ?"]
+        params: List = [product_key(url, marketplace or '')]
+        
+        if marketplace:
+            conditions.append("p.marketplace = ?")
+            params.append(marketplace)
+        if since:
+            conditions.append("h.scraped_at >= ?")
+            params.append(_to_epoch(since))
+        if until:
+            conditions.append("h.scraped_at <= ?")
+            params.append(_to_epoch(until))
+        
+        rows = self.connection.execute(f"""
+            SELECT p.marketplace, p.item_key, h.scraped_at, h.price, h.original_price, h.free_shipping, h.availability
+            FROM products p JOIN price_history h ON h.product_id = p.id
+            WHERE {' AND '.join(conditions)}
+            ORDER BY p.marketplace, h.scraped_at
+        """, params).fetchall()
+        
+        return self._frame(rows, {
+            'marketplace': pl.Utf8, 'item_key': pl.Utf8, 'scraped_at': pl.Int64, 'price': pl.Float64,
+            'original_price': pl.Float64, 'free_shipping': pl.Int8, 'availability': pl.Utf8
+        })
+    
+    def latest_prices(self, category: Optional[str] = None, marketplace: Optional[str] = None,
+                      since: Optional[datetime] = None, limit: Optional[int] = None) -> pl.DataFrame:
+        """Último precio de cada producto, filtrando por categoría, marketplace o visto desde una fecha"""
+        conditions = ["last_price IS NOT NULL"]
+        params: List = []
+        
+        if category:
+            conditions.append("category = ?")
+            params.append(category)
+        if marketplace:
+            conditions.append("marketplace = ?")
+            params.append(marketplace)
+        if since:
+            conditions.append("last_seen >= ?")
+            params.append(_to_epoch(since))
+        
+        rows = self.connection.execute(f"""
+            SELECT marketplace, item_key, title, category, url, last_seen, last_price, last_original_price
+            FROM products
+            WHERE {' AND '.join(conditions)}
+            ORDER BY last_price
+            {'LIMIT ?' if limit else ''}
+        """, params + ([limit] if limit else [])).fetchall()
+        
+        return self._frame(rows, {
+            'marketplace': pl.Utf8, 'item_key': pl.Utf8, 'title': pl.Utf8, 'category': pl.Utf8, 'url': pl.Utf8,
+            'last_seen': pl.Int64, 'price': pl.Float64, 'original_price': pl.Float64
+        })
+    
+    def _frame(self, rows: list, schema: Dict[str, pl.DataType]) -> pl.DataFrame:
+        """DataFrame de resultados con las fechas (epoch) de vuelta a datetime"""
+        frame = pl.DataFrame(rows, schema=schema, orient='row')
+        dates = [column for column in ('scraped_at', 'last_seen') if column in schema]
+        return frame.with_columns([pl.from_epoch(column, time_unit='s') for column in dates])
+    
+    def stats(self) -> Dict[str, int]:
+        products, observations = self.connection.execute(
+            "SELECT (SELECT COUNT(*) FROM products), (SELECT COUNT(*) FROM price_history)"
+        ).fetchone()
+        return {'products': products, 'observations': observations}
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,104 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from config.settings import Settings
+
+
+class TokenBucket:
+    """
+    Token bucket asíncrono para un dominio.
+    
+    Se recarga un token cada `interval` segundos hasta `burst` tokens. Cuando no hay
+    tokens la petición espera (con jitter aleatorio) sin bloquear el event loop.
+    """
+    
+    def __init__(self, interval: float, burst: int = 1, jitter: float = 0.0):
+        self.interval = interval
+        self.capacity = max(burst, 1)
+        self.jitter = jitter
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Suma los tokens generados desde la última lectura"""
+        now = time.monotonic()
+        if self.interval > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) / self.interval)
+        else:
+            self.tokens = float(self.capacity)
+        self.updated = now
+    
+    async def acquire(self) -> float:
+        """Toma un token, esperando si es necesario. Retorna los segundos esperados"""
+        async with self.lock:
+            self._refill()
+            waited = 0.0
+            
+            if self.tokens < 1:
+                waited = (1 - self.tokens) * self.interval + random.uniform(0, self.jitter)
+                await asyncio.sleep(waited)
+                self._refill()
+            
+            self.tokens = max(self.tokens - 1, 0.0)
+            return waited
+
+
+class DomainRateLimiter:
+    """
+    Limitador de peticiones por dominio.
+    
+    Cada dominio tiene su propio bucket: las pausas de cortesía con un sitio no
+    detienen a los scrapers de otros marketplaces que corren en el mismo proceso.
+    La configuración sale de Settings.REQUEST_DELAYS:
+    min_delay = intervalo entre peticiones, max_delay - min_delay = jitter máximo,
+    burst = peticiones seguidas permitidas, overrides = ajustes por dominio.
+    """
+    
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or Settings.REQUEST_DELAYS
+        self.buckets: Dict[str, TokenBucket] = {}
+    
+    @staticmethod
+    def get_domain(url: str) -> str:
+        """Extrae el dominio de una URL (o retorna el texto si ya es un dominio)"""
+        return urlparse(url).netloc or url
+    
+    def get_domain_config(self, domain: str) -> Dict[str, Any]:
+        """Configuración del dominio: valores base más el override cuyo sufijo coincida"""
+        config = {
+            'min_delay': self.config['min_delay'],
+            'max_delay': self.config['max_delay'],
+            'burst': self.config.get('burst', 1)
+        }
+        
+        for suffix, override in self.config.get('overrides', {}).items():
+            if domain == suffix or domain.endswith(f".{suffix}"):
+                config.update(override)
+                break
+        
+        return config
+    
+    def get_bucket(self, domain: str) -> TokenBucket:
+        """Retorna (creando si no existe) el bucket del dominio"""
+        if domain not in self.buckets:
+            config = self.get_domain_config(domain)
+            self.buckets[domain] = TokenBucket(
+                interval=config['min_delay'],
+                burst=config['burst'],
+                jitter=max(config['max_delay'] - config['min_delay'], 0)
+            )
+        
+        return self.buckets[domain]
+    
+    async def acquire(self, url: str) -> float:
+        """Espera el turno para pedir la URL. Retorna los segundos esperados"""
+        domain = self.get_domain(url)
+        waited = await self.get_bucket(domain).acquire()
+        
+        if waited:
+            print(f"⏳ Pausa de {waited:.2f}s para {domain}")
+        
+        return waited
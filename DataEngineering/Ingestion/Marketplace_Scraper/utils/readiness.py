@@ -0,0 +1,106 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from config.settings import Settings
+
+
+class ReadinessEngine:
+    """
+    Espera a que una página esté lista según condiciones por marketplace.
+    
+    Condiciones soportadas (se evalúan en orden):
+    - dom_ready: document.readyState === 'complete'
+    - network_idle: sin peticiones de red en curso (load state 'networkidle')
+    - selector: el selector aparece en la página
+    - count_stable: el número de elementos del selector deja de cambiar
+    
+    Cada condición registra cuánto tardó en cumplirse, para saber dónde se va el tiempo.
+    """
+    
+    def __init__(self, conditions: List[Dict[str, Any]], poll_interval: Optional[float] = None,
+                 stable_polls: Optional[int] = None):
+        self.conditions = conditions
+        self.poll_interval = poll_interval or Settings.READINESS_CONFIG['poll_interval']
+        self.stable_polls = stable_polls or Settings.READINESS_CONFIG['stable_polls']
+        
+        # Tiempos por condición de la última espera y de todas las esperas
+        self.last_timings: List[Dict[str, Any]] = []
+        self.history: List[List[Dict[str, Any]]] = []
+    
+    async def wait_until_ready(self, page) -> bool:
+        """Espera todas las condiciones; False si alguna condición requerida no se cumplió"""
+        self.last_timings = []
+        all_required = True
+        
+        for condition in self.conditions:
+            started = time.perf_counter()
+            ready = await self._wait_condition(page, condition)
+            elapsed = time.perf_counter() - started
+            
+            self.last_timings.append({
+                'condition': condition['condition'],
+                'selector': condition.get('selector'),
+                'seconds': round(elapsed, 3),
+                'ready': ready
+            })
+            
+            if not ready and condition.get('required'):
+                all_required = False
+                break
+        
+        self.history.append(self.last_timings)
+        self._print_timings()
+        return all_required
+    
+    async def _wait_condition(self, page, condition: Dict[str, Any]) -> bool:
+        """Evalúa una condición con su timeout"""
+        kind = condition['condition']
+        timeout = condition.get('timeout', 10)
+        
+        try:
+            if kind == 'dom_ready':
+                await page.wait_for_function("document.readyState === 'complete'", timeout=timeout * 1000)
+            elif kind == 'network_idle':
+                await page.wait_for_load_state('networkidle', timeout=timeout * 1000)
+            elif kind == 'selector':
+                await page.wait_for_selector(condition['selector'], timeout=timeout * 1000)
+            elif kind == 'count_stable':
+                return await self._wait_count_stable(page, condition['selector'], timeout)
+            else:
+                print(f"⚠️ Condición de carga desconocida: {kind}")
+                return False
+            
+            return True
+        
+        except Exception:
+            return False
+    
+    async def _wait_count_stable(self, page, selector: str, timeout: float) -> bool:
+        """Espera a que el conteo de elementos sea mayor a cero y se repita stable_polls veces"""
+        deadline = time.perf_counter() + timeout
+        last_count = None
+        repeated = 0
+        
+        while time.perf_counter() < deadline:
+            count = await page.eval_on_selector_all(selector, "(elements) => elements.length")
+            
+            if count and count == last_count:
+                repeated += 1
+                if repeated >= self.stable_polls:
+                    return True
+            else:
+                repeated = 1 if count else 0
+                last_count = count
+            
+            await asyncio.sleep(self.poll_interval)
+        
+        return False
+    
+    def _print_timings(self):
+        """Imprime cuánto tardó cada condición"""
+        summary = ", ".join(
+            f"{timing['condition']} {timing['seconds']:.2f}s{'' if timing['ready'] else ' ⏱️'}"
+            for timing in self.last_timings
+        )
+        total = sum(timing['seconds'] for timing in self.last_timings)
+        print(f"⏱️ Página lista en {total:.2f}s ({summary})")
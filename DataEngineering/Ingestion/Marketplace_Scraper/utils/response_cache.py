@@ -0,0 +1,215 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Callable, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from config.settings import Settings
+
+# Parámetros que no cambian el listado y solo fragmentarían la caché
+_IGNORED_QUERY_PARAMS = ('utm_', 'gclid', 'fbclid', '_gl')
+
+# Encabezados que dejan de ser válidos porque el cuerpo se guarda ya decodificado
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+def normalize_url(url: str) -> str:
+    """URL canónica para la llave: esquema y host en minúscula, query ordenada, sin fragmento ni tracking"""
+    parts = urlsplit(url)
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_IGNORED_QUERY_PARAMS)
+    )
+    
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        urlencode(query),
+        ''
+    ))
+
+
+class ResponseCache:
+    """
+    Caché en disco de respuestas HTML (páginas de listado) con TTL y tope de tamaño.
+    
+    La llave es la URL normalizada + el perfil de dispositivo (desktop/mobile), porque
+    los sitios sirven HTML distinto a cada uno. Cada entrada es un archivo gzip con
+    una línea JSON de metadatos (url, status, headers, fecha) seguida del cuerpo.
+    El TTL depende del dominio y, al superar el tope, se eliminan primero las
+    entradas usadas hace más tiempo (LRU por fecha de modificación del archivo).
+    """
+    
+    def __init__(self, directory: Optional[str] = None, max_mb: Optional[float] = None,
+                 default_ttl: Optional[float] = None, ttl_overrides: Optional[Dict[str, float]] = None):
+        config = Settings.RESPONSE_CACHE_CONFIG
+        self.directory = directory or config['directory']
+        self.max_bytes = int((config['max_mb'] if max_mb is None else max_mb) * 1024 * 1024)
+        self.default_ttl = config['default_ttl'] if default_ttl is None else default_ttl
+        self.ttl_overrides = config['overrides'] if ttl_overrides is None else ttl_overrides
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+    
+    def path_for(self, url: str, profile: str) -> str:
+        """Archivo de la entrada para una URL y perfil"""
+        key = hashlib.sha256(f"{profile}|{normalize_url(url)}".encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.gz")
+    
+    def ttl_for(self, url: str) -> float:
+        """TTL en segundos del dominio (coincidencia por sufijo, como en el limitador)"""
+        host = urlsplit(url).hostname or ''
+        
+        for suffix, ttl in self.ttl_overrides.items():
+            if host == suffix or host.endswith(f".{suffix}"):
+                return ttl
+        
+        return self.default_ttl
+    
+    def get(self, url: str, profile: str) -> Optional[Dict[str, Any]]:
+        """Retorna la respuesta guardada si existe y no ha vencido (cuenta hit/miss)"""
+        path = self.path_for(url, profile)
+        entry = self._read(path)
+        
+        if entry is None or time.time() - entry['stored_at'] > self.ttl_for(url):
+            self.stats['misses'] += 1
+            return None
+        
+        # Marca de uso para la expulsión LRU
+        os.utime(path)
+        self.stats['hits'] += 1
+        return entry
+    
+    def contains(self, url: str, profile: str) -> bool:
+        """Indica si hay una entrada vigente, sin afectar los contadores"""
+        entry = self._read(self.path_for(url, profile), with_body=False)
+        return entry is not None and time.time() - entry['stored_at'] <= self.ttl_for(url)
+    
+    def put(self, url: str, profile: str, body: bytes, status: int = 200,
+            headers: Optional[Dict[str, str]] = None):
+        """Guarda una respuesta exitosa y aplica el tope de tamaño"""
+        if status >= 400:
+            return
+        
+        meta = {
+            'url': url,
+            'status': status,
+            'headers': {
+                name: value for name, value in (headers or {}).items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            'stored_at': time.time()
+        }
+        
+        path = self.path_for(url, profile)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Escritura atómica: otro worker puede estar leyendo la misma entrada
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(temp_path, 'wb') as file:
+            file.write(json.dumps(meta).encode('utf-8') + b'\n')
+            file.write(body)
+        os.replace(temp_path, path)
+        
+        self.stats['stores'] += 1
+        self.evict()
+    
+    def evict(self):
+        """Elimina las entradas menos usadas hasta quedar bajo el tope"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats['evictions'] += 1
+    
+    def discard(self, url: str, profile: str):
+        """Elimina la entrada de una URL (ej: una página que el scraper ya no acepta)"""
+        try:
+            os.remove(self.path_for(url, profile))
+        except OSError:
+            pass
+    
+    def clear(self):
+        """Elimina todas las entradas"""
+        for path, _, _ in self._entries():
+            os.remove(path)
+    
+    async def handle_route(self, route, profile: str, validator: Optional[Callable[[str], bool]] = None):
+        """
+        Handler de page.route: sirve desde disco los documentos en caché y guarda los nuevos.
+        
+        Solo se guardan (y se sirven) los documentos que aprueba el validator del scraper;
+        sin validator el documento va a la red sin pasar por la caché. Las demás peticiones
+        pasan al siguiente handler (ej: ResourcePolicy) con fallback().
+        """
+        request = route.request
+        if request.resource_type != 'document' or request.method != 'GET' or validator is None:
+            await route.fallback()
+            return
+        
+        entry = self.get(request.url, profile)
+        if entry is not None:
+            if validator(entry['body'].decode('utf-8', errors='replace')):
+                await route.fulfill(status=entry['status'], headers=entry['headers'], body=entry['body'])
+                return
+            self.discard(request.url, profile)
+        
+        try:
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            await route.fallback()
+            return
+        
+        if response.status == 200 and validator(body.decode('utf-8', errors='replace')):
+            self.put(request.url, profile, body, response.status, response.headers)
+        await route.fulfill(response=response, body=body)
+    
+    def report(self):
+        """Imprime los contadores de la caché"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        if not lookups:
+            return
+        
+        print(f"💾 Caché de respuestas: {self.stats['hits']} hits, {self.stats['misses']} misses "
+              f"({self.stats['hits'] / lookups:.0%}), {self.stats['stores']} guardadas, "
+              f"{self.stats['evictions']} expulsadas")
+    
+    def _read(self, path: str, with_body: bool = True) -> Optional[Dict[str, Any]]:
+        """Lee una entrada (None si no existe o está dañada)"""
+        try:
+            with gzip.open(path, 'rb') as file:
+                meta = json.loads(file.readline())
+                if with_body:
+                    meta['body'] = file.read()
+        except (OSError, EOFError, ValueError):
+            return None
+        
+        return meta
+    
+    def _entries(self) -> List[Tuple[str, int, float]]:
+        """(ruta, tamaño, última modificación) de cada entrada en disco"""
+        entries = []
+        
+        if not os.path.isdir(self.directory):
+            return entries
+        
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.gz'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        
+        return entries
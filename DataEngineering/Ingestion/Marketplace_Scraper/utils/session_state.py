@@ -0,0 +1,62 @@
+import os
+import re
+import time
+from typing import Optional
+from config.settings import Settings
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-z0-9_-]+')
+
+
+class SessionStateStore:
+    """
+    Guarda el storage_state de Playwright (cookies + localStorage) por perfil.
+    
+    Un perfil identifica marketplace y ubicación (ej: megatiendas-bolivar-cartagena):
+    una vez resuelto el popup de ubicación, los contextos nuevos cargan el estado
+    guardado y el sitio ya no vuelve a mostrarlo.
+    """
+    
+    def __init__(self, directory: Optional[str] = None, max_age_hours: Optional[float] = None):
+        config = Settings.SESSION_STATE_CONFIG
+        self.directory = directory or config['directory']
+        self.max_age_hours = config['max_age_hours'] if max_age_hours is None else max_age_hours
+    
+    def path_for(self, profile: str) -> str:
+        """Ruta del archivo de estado de un perfil"""
+        filename = _UNSAFE_FILENAME_CHARS.sub('-', profile.lower()).strip('-')
+        return os.path.join(self.directory, f"{filename}.json")
+    
+    def get_valid_path(self, profile: str) -> Optional[str]:
+        """Ruta del estado guardado si existe y no ha vencido"""
+        path = self.path_for(profile)
+        
+        if not os.path.exists(path):
+            return None
+        
+        age_hours = (time.time() - os.path.getmtime(path)) / 3600
+        if self.max_age_hours and age_hours > self.max_age_hours:
+            print(f"🗝️ Estado de sesión '{profile}' vencido ({age_hours:.0f} h)")
+            return None
+        
+        return path
+    
+    async def save(self, context, profile: str) -> Optional[str]:
+        """Guarda el estado actual del contexto para el perfil"""
+        path = self.path_for(profile)
+        
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            await context.storage_state(path=path)
+            print(f"🗝️ Estado de sesión '{profile}' guardado")
+            return path
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el estado de sesión '{profile}': {e}")
+            return None
+    
+    def invalidate(self, profile: str):
+        """Elimina el estado guardado de un perfil"""
+        path = self.path_for(profile)
+        
+        if os.path.exists(path):
+            os.remove(path)
+            print(f"🗝️ Estado de sesión '{profile}' descartado")
@@ -0,0 +1,217 @@
+import os
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple
+import polars as pl
+from models.product_batch import ProductBatch, ProductsLike, as_batch
+from utils.parquet_dataset import parquet_options
+from utils.json_writer import write_json_lines
+from config.settings import Settings
+
+
+class ProductSink(ABC):
+    """
+    Destino de productos en streaming: recibe cada página apenas se scrapea.
+    
+    Lo escrito queda en disco aunque la corrida falle después, y la memoria no crece
+    con el tamaño de la corrida (solo se guardan las claves ya vistas para deduplicar).
+    """
+    
+    extension = ""
+    
+    def __init__(self, path: str, dedup: Optional[bool] = None):
+        self.path = path
+        self.dedup = Settings.STREAM_CONFIG['dedup'] if dedup is None else dedup
+        self.rows_written = 0
+        self.duplicates = 0
+        self.counts: Counter = Counter()
+        self.closed = False
+        self._seen: Set[Tuple[str, str]] = set()
+    
+    def write(self, products: ProductsLike, extra: Optional[Dict[str, Any]] = None) -> int:
+        """Escribe una página de productos y retorna cuántos se escribieron"""
+        if self.closed:
+            raise ValueError(f"El destino {self.path} ya está cerrado")
+        
+        batch = as_batch(products)
+        if not batch:
+            return 0
+        
+        frame = self._unseen(batch.to_polars()) if self.dedup else batch.to_polars()
+        if not frame.height:
+            return 0
+        
+        self._write_batch(ProductBatch([frame]), extra)
+        self.rows_written += frame.height
+        self.counts.update(frame['marketplace'].to_list())
+        return frame.height
+    
+    def _unseen(self, frame: pl.DataFrame) -> pl.DataFrame:
+        """Filas cuyo (marketplace, url) no se ha escrito (las que no tienen URL pasan siempre)"""
+        keep = []
+        for marketplace, url in frame.select('marketplace', 'url').iter_rows():
+            key = (marketplace, url)
+            if url and key in self._seen:
+                keep.append(False)
+                continue
+            
+            if url:
+                self._seen.add(key)
+            keep.append(True)
+        
+        self.duplicates += keep.count(False)
+        return frame.filter(pl.Series(keep, dtype=pl.Boolean))
+    
+    @abstractmethod
+    def _write_batch(self, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        """Escribe el lote (ya deduplicado) en el destino"""
+        pass
+    
+    def flush(self):
+        """Asegura que lo escrito llegue al disco"""
+        pass
+    
+    def close(self):
+        """Vacía lo pendiente y libera el archivo"""
+        self.closed = True
+    
+    def describe(self) -> str:
+        marketplaces = ", ".join(f"{marketplace}: {count}" for marketplace, count in self.counts.items())
+        detail = f" ({marketplaces})" if marketplaces else ""
+        skipped = f", {self.duplicates} repetidos descartados" if self.duplicates else ""
+        return f"📤 {self.rows_written} productos escritos en {self.path}{detail}{skipped}"
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _FileSink(ProductSink):
+    """Destino de un solo archivo abierto durante toda la corrida, vaciado después de cada página"""
+    
+    def __init__(self, path: str, dedup: Optional[bool] = None):
+        super().__init__(path, dedup)
+        self._file = None
+    
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        return self._file
+    
+    def _write_batch(self, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        self._write_frame(self._open(), batch, extra)
+        self.flush()
+    
+    @abstractmethod
+    def _write_frame(self, file, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        pass
+    
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        super().close()
+
+
+class JsonlSink(_FileSink):
+    """JSON Lines: un producto por línea, en el formato de Product.to_dict()"""
+    
+    extension = "jsonl"
+    
+    def _write_frame(self, file, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        write_json_lines(file, batch.export_frame(extra=extra))
+
+
+class CsvSink(_FileSink):
+    """CSV en modo append (encabezado solo si el archivo está vacío)"""
+    
+    extension = "csv"
+    
+    def _write_frame(self, file, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        write_header = file.tell() == 0
+        batch.export_frame(csv=True, extra=extra).write_csv(
+            file,
+            include_header=write_header,
+            separator=Settings.EXPORT_CONFIG['csv_delimiter']
+        )
+
+
+class ParquetSink(ProductSink):
+    """
+    Parquet por partes: una carpeta con archivos part-NNNNN.parquet de hasta
+    `rows_per_part` filas, cada uno con un único row group y columnas tipadas.
+    
+    Cada parte es un archivo completo (con su footer), así que una corrida
+    interrumpida deja legibles todas las partes ya cerradas; solo se pierde lo
+    acumulado desde la última. La carpeta se lee entera con pl.scan_parquet(path).
+    """
+    
+    extension = "parquet"
+    
+    def __init__(self, path: str, dedup: Optional[bool] = None, rows_per_part: Optional[int] = None):
+        super().__init__(path, dedup)
+        self.rows_per_part = rows_per_part or Settings.STREAM_CONFIG['parquet_rows_per_part']
+        self.parts = 0
+        self._pending: List[pl.DataFrame] = []
+        self._pending_rows = 0
+        os.makedirs(path, exist_ok=True)
+    
+    def _write_batch(self, batch: ProductBatch, extra: Optional[Dict[str, Any]]):
+        frame = batch.to_polars()
+        if extra:
+            frame = frame.select([pl.lit(value).alias(key) for key, value in extra.items()] + frame.columns)
+        
+        self._pending.append(frame)
+        self._pending_rows += frame.height
+        if self._pending_rows >= self.rows_per_part:
+            self.flush()
+    
+    def flush(self):
+        """Escribe lo acumulado como una parte nueva"""
+        if not self._pending:
+            return
+        
+        part_path = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+        frame = pl.concat(self._pending, how='vertical')
+        frame.write_parquet(part_path, row_group_size=frame.height, **parquet_options())
+        self.parts += 1
+        self._pending = []
+        self._pending_rows = 0
+    
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+SINKS = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink
+}
+
+
+def create_sink(format: str, filename: Optional[str] = None, dedup: Optional[bool] = None) -> ProductSink:
+    """
+    Crea el destino de streaming para el formato pedido ('json' se escribe como JSON Lines).
+    
+    Sin `filename` el nombre sigue el de DataExporter: products_<timestamp>.<extensión>
+    dentro de la carpeta de salida.
+    """
+    sink_class = SINKS.get('jsonl' if format == 'json' else format)
+    if sink_class is None:
+        raise ValueError(f"Formato de streaming no soportado: {format}")
+    
+    if not filename:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"products_{timestamp}.{sink_class.extension}"
+    
+    return sink_class(os.path.join(Settings.get_output_dir(), filename), dedup=dedup)
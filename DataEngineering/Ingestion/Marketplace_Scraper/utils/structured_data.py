@@ -0,0 +1,130 @@
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from utils.helpers import clean_price
+
+# Retorna como texto JSON el primer estado embebido que exista en la página.
+# Cada fuente es un selector (<script> o <template> con JSON) o una variable global de window.
+EMBEDDED_STATE_SCRIPT = """
+(sources) => {
+    for (const source of sources) {
+        try {
+            if (source.global) {
+                const value = window[source.global];
+                if (value) return JSON.stringify(value);
+                continue;
+            }
+            const element = document.querySelector(source.selector);
+            if (!element) continue;
+            const text = (element.content || element).textContent;
+            if (text && text.trim()) return text;
+        } catch (e) {
+            continue;
+        }
+    }
+    return null;
+}
+"""
+
+_TEMPLATE_SCRIPT_PATTERN = re.compile(r'<script[^>]*>(.*)</script>', re.DOTALL)
+
+
+def load_state(text: Optional[str]) -> Optional[Any]:
+    """Decodifica el JSON de un estado embebido (None si no es válido)"""
+    if not text:
+        return None
+    
+    try:
+        return json.loads(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_embedded_state(html: str, sources: List[Dict[str, str]]) -> Optional[Any]:
+    """
+    Equivalente offline de EMBEDDED_STATE_SCRIPT sobre un documento descargado.
+    
+    Las variables globales solo existen en el navegador, así que se ignoran.
+    """
+    tree = HTMLParser(html)
+    
+    for source in sources:
+        if 'selector' not in source:
+            continue
+        
+        node = tree.css_first(source['selector'])
+        if node is None:
+            continue
+        
+        text = node.text(deep=True)
+        if not text.strip():
+            # Lexbor no expone el contenido de <template>: se lee del HTML crudo
+            match = _TEMPLATE_SCRIPT_PATTERN.search(node.html or '')
+            text = match.group(1) if match else ''
+        
+        state = load_state(text)
+        if state is not None:
+            return state
+    
+    return None
+
+
+def dig(data: Any, *path, default: Any = None) -> Any:
+    """Acceso seguro a estructuras anidadas: dig(state, 'props', 'results', 0)"""
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        
+        if data is None:
+            return default
+    
+    return data
+
+
+def find_list(data: Any, predicate: Callable[[Any], bool]) -> Optional[list]:
+    """Busca en profundidad la primera lista cuyo primer elemento cumple el predicado"""
+    if isinstance(data, list):
+        if data and predicate(data[0]):
+            return data
+        children = data
+    elif isinstance(data, dict):
+        children = data.values()
+    else:
+        return None
+    
+    for child in children:
+        found = find_list(child, predicate)
+        if found is not None:
+            return found
+    
+    return None
+
+
+def to_price(value: Any) -> Optional[float]:
+    """Convierte un precio del estado (número o texto con formato local) a float"""
+    if isinstance(value, bool):
+        return None
+    
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    return clean_price(value)
+
+
+def to_number(value: Any, cast: Callable = float) -> Optional[Any]:
+    """Convierte rating o número de reseñas a número (None si no es válido)"""
+    if value is None or value == '':
+        return None
+    
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def mentions_free_shipping(value: Any) -> bool:
+    """Indica si algún texto dentro del valor menciona envío gratis"""
+    return 'gratis' in json.dumps(value, ensure_ascii=False).lower()